@@ -1,44 +1,374 @@
 from __future__ import annotations
+import dataclasses
 import os
-import time
-import pathlib
+import weakref
+from typing import TYPE_CHECKING
 import pytest
-from dotenv import load_dotenv
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
+from src.action_trace import (
+    ReplayDriver,
+    TracePlugin,
+    TraceRecorder,
+    load_trace,
+    recording_driver,
+    trace_path,
+)
+from src.adaptive_timeouts import AdaptiveTimeoutPlugin, latency_scope
+from src.browser_profile import BrowserProfile, DriverPathCache
 from src.config import settings
-from src.pages.login_page import LoginPage
-from src.pages.inventory_page import InventoryPage
+from src.driver_pool import DriverPool
+from src.impact import ImpactPlugin
+from src.local_app import LocalApp
+from src.preflight import PreflightCache, PreflightReport, cache_key, probe_routes
+from src.resource_policy import (
+    PROFILES,
+    ResourcePolicy,
+    ResourceReportPlugin,
+    USER_PROPERTY as RESOURCE_PROPERTY,
+)
+from src.retry import RetryPolicy, SmartRetryPlugin
+from src.storage_state import StorageStateCache
+from src.user_pool import UserPool, users_from_settings
+from src import timing
+from src.artifacts import FailureArtifactsPlugin
+from src.benchmark import BenchmarkPlugin, USER_PROPERTY as BENCHMARK_PROPERTY, measure
+from src.matrix import BrowserMatrixPlugin, parse_browsers
+from src.memory import MemoryReportPlugin, USER_PROPERTY as MEMORY_PROPERTY, sample
+from src.scheduling import (
+    DurationSchedulingPlugin,
+    USER_PROPERTY as LOGIN_USER_PROPERTY,
+)
+from src.pages.registry import PageRegistry, discover_pages
 
-# Load .env if present
-load_dotenv(override=False)
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# `.env` is loaded lazily by `settings` on first access (see src/config.py)
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--browser", action="store", default=settings.browser)
     parser.addoption(
-        "--browser", action="store", default=os.getenv("BROWSER", settings.browser)
+        "--browsers",
+        action="store",
+        default=",".join(settings.browsers),
+        help="Comma-separated browser matrix, e.g. 'chrome,firefox' (overrides --browser).",
     )
+    parser.addoption("--headless", action="store_true", default=settings.headless)
+    parser.addoption("--base-url", action="store", default=settings.base_url)
+    parser.addoption("--user", action="store", default=settings.e2e_default_user)
     parser.addoption(
-        "--headless",
+        "--local-app",
         action="store_true",
-        default=os.getenv("HEADLESS", "false").lower() == "true",
+        default=settings.local_app,
+        help="Serve the bundled stand-in app on an ephemeral port and use it as --base-url.",
     )
     parser.addoption(
-        "--base-url", action="store", default=os.getenv("BASE_URL", settings.base_url)
+        "--wait-engine",
+        action="store",
+        choices=("poll", "event"),
+        default=settings.wait_engine,
+        help="'event' resolves waits via MutationObserver instead of 0.5 s polling.",
     )
-    parser.addoption("--user", action="store", default=settings.e2e_default_user)
+    parser.addoption(
+        "--adaptive-timeouts",
+        action="store_true",
+        default=settings.adaptive_timeouts,
+        help="Learn per-locator wait timeouts from latencies seen in earlier runs.",
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        choices=("normal", "eager", "none"),
+        default=settings.page_load_strategy,
+        help="'eager'/'none' return from navigation early; pages then wait for READY.",
+    )
+    parser.addoption(
+        "--browser-density",
+        action="store",
+        choices=("standard", "dense"),
+        default=settings.browser_density,
+        help="'dense' trims browser processes/background work to fit more workers.",
+    )
+    parser.addoption(
+        "--memory-report",
+        action="store_true",
+        default=settings.memory_report,
+        help="Report browser and worker RSS at the end of the run.",
+    )
+    parser.addoption(
+        "--resource-policy",
+        action="store",
+        choices=sorted(PROFILES),
+        default=settings.resource_policy,
+        help="Block images/fonts/third-party requests to speed up page loads.",
+    )
+    parser.addoption(
+        "--resource-report",
+        action="store_true",
+        default=settings.resource_report,
+        help="Report requests/bytes per run; with 'none' this records the savings baseline.",
+    )
+    parser.addoption(
+        "--driver-pool",
+        action="store_true",
+        default=settings.driver_pool,
+        help="Reuse warm browsers between tests (one pool per xdist worker).",
+    )
+    parser.addoption(
+        "--driver-pool-max-uses",
+        action="store",
+        type=int,
+        default=settings.driver_pool_max_uses,
+        help="Recycle a pooled browser after this many tests.",
+    )
+    parser.addoption(
+        "--artifacts-dir",
+        action="store",
+        default="artifacts",
+        help="Where failure screenshots, page sources and console logs are written.",
+    )
+    parser.addoption(
+        "--compress-artifacts",
+        action="store_true",
+        default=False,
+        help="Gzip page sources/logs and store screenshots as JPEG (needs Pillow).",
+    )
+    parser.addoption(
+        "--step-timings",
+        action="store_true",
+        default=False,
+        help="Time every BasePage call and fixture phase; print the slowest steps.",
+    )
+    parser.addoption(
+        "--step-timings-file",
+        action="store",
+        default=None,
+        help="Write step timings to this .json or .csv file (implies --step-timings).",
+    )
+    parser.addoption(
+        "--step-retries",
+        action="store",
+        type=int,
+        default=settings.step_retries,
+        help="Retry a stale/intercepted/timed-out page step in place up to N times.",
+    )
+    parser.addoption(
+        "--step-retry-reruns",
+        action="store",
+        type=int,
+        default=settings.step_retry_reruns,
+        help="With --step-retries: rerun the whole test this often (unless --reruns).",
+    )
+    parser.addoption(
+        "--trace-mode",
+        action="store",
+        choices=("off", "record", "replay"),
+        default=settings.trace_mode,
+        help="'record' saves each test's driver commands; 'replay' runs them without a browser.",
+    )
+    parser.addoption(
+        "--trace-dir",
+        action="store",
+        default=settings.trace_dir,
+        help="Directory holding one action trace per test.",
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run tests marked 'benchmark' (skipped otherwise).",
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        action="store",
+        default=".benchmarks/baseline.json",
+        help="JSON baseline used for regression gating.",
+    )
+    parser.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="Store this run's benchmark results as the new baseline.",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        action="store",
+        type=float,
+        default=0.25,
+        help="Fail when a median is slower than the baseline by more than this ratio.",
+    )
+    parser.addoption(
+        "--duration-schedule",
+        action="store_true",
+        default=False,
+        help="Record test durations and distribute xdist work longest-first.",
+    )
+    parser.addoption(
+        "--impact-base",
+        action="store",
+        default=settings.impact_base or None,
+        help="Run only tests impacted by the git diff against this ref (e.g. origin/main).",
+    )
+    parser.addoption(
+        "--impact-record",
+        action="store_true",
+        default=False,
+        help="Record which page objects each test uses, for later --impact-base runs.",
+    )
+    parser.addoption(
+        "--storage-state",
+        action="store_true",
+        default=settings.storage_state,
+        help="Log in through the UI once per worker, then restore cookies/localStorage.",
+    )
+    parser.addoption(
+        "--user-pool",
+        action="store_true",
+        default=settings.user_pool,
+        help="Lease a distinct account from E2E_USERS_JSON per worker (or per test).",
+    )
+    parser.addoption(
+        "--user-lease",
+        action="store",
+        choices=("worker", "test"),
+        default="worker",
+        help="With --user-pool: hold one account per worker, or lease one per test.",
+    )
+    parser.addoption(
+        "--user-pool-dir",
+        action="store",
+        default=None,
+        help="Lock directory shared by all processes leasing from the user pool.",
+    )
+    parser.addoption(
+        "--webdriver-offline",
+        action="store_true",
+        default=settings.webdriver_offline,
+        help="Use cached driver/browser paths only; never call Selenium Manager.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Failure artifacts (screenshot, page source, console log, URL)
+    config.pluginmanager.register(
+        FailureArtifactsPlugin(
+            out_dir=config.getoption("--artifacts-dir"),
+            compress=config.getoption("--compress-artifacts"),
+        ),
+        "failure-artifacts",
+    )
+    output = config.getoption("--step-timings-file")
+    if config.getoption("--step-timings") or output:
+        config.pluginmanager.register(
+            timing.StepTimingPlugin(output=output), "step-timings"
+        )
+    if config.getoption("--adaptive-timeouts"):
+        config.pluginmanager.register(
+            AdaptiveTimeoutPlugin(
+                factor=settings.adaptive_timeout_factor,
+                min_timeout=settings.adaptive_timeout_min,
+                max_timeout=settings.adaptive_timeout_max,
+            ),
+            "adaptive-timeouts",
+        )
+    retries = config.getoption("--step-retries")
+    if retries > 0:
+        config.pluginmanager.register(
+            SmartRetryPlugin(
+                RetryPolicy(attempts=1 + retries, timeout_attempts=1 + min(retries, 1)),
+                reruns=config.getoption("--step-retry-reruns"),
+            ),
+            "smart-retry",
+        )
+    trace_mode = config.getoption("--trace-mode")
+    if trace_mode != "off":
+        config.pluginmanager.register(
+            TracePlugin(trace_mode, config.getoption("--trace-dir")), "action-trace"
+        )
+    if config.getoption("--memory-report"):
+        config.pluginmanager.register(MemoryReportPlugin(), "memory-report")
+    if config.getoption("--resource-policy") != "none" or config.getoption(
+        "--resource-report"
+    ):
+        config.pluginmanager.register(
+            ResourceReportPlugin(config.getoption("--resource-policy")),
+            "resource-report",
+        )
+    browsers = parse_browsers(config.getoption("--browsers"))
+    if browsers:
+        config.pluginmanager.register(BrowserMatrixPlugin(browsers), "browser-matrix")
+    if config.getoption("--duration-schedule"):
+        config.pluginmanager.register(
+            DurationSchedulingPlugin(browsers), "duration-schedule"
+        )
+    impact_base = config.getoption("--impact-base")
+    if impact_base or config.getoption("--impact-record"):
+        config.pluginmanager.register(
+            ImpactPlugin(impact_base, full_run=settings.impact_full_run),
+            "test-impact",
+        )
+    if config.getoption("--benchmark"):
+        config.pluginmanager.register(
+            BenchmarkPlugin(
+                baseline_path=config.getoption("--benchmark-baseline"),
+                save=config.getoption("--benchmark-save"),
+                threshold=config.getoption("--benchmark-threshold"),
+            ),
+            "benchmark",
+        )
+
+
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    # Settings are memoized; pick up environment/.env edits once per test
+    settings.refresh()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items) -> None:
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmark(request):
+    """Return `bench(name, func, rounds=50)`, recording stats for the gate."""
+    results = {}
+    request.node.user_properties.append((BENCHMARK_PROPERTY, results))
+
+    def bench(name, func, rounds=50):
+        results[name] = measure(func, rounds=rounds)
+        return results[name]
+
+    return bench
+
+
+@pytest.fixture(scope="session")
+def local_app(pytestconfig: pytest.Config):
+    """Stand-in app started once per session (per xdist worker), or None."""
+    if not pytestconfig.getoption("--local-app"):
+        yield None
+        return
+    app = LocalApp(settings.e2e_users).start()
+    yield app
+    app.stop()
 
 
 @pytest.fixture(scope="session")
-def base_url(pytestconfig: pytest.Config) -> str:
+def base_url(pytestconfig: pytest.Config, local_app) -> str:
+    if local_app is not None:
+        return local_app.url
     return str(pytestconfig.getoption("--base-url"))
 
 
 @pytest.fixture(scope="session")
-def browser_name(pytestconfig: pytest.Config) -> str:
+def browser_name(request, pytestconfig: pytest.Config) -> str:
+    # Parametrized per browser by BrowserMatrixPlugin under --browsers
+    if hasattr(request, "param"):
+        return request.param
     return str(pytestconfig.getoption("--browser")).lower()
 
 
@@ -47,90 +377,311 @@ def headless(pytestconfig: pytest.Config) -> bool:
     return bool(pytestconfig.getoption("--headless"))
 
 
-# Pre-run check: fast pre-check of BASE_URL before any browser spins up
+def _is_fake(browser_name: str) -> bool:
+    return browser_name == "fake" or browser_name.startswith("fake-")
+
+
+# Pre-run check: probe BASE_URL once per run before any browser spins up
 @pytest.fixture(scope="session", autouse=True)
-def preruncheck(base_url: str):
-    """Fail fast (skip) if the site is unavailable or returns 5xx."""
+def preruncheck(pytestconfig: pytest.Config, base_url: str) -> PreflightReport | None:
+    """Skip if critical routes are down (5xx/unreachable) or far too slow.
+
+    Routes are probed concurrently by whichever worker gets there first; the
+    result is shared with the other workers (and runs within
+    `PREFLIGHT_TTL`) through `PREFLIGHT_CACHE`.
+    """
     if os.getenv("SKIP_PRERUN_CHECK", "false").lower() in {"1", "true", "yes", "y"}:
+        return None
+    if pytestconfig.getoption("--trace-mode") == "replay":
+        return None
+    browsers = parse_browsers(pytestconfig.getoption("--browsers")) or [
+        str(pytestconfig.getoption("--browser")).lower()
+    ]
+    if all(_is_fake(b) for b in browsers):
+        return None
+    routes = settings.preflight_routes
+    cache = PreflightCache(settings.preflight_cache, ttl=settings.preflight_ttl)
+    report = cache.get_or_probe(
+        cache_key(base_url, routes), lambda: probe_routes(base_url, routes)
+    )
+    reason = report.skip_reason(settings.preflight_max_latency)
+    if reason:
+        pytest.skip(f"!!! PRE-RUN CHECK: {reason} ({report.summary()})")
+    return report
+
+
+# Replayed answers are instant; waits that timed out while recording need not
+REPLAY_TIMEOUT_SCALE = 0.01
+
+
+@pytest.fixture(scope="session")
+def timeout_scale(
+    pytestconfig: pytest.Config, preruncheck: PreflightReport | None
+) -> float:
+    """Wait-timeout factor derived from preflight latency (1.0 when fast)."""
+    if pytestconfig.getoption("--trace-mode") == "replay":
+        return REPLAY_TIMEOUT_SCALE
+    if preruncheck is None:
+        return 1.0
+    return preruncheck.timeout_scale(settings.preflight_slow_latency)
+
+
+@pytest.fixture(scope="session")
+def resource_policy(pytestconfig: pytest.Config) -> ResourcePolicy:
+    return dataclasses.replace(
+        PROFILES[pytestconfig.getoption("--resource-policy")],
+        report=pytestconfig.getoption("--resource-report"),
+    )
+
+
+@pytest.fixture(scope="session")
+def driver_factory(
+    pytestconfig: pytest.Config, browser_name: str, headless: bool, resource_policy
+):
+    """Zero-argument callable that launches a configured browser.
+
+    Options and driver paths are resolved once per session (per xdist
+    worker); every launch reuses them. `--browser fake` runs against the
+    in-process `FakeDriver` model of the demo site instead of a browser
+    (`fake-<name>` aliases let `--browsers` matrices be dry-run the same way).
+    """
+    if _is_fake(browser_name):
+        from src.fake_driver import FakeDriver, demo_site
+
+        return lambda: FakeDriver(demo_site(settings.e2e_users))
+    profile = BrowserProfile.from_settings(
+        settings,
+        browser=browser_name,
+        headless=headless,
+        page_load_strategy=pytestconfig.getoption("--page-load-strategy"),
+        resource_policy=resource_policy,
+        dense=pytestconfig.getoption("--browser-density") == "dense",
+        # Console logs are captured by the failure artifacts plugin
+        console_log=pytestconfig.pluginmanager.has_plugin("failure-artifacts"),
+        path_cache=DriverPathCache(
+            settings.webdriver_cache,
+            offline=pytestconfig.getoption("--webdriver-offline"),
+        ),
+    )
+    return profile.launch
+
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig: pytest.Config, driver_factory):
+    """Per-worker pool of warm browsers, or None when pooling is disabled."""
+    if not pytestconfig.getoption("--driver-pool"):
+        yield None
         return
-    try:
-        resp = requests.get(base_url, timeout=5)
-        if resp.status_code >= 500:
-            pytest.skip(
-                f"!!! PRE-RUN CHECK: {base_url} responded with {resp.status_code}"
-            )
-    except Exception as e:
-        pytest.skip(f"!!! PRE-RUN CHECK: cannot reach {base_url} — {e}")
+    pool = DriverPool(
+        driver_factory,
+        max_uses=pytestconfig.getoption("--driver-pool-max-uses"),
+    )
+    yield pool
+    pool.close()
 
 
 @pytest.fixture
-def driver(browser_name: str, headless: bool) -> webdriver.Remote:
-    # Use Selenium Manager to resolve drivers automatically
-    if browser_name == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        drv = webdriver.Firefox(options=options)
+def driver(
+    request,
+    pytestconfig: pytest.Config,
+    driver_pool,
+    driver_factory,
+    browser_name: str,
+    resource_policy,
+    base_url: str,
+) -> webdriver.Remote:
+    """WebDriver for one test, pooled or launched per test.
+
+    Under `--trace-mode record` commands are recorded and saved per test;
+    under `--trace-mode replay` a `ReplayDriver` answers them from that
+    trace and no browser is launched.
+    """
+    trace_mode = pytestconfig.getoption("--trace-mode")
+    path = trace_path(pytestconfig.getoption("--trace-dir"), request.node.nodeid)
+    if trace_mode == "replay":
+        trace = load_trace(path)
+        if trace is None:
+            pytest.skip(f"no action trace recorded at {path}")
+        yield ReplayDriver(trace, base_url)
+        return
+    if driver_pool is None:
+        with timing.span("driver.setup", browser_name):
+            drv = driver_factory()
+    else:
+        with timing.span("driver.acquire", browser_name):
+            drv = driver_pool.acquire()
+    if resource_policy.measured:
+        # Drop requests logged before this test, e.g. by a pooled browser's reset
+        resource_policy.collect(drv)
+    if trace_mode == "record":
+        recorder = TraceRecorder(base_url)
+        yield recording_driver(drv, recorder)
+        recorder.save(path, request.node.nodeid)
     else:
-        # Default to chrome
-        options = ChromeOptions()
-        if headless:
-            options.add_argument("--headless=new")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        drv = webdriver.Chrome(options=options)
+        yield drv
+    if pytestconfig.getoption("--memory-report"):
+        request.node.user_properties.append((MEMORY_PROPERTY, sample(drv)))
+    if resource_policy.measured:
+        request.node.user_properties.append(
+            (RESOURCE_PROPERTY, resource_policy.collect(drv))
+        )
+    if driver_pool is None:
+        with timing.span("driver.quit", browser_name):
+            drv.quit()
+    else:
+        with timing.span("driver.release", browser_name):
+            driver_pool.release(drv)
+
 
-    drv.implicitly_wait(0)  # rely on explicit waits
-    yield drv
-    drv.quit()
+@pytest.fixture(scope="session")
+def page_classes():
+    """Page classes discovered under `src/pages`, keyed by registry name."""
+    return discover_pages()
+
+
+@pytest.fixture(scope="session")
+def _page_registries():
+    # Pooled drivers outlive a test; keep their registries with them
+    return weakref.WeakKeyDictionary()
 
 
 @pytest.fixture
-def pages(driver, base_url):
-    class Pages:
-        login = LoginPage(driver, base_url)
-        inventory = InventoryPage(driver, base_url)
-
-    return Pages()
-
-
-# Screenshots on failure (pytest-html compatible)
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    outcome = yield
-    rep = outcome.get_result()
-    if rep.when == "call" and rep.failed:
-        drv = item.funcargs.get("driver", None)
-        if drv:
-            ts = time.strftime("%Y%m%d-%H%M%S")
-            safe_name = item.nodeid.replace("::", "_").replace("/", "_")
-            out_dir = pathlib.Path("artifacts") / "screenshots"
-            out_dir.mkdir(parents=True, exist_ok=True)
-            path = out_dir / f"{safe_name}_{ts}.png"
-            drv.save_screenshot(str(path))
-            # Attach to pytest-html if available
-            extra = getattr(item.config, "_html", None)
-            if extra is not None:
-                from py.xml import html
-
-                rep.extra = getattr(rep, "extra", [])
-                rep.extra.append(html.a("screenshot", href=str(path)))
+def pages(
+    pytestconfig,
+    driver,
+    base_url,
+    page_classes,
+    _page_registries,
+    timeout_scale,
+    browser_name,
+    local_app,
+):
+    registry = _page_registries.get(driver)
+    if registry is None or registry.base_url != base_url:
+        registry = PageRegistry(
+            driver,
+            base_url,
+            classes=page_classes,
+            default_timeout=settings.default_timeout,
+            timeout_scale=timeout_scale,
+            absence_timeout=settings.absence_timeout,
+            wait_engine=pytestconfig.getoption("--wait-engine"),
+            page_load_strategy=pytestconfig.getoption("--page-load-strategy"),
+            # The stand-in app gets a fresh port every session
+            latency_scope=latency_scope(
+                driver, browser_name, "local-app" if local_app is not None else base_url
+            ),
+        )
+        _page_registries[driver] = registry
+    return registry
+
+
+def _worker_index() -> int:
+    """Numeric xdist worker index ("gw3" -> 3), 0 outside xdist."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    return int(worker[2:]) if worker[2:].isdigit() else 0
 
 
 @pytest.fixture(scope="session")
-def creds(pytestconfig: pytest.Config):
-    user = str(pytestconfig.getoption("--user"))
-    users = settings.e2e_users
-    if user not in users:
-        available = ", ".join(users.keys())
-        pytest.exit(f"--user='{user}' not found. Available: {available}")
-    return {"user": user, "password": users[user]}
+def user_pool(pytestconfig: pytest.Config, tmp_path_factory):
+    """Cross-process account pool, or None when `--user-pool` is off."""
+    if not pytestconfig.getoption("--user-pool"):
+        return None
+    # Under xdist the basetemp parent is shared by every worker of the run
+    lock_dir = pytestconfig.getoption("--user-pool-dir") or (
+        tmp_path_factory.getbasetemp().parent / "user-locks"
+    )
+    return UserPool(
+        users_from_settings(settings.e2e_users, settings.e2e_user_meta),
+        lock_dir,
+        timeout=settings.user_pool_timeout,
+    )
+
+
+@pytest.fixture(scope="session")
+def worker_creds(pytestconfig: pytest.Config, user_pool):
+    """Credentials held for the whole session (per xdist worker)."""
+    if user_pool is None or pytestconfig.getoption("--user-lease") == "test":
+        user = str(pytestconfig.getoption("--user"))
+        users = settings.e2e_users
+        if user not in users:
+            available = ", ".join(users.keys())
+            pytest.exit(f"--user='{user}' not found. Available: {available}")
+        yield {"user": user, "password": users[user]}
+        return
+    owner = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    with user_pool.acquire(owner=owner, prefer=_worker_index()) as lease:
+        yield {"user": lease.user.name, "password": lease.user.password}
 
 
 @pytest.fixture
-def login(pages, creds):
-    pages.login.open_login()
-    pages.login.login_as(creds["user"], creds["password"])
-    assert pages.inventory.is_loaded(), "Inventory page did not load after login"
+def creds(request, pytestconfig: pytest.Config, user_pool, worker_creds):
+    """Credentials for this test; the username is recorded in the report.
+
+    With `--user-pool`, tests marked `@pytest.mark.user_tags(...)` (and every
+    test under `--user-lease=test`) lease their own matching account unless
+    the worker's account already carries the tags.
+    """
+    marker = request.node.get_closest_marker("user_tags")
+    tags = set(marker.args) if marker else set()
+    held = next(
+        (
+            u
+            for u in (user_pool.users if user_pool else ())
+            if u.name == worker_creds["user"]
+        ),
+        None,
+    )
+    per_test = pytestconfig.getoption("--user-lease") == "test"
+    if user_pool is None or (not per_test and (held is not None and tags <= held.tags)):
+        request.node.user_properties.append((LOGIN_USER_PROPERTY, worker_creds["user"]))
+        yield worker_creds
+        return
+    with user_pool.acquire(
+        tags, owner=request.node.nodeid, prefer=_worker_index()
+    ) as lease:
+        request.node.user_properties.append((LOGIN_USER_PROPERTY, lease.user.name))
+        yield {"user": lease.user.name, "password": lease.user.password}
+
+
+@pytest.fixture(scope="session")
+def storage_state_cache(pytestconfig: pytest.Config):
+    """Per-worker login snapshot cache, or None when `--storage-state` is off.
+
+    Also off while recording/replaying traces: a restored login depends on
+    which test ran first on the worker, so traces would not replay alone.
+    """
+    if (
+        not pytestconfig.getoption("--storage-state")
+        or pytestconfig.getoption("--trace-mode") != "off"
+    ):
+        return None
+    return StorageStateCache(ttl=settings.storage_state_ttl)
+
+
+@pytest.fixture
+def login(pages, creds, base_url, storage_state_cache):
+    with timing.span("login", creds["user"]):
+        cache = storage_state_cache
+        if cache is not None and cache.restore(
+            pages.login.driver, base_url, creds["user"]
+        ):
+            inventory, login_page = pages.inventory, pages.login
+            inventory.open_inventory(wait_ready=False)
+            # A stale session redirects to the login form; wait (with the
+            # page's scaled timeout) for whichever page shows up first
+            landed = inventory.first_present(
+                inventory.TITLE, login_page.USERNAME, login_page.ERROR
+            )
+            if landed == inventory.TITLE:
+                return pages
+            if landed is not None:
+                # Snapshot went stale server-side: fall back to a real UI login
+                cache.invalidate(base_url, creds["user"])
+
+        pages.login.open_login()
+        pages.login.login_as(creds["user"], creds["password"])
+        assert pages.inventory.is_loaded(), "Inventory page did not load after login"
+        if cache is not None:
+            cache.save(base_url, creds["user"], cache.capture(pages.login.driver))
     return pages
@@ -0,0 +1,414 @@
+from __future__ import annotations
+import builtins
+import gzip
+import hashlib
+import json
+import pathlib
+import re
+from typing import TYPE_CHECKING, Any, Callable
+
+from selenium.common import exceptions as selenium_exceptions
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from src.timing import hookimpl
+
+if TYPE_CHECKING:
+    import pytest
+
+TRACE_VERSION = 1
+USER_PROPERTY = "action_trace_diverged"
+# Placeholder for the base URL, so traces replay against any host/port.
+BASE_URL = "{base_url}"
+# Longer string arguments (scripts) are stored as a hash.
+LONG_ARG = 120
+
+# Commands that change page state. Reads between two of them form a "step";
+# only the last response to each read in a step is kept, so waits that
+# polled while recording resolve on their first poll in replay.
+MUTATING = frozenset(
+    {
+        "get",
+        "refresh",
+        "back",
+        "forward",
+        "click",
+        "send_keys",
+        "clear",
+        "submit",
+        "add_cookie",
+        "delete_cookie",
+        "delete_all_cookies",
+        "execute_script",
+    }
+)
+# Commands that do not affect what tests observe; not recorded, and answered
+# with these defaults in replay.
+PASSTHROUGH: dict[str, Any] = {
+    "quit": None,
+    "close": None,
+    "implicitly_wait": None,
+    "set_script_timeout": None,
+    "set_page_load_timeout": None,
+    "set_window_size": None,
+    "maximize_window": None,
+    "get_screenshot_as_png": b"",
+    "get_screenshot_as_base64": "",
+    "save_screenshot": False,
+    "get_log": [],
+}
+# Arguments left out of a command's key; the last argument of an event wait
+# script is its time budget, which varies with the timeout settings.
+IGNORED_ARGS = {"execute_async_script": slice(-1)}
+# Commands whose string arguments are always hashed (typed passwords).
+HASHED_ARGS = frozenset({"send_keys"})
+
+
+class TraceMismatch(Exception):
+    """Replay met a command the recorded run did not issue at that point."""
+
+
+def trace_path(trace_dir: str | pathlib.Path, nodeid: str) -> pathlib.Path:
+    """File holding the trace of test `nodeid`."""
+    return pathlib.Path(trace_dir) / (re.sub(r"[^\w.-]+", "_", nodeid) + ".json.gz")
+
+
+def _is_element(value: Any) -> bool:
+    # Class-level check: probing a WebElement property would run a command
+    cls = type(value)
+    return isinstance(value, WebElement) or all(
+        hasattr(cls, name) for name in ("click", "get_attribute", "is_displayed")
+    )
+
+
+def _is_property(cls: type, name: str) -> bool:
+    return isinstance(getattr(cls, name, None), property)
+
+
+class _Codec:
+    """JSON form of command arguments and results shared by record and replay."""
+
+    def __init__(self, base_url: str, element_id: Callable[[Any], str]) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.element_id = element_id
+
+    def encode(self, value: Any, arg: bool = False, hashed: bool = False) -> Any:
+        if _is_element(value) or isinstance(value, _Proxy):
+            return {"$el": self.element_id(value)}
+        if isinstance(value, str):
+            if hashed or (arg and len(value) > LONG_ARG):
+                return {"$sha": hashlib.sha1(value.encode()).hexdigest()[:16]}
+            return value.replace(self.base_url, BASE_URL) if self.base_url else value
+        if isinstance(value, (list, tuple)):
+            return [self.encode(v, arg, hashed) for v in value]
+        if isinstance(value, dict):
+            return {str(k): self.encode(v, arg, hashed) for k, v in value.items()}
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        return repr(value)
+
+    def encode_args(self, op: str, args: list[Any] | None) -> Any:
+        if args is None:
+            return None
+        return self.encode(
+            args[IGNORED_ARGS.get(op, slice(None))], arg=True, hashed=op in HASHED_ARGS
+        )
+
+    def key(self, epoch: int, target: str, op: str, args: Any) -> str:
+        return json.dumps([epoch, target, op, args], sort_keys=True)
+
+
+class TraceRecorder:
+    """Collect the commands of one test for `save()`.
+
+    Attributes:
+        base_url: Base URL of the recorded run, stored as a placeholder.
+        epoch: Number of state-changing commands issued so far.
+        entries: `{key: [epoch, target, op, args, outcome]}`, last response
+            per read and step.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        """Initialise an empty recording."""
+        self.base_url = base_url
+        self.epoch = 0
+        self.entries: dict[str, list[Any]] = {}
+        self._elements: dict[Any, str] = {}
+        self._codec = _Codec(base_url, self._element_id)
+
+    def _element_id(self, element: Any) -> str:
+        element = element._obj if isinstance(element, _Proxy) else element
+        # WebElements compare by remote id, so re-finding one maps to the same id
+        if element not in self._elements:
+            self._elements[element] = f"e{len(self._elements) + 1}"
+        return self._elements[element]
+
+    def record(
+        self,
+        target: str,
+        op: str,
+        args: Any,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Store the outcome of a command, then advance the step if it mutates."""
+        enc_args = self._codec.encode_args(op, args)
+        if error is not None:
+            outcome = {"error": [type(error).__name__, str(error).strip()[:500]]}
+        else:
+            outcome = {"value": self._codec.encode(result)}
+        key = self._codec.key(self.epoch, target, op, enc_args)
+        self.entries.pop(key, None)
+        self.entries[key] = [self.epoch, target, op, enc_args, outcome]
+        if op in MUTATING:
+            self.epoch += 1
+
+    def wrap(self, value: Any) -> Any:
+        """Return `value` with elements replaced by recording proxies."""
+        if _is_element(value):
+            return _Proxy(value, self._element_id(value), self)
+        if isinstance(value, list):
+            return [self.wrap(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.wrap(v) for k, v in value.items()}
+        return value
+
+    def save(self, path: str | pathlib.Path, nodeid: str) -> None:
+        """Write the trace as gzip-compressed JSON."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": TRACE_VERSION,
+            "nodeid": nodeid,
+            "entries": list(self.entries.values()),
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, _Proxy):
+        return value._obj
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    return value
+
+
+class _Proxy:
+    """Forward attribute access to a driver/element and record each command."""
+
+    def __init__(self, obj: Any, name: str, recorder: TraceRecorder) -> None:
+        self._obj = obj
+        self._name = name
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        obj, recorder = self._obj, self._recorder
+        try:
+            value = getattr(obj, name)
+        except AttributeError:
+            raise
+        except Exception as exc:
+            # A property read failed, e.g. `.text` of a stale element
+            recorder.record(self._name, name, None, error=exc)
+            raise
+        if name.startswith("_") or name in PASSTHROUGH:
+            return value
+        if not callable(value):
+            recorder.record(self._name, name, None, value)
+            return recorder.wrap(value)
+
+        def command(*args, **kwargs):
+            call_args = list(args) + ([kwargs] if kwargs else [])
+            try:
+                result = value(
+                    *_unwrap(args), **{k: _unwrap(v) for k, v in kwargs.items()}
+                )
+            except Exception as exc:
+                recorder.record(self._name, name, call_args, error=exc)
+                raise
+            recorder.record(self._name, name, call_args, result)
+            return recorder.wrap(result)
+
+        return command
+
+
+def recording_driver(driver: Any, recorder: TraceRecorder) -> Any:
+    """Wrap `driver` so every command issued through it is recorded."""
+    return _Proxy(driver, "driver", recorder)
+
+
+def load_trace(path: str | pathlib.Path) -> dict[str, Any] | None:
+    """Read a trace written by `TraceRecorder.save`, or None if missing/outdated."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == TRACE_VERSION else None
+
+
+def _exception(name: str, message: str) -> Exception:
+    cls = getattr(selenium_exceptions, name, None) or getattr(builtins, name, None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        return cls(message)
+    return selenium_exceptions.WebDriverException(f"{name}: {message}")
+
+
+class ReplayDriver:
+    """Stub WebDriver answering commands from a recorded trace.
+
+    Commands are matched by step (number of state-changing commands so far),
+    target, name and arguments. A command the recording does not contain
+    raises `TraceMismatch` and is kept in `mismatches`, so a mismatch that
+    page-object code swallows still fails the test.
+
+    Attributes:
+        base_url: Base URL substituted for the recorded placeholder.
+        epoch: Number of state-changing commands replayed so far.
+        mismatches: Descriptions of commands missing from the trace.
+        simulated: Marks a driver without a real browser (see
+            `adaptive_timeouts.latency_scope`).
+    """
+
+    simulated = True
+
+    def __init__(self, trace: dict[str, Any], base_url: str) -> None:
+        """Initialise the replay.
+
+        Args:
+            trace: Data returned by `load_trace`.
+            base_url: Base URL of this run.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.epoch = 0
+        self.mismatches: list[str] = []
+        self._codec = _Codec(base_url, lambda el: el._id)
+        self._entries = {
+            self._codec.key(*entry[:4]): entry[4] for entry in trace["entries"]
+        }
+        self._elements: dict[str, ReplayElement] = {}
+
+    def _decode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return value.replace(BASE_URL, self.base_url)
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        if isinstance(value, dict):
+            if set(value) == {"$el"}:
+                element_id = value["$el"]
+                if element_id not in self._elements:
+                    self._elements[element_id] = ReplayElement(self, element_id)
+                return self._elements[element_id]
+            return {k: self._decode(v) for k, v in value.items()}
+        return value
+
+    def _answer(self, target: str, op: str, args: Any) -> Any:
+        enc_args = self._codec.encode_args(op, args)
+        outcome = self._entries.get(self._codec.key(self.epoch, target, op, enc_args))
+        if op in MUTATING:
+            self.epoch += 1
+        if outcome is None:
+            message = (
+                f"step {self.epoch}: {target}.{op}"
+                f"{'' if args is None else json.dumps(enc_args)} was not recorded"
+            )
+            self.mismatches.append(message)
+            raise TraceMismatch(message)
+        if "error" in outcome:
+            raise _exception(*outcome["error"])
+        return self._decode(outcome["value"])
+
+    def _access(self, target: str, cls: type, name: str) -> Any:
+        if name in PASSTHROUGH:
+            return lambda *args, **kwargs: PASSTHROUGH[name]
+        if _is_property(cls, name):
+            return self._answer(target, name, None)
+
+        def command(*args, **kwargs):
+            return self._answer(target, name, list(args) + ([kwargs] if kwargs else []))
+
+        return command
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._access("driver", WebDriver, name)
+
+
+class ReplayElement:
+    """Element handle of a `ReplayDriver`; commands are answered from the trace."""
+
+    def __init__(self, driver: ReplayDriver, element_id: str) -> None:
+        self._driver = driver
+        self._id = element_id
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._driver._access(self._id, WebElement, name)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ReplayElement) and other._id == self._id
+
+    def __hash__(self) -> int:
+        return hash(self._id)
+
+
+class TracePlugin:
+    """Pytest plugin: fail replayed tests whose mismatches were swallowed.
+
+    Page-object helpers such as `exists()` treat any exception as "no", so a
+    `TraceMismatch` can vanish inside them; the call report of such a test is
+    turned into a failure. Counts of recorded and replayed tests are shown
+    in the terminal summary.
+
+    Attributes:
+        mode: "record" or "replay".
+        trace_dir: Directory holding one trace file per test.
+    """
+
+    def __init__(self, mode: str, trace_dir: str) -> None:
+        """Initialise the plugin.
+
+        Args:
+            mode: "record" or "replay".
+            trace_dir: Directory holding one trace file per test.
+        """
+        self.mode = mode
+        self.trace_dir = trace_dir
+        self.tests = 0
+        self.mismatched = 0
+
+    @hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.when != "call" or "driver" not in item.funcargs:
+            return
+        drv = item.funcargs["driver"]
+        diverged = isinstance(drv, ReplayDriver) and bool(drv.mismatches)
+        if diverged and rep.passed:
+            rep.outcome = "failed"
+            rep.longrepr = "Replay diverged from the recorded trace:\n" + "\n".join(
+                drv.mismatches
+            )
+        rep.user_properties.append((USER_PROPERTY, diverged))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        for name, diverged in report.user_properties:
+            if name == USER_PROPERTY:
+                self.tests += 1
+                self.mismatched += diverged
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.tests:
+            return
+        verb = "recorded to" if self.mode == "record" else "replayed from"
+        line = f"{self.tests} tests {verb} {self.trace_dir}"
+        if self.mismatched:
+            line += f", {self.mismatched} diverged (re-record them)"
+        terminalreporter.write_sep("=", "action traces")
+        terminalreporter.write_line(line)
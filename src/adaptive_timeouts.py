@@ -0,0 +1,243 @@
+from __future__ import annotations
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from src.stats import percentile
+from src.timing import hookimpl
+
+if TYPE_CHECKING:
+    import pytest
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CACHE_KEY = "e2e/wait-latencies"
+USER_PROPERTY = "wait_latencies"
+
+# Most recent samples kept per locator; older runs age out.
+WINDOW = 100
+# Samples needed before a locator gets its own timeout.
+MIN_SAMPLES = 5
+# Percentile of observed latencies the timeout is derived from.
+PERCENTILE = 95
+
+
+class LatencyStore:
+    """Observed wait latencies per locator, persisted in the pytest cache.
+
+    A locator's timeout is `PERCENTILE` of its recent latencies times
+    `factor`, clamped to `[min_timeout, max_timeout]`; locators with fewer
+    than `MIN_SAMPLES` observations keep the page's default timeout. Keys
+    are `latency_key()`s, so every browser/site pair learns separately.
+
+    Attributes:
+        samples: `{key: [seconds, ...]}`, newest last.
+        factor: Safety factor applied to the percentile.
+        min_timeout: Lower bound of a learned timeout in seconds.
+        max_timeout: Upper bound of a learned timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        samples: dict[str, list[float]] | None = None,
+        factor: float = 3.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 30.0,
+    ) -> None:
+        """Initialise the store.
+
+        Args:
+            samples: Previously saved samples.
+            factor: Safety factor applied to the percentile.
+            min_timeout: Lower bound of a learned timeout in seconds.
+            max_timeout: Upper bound of a learned timeout in seconds.
+        """
+        self.samples: dict[str, list[float]] = {
+            k: list(v) for k, v in (samples or {}).items()
+        }
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._timeouts: dict[str, float] = {}
+
+    @classmethod
+    def load(cls, config: pytest.Config, **bounds: float) -> "LatencyStore":
+        """Read samples from `config.cache` (empty if caching is disabled)."""
+        cache = getattr(config, "cache", None)
+        return cls(cache.get(CACHE_KEY, {}) if cache is not None else {}, **bounds)
+
+    def save(self, config: pytest.Config) -> None:
+        """Write samples back to `config.cache`, if caching is enabled."""
+        cache = getattr(config, "cache", None)
+        if cache is not None:
+            cache.set(CACHE_KEY, self.samples)
+
+    def record(self, locator: str, seconds: float) -> None:
+        """Add one observed latency."""
+        window = self.samples.setdefault(locator, [])
+        window.append(round(seconds, 4))
+        del window[:-WINDOW]
+        self._timeouts.pop(locator, None)
+
+    def timeout_for(self, locator: str, default: float | None) -> float | None:
+        """Return the learned timeout for `locator`, or `default` without history."""
+        timeout = self._timeouts.get(locator)
+        if timeout is None:
+            window = self.samples.get(locator, [])
+            if len(window) < MIN_SAMPLES:
+                return default
+            learned = percentile(window, PERCENTILE) * self.factor
+            timeout = min(self.max_timeout, max(self.min_timeout, learned))
+            self._timeouts[locator] = timeout
+        return timeout
+
+
+@functools.lru_cache(maxsize=None)
+def _locator_names(cls: type) -> dict[tuple[str, str], str]:
+    """Map locator tuples declared on a page class (and its bases) to names."""
+    names: dict[tuple[str, str], str] = {}
+    for klass in reversed(cls.__mro__):
+        own: dict[tuple[str, str], str] = {}
+        for attr, value in vars(klass).items():
+            if (
+                attr.isupper()
+                and isinstance(value, tuple)
+                and len(value) == 2
+                and all(isinstance(part, str) for part in value)
+            ):
+                # First name wins within a class (`READY = TITLE` -> TITLE)
+                own.setdefault(value, f"{klass.__name__}.{attr}")
+        names.update(own)
+    return names
+
+
+def locator_name(cls: type, by: str, value: str) -> str:
+    """Name a locator after its page attribute, e.g. "LoginPage.LOGIN_BTN"."""
+    return _locator_names(cls).get((by, value), f"{by}={value}")
+
+
+def latency_scope(driver: Any, browser: str, site: str) -> str | None:
+    """Label the latencies of `driver` are learned under, e.g. "chrome <url>".
+
+    Returns None for drivers marked `simulated = True` (`FakeDriver`,
+    `ReplayDriver`, also behind a trace recorder): they answer instantly, so
+    their latencies would teach real browsers timeouts that are far too
+    short.
+    """
+    # Unwrap a trace recorder; reading through it would record the probe
+    if getattr(getattr(driver, "_obj", driver), "simulated", False) is True:
+        return None
+    return f"{browser} {site}"
+
+
+def latency_key(scope: str, name: str) -> str:
+    """Store key of locator `name` under `scope` (browser and site)."""
+    return f"{scope} {name}"
+
+
+# Active store for this process; None keeps `adaptive` down to one check.
+store: LatencyStore | None = None
+# `(locator, seconds)` observed since the last test report in this process.
+observed: list[tuple[str, float]] = []
+
+
+def adaptive(func: F) -> F:
+    """Decorate a `(by, value, ...)` page wait to use and feed learned timeouts.
+
+    While a store is active and the page has a `latency_scope`, the page's
+    wait budget is swapped for the locator's learned timeout (times the
+    page's `timeout_scale`) for the duration of the call, and the time the
+    call took (divided by `timeout_scale`) is recorded when it succeeds;
+    timeouts teach nothing about how long the element takes.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, by, value, *args, **kwargs):
+        if store is None or self.latency_scope is None:
+            return func(self, by, value, *args, **kwargs)
+        key = latency_key(self.latency_scope, locator_name(type(self), by, value))
+        learned = store.timeout_for(key, None)
+        previous = self._set_timeout(
+            self.default_timeout if learned is None else learned * self.timeout_scale
+        )
+        started = time.perf_counter()
+        try:
+            result = func(self, by, value, *args, **kwargs)
+        finally:
+            self._set_timeout(previous)
+        observed.append((key, (time.perf_counter() - started) / self.timeout_scale))
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+class AdaptiveTimeoutPlugin:
+    """Pytest plugin that learns per-locator wait timeouts across runs.
+
+    Every process loads the stored latencies at configure time and uses them
+    for `adaptive` waits of pages with a `latency_scope`. Latencies observed
+    by a test travel on its teardown report (`user_properties`), so the
+    controller merges them with or without pytest-xdist and saves them at the
+    end of the session.
+
+    Attributes:
+        store: Latencies loaded at configure time and updated during the run.
+    """
+
+    def __init__(
+        self, factor: float = 3.0, min_timeout: float = 1.0, max_timeout: float = 30.0
+    ) -> None:
+        """Initialise the plugin.
+
+        Args:
+            factor: Safety factor applied to the latency percentile.
+            min_timeout: Lower bound of a learned timeout in seconds.
+            max_timeout: Upper bound of a learned timeout in seconds.
+        """
+        self._bounds = {
+            "factor": factor,
+            "min_timeout": min_timeout,
+            "max_timeout": max_timeout,
+        }
+        self.store = LatencyStore(**self._bounds)
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        global store
+        self.store = LatencyStore.load(config, **self._bounds)
+        # Timeouts come from history only; this run's samples apply next run
+        store = LatencyStore(self.store.samples, **self._bounds)
+
+    def pytest_unconfigure(self, config: pytest.Config) -> None:
+        global store
+        store = None
+
+    @hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call) -> None:
+        if call.when == "teardown":
+            item.user_properties.append((USER_PROPERTY, list(observed)))
+            observed.clear()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                for locator, seconds in value:
+                    self.store.record(locator, seconds)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if not hasattr(session.config, "workerinput"):
+            self.store.save(session.config)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        learned = [
+            (locator, len(window), self.store.timeout_for(locator, 0.0))
+            for locator, window in self.store.samples.items()
+            if len(window) >= MIN_SAMPLES
+        ]
+        if not learned:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "adaptive timeouts")
+        for locator, count, timeout in sorted(learned, key=lambda row: -row[2]):
+            tr.write_line(f"  {timeout:6.2f}s  {count:4d} samples  {locator}")
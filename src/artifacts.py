@@ -0,0 +1,195 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import pathlib
+import queue
+import threading
+import time
+from typing import Any
+
+import pytest
+
+_STOP = object()
+
+
+def _to_jpeg(png: bytes, quality: int = 70) -> bytes:
+    """Re-encode a PNG screenshot as JPEG (requires Pillow)."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as img:
+        out = io.BytesIO()
+        img.convert("RGB").save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+class ArtifactWriter:
+    """Write failure artifacts from a background thread.
+
+    Capturing from the browser must happen before the driver is torn down,
+    but encoding and disk I/O do not: `submit_*()` only enqueue bytes, and a
+    daemon thread writes them. The queue is bounded, so a burst of failures
+    applies back-pressure instead of growing memory without limit.
+
+    Attributes:
+        out_dir: Root directory for artifacts.
+        compress: Gzip text artifacts and, when Pillow is installed,
+            re-encode screenshots as JPEG.
+    """
+
+    def __init__(
+        self, out_dir: str | pathlib.Path, compress: bool = False, max_pending: int = 16
+    ) -> None:
+        """Start the writer thread.
+
+        Args:
+            out_dir: Root directory; files go to `screenshots/` and `pages/`.
+            compress: Enable screenshot re-encoding and text gzip.
+            max_pending: Maximum number of queued (unwritten) artifacts.
+        """
+        self.out_dir = pathlib.Path(out_dir)
+        self.compress = compress
+        self._jpeg = compress and importlib.util.find_spec("PIL") is not None
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._seen: dict[str, pathlib.Path] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="artifact-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit_screenshot(self, name: str, png: bytes) -> pathlib.Path:
+        """Queue a screenshot and return the path it will be written to.
+
+        Identical screenshots (same content hash) are written once; later
+        submissions return the first path.
+
+        Args:
+            name: File stem, e.g. a sanitised test id plus timestamp.
+            png: Raw PNG bytes from `get_screenshot_as_png()`.
+
+        Returns:
+            pathlib.Path: Final location of the image.
+        """
+        digest = hashlib.sha256(png).hexdigest()
+        with self._lock:
+            if digest in self._seen:
+                return self._seen[digest]
+            ext = "jpg" if self._jpeg else "png"
+            path = self.out_dir / "screenshots" / f"{name}.{ext}"
+            self._seen[digest] = path
+        self._queue.put(("image", path, png))
+        return path
+
+    def submit_text(self, name: str, text: str, ext: str) -> pathlib.Path:
+        """Queue a text artifact (page source, console log, metadata).
+
+        Args:
+            name: File stem.
+            text: Content.
+            ext: Extension without dot, e.g. "html" or "json".
+
+        Returns:
+            pathlib.Path: Final location of the file.
+        """
+        suffix = f".{ext}.gz" if self.compress else f".{ext}"
+        path = self.out_dir / "pages" / f"{name}{suffix}"
+        self._queue.put(("text", path, text))
+        return path
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write everything still queued and stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        created: set[pathlib.Path] = set()
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            kind, path, payload = job
+            try:
+                if path.parent not in created:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    created.add(path.parent)
+                if kind == "image":
+                    path.write_bytes(_to_jpeg(payload) if self._jpeg else payload)
+                elif self.compress:
+                    path.write_bytes(gzip.compress(payload.encode("utf-8")))
+                else:
+                    path.write_text(payload, encoding="utf-8")
+            except Exception:
+                # Artifact capture must never break the run
+                pass
+
+
+def _browser_logs(drv) -> list[dict[str, Any]]:
+    """Return browser console logs where the driver supports them (Chromium)."""
+    try:
+        return drv.get_log("browser")
+    except Exception:
+        return []
+
+
+class FailureArtifactsPlugin:
+    """Capture screenshot, page source, console log and URL for failed tests.
+
+    Attributes:
+        out_dir: Artifact root directory.
+        compress: Passed to `ArtifactWriter`.
+    """
+
+    def __init__(self, out_dir: str = "artifacts", compress: bool = False) -> None:
+        """Initialise the plugin (the writer thread starts on first failure)."""
+        self.out_dir = out_dir
+        self.compress = compress
+        self._writer: ArtifactWriter | None = None
+
+    @property
+    def writer(self) -> ArtifactWriter:
+        """Lazily started background writer."""
+        if self._writer is None:
+            self._writer = ArtifactWriter(self.out_dir, compress=self.compress)
+        return self._writer
+
+    @pytest.hookimpl(tryfirst=True, hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        if rep.when != "call" or not rep.failed:
+            return
+        drv = item.funcargs.get("driver", None)
+        if not drv:
+            return
+        ts = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{item.nodeid.replace('::', '_').replace('/', '_')}_{ts}"
+        try:
+            png = drv.get_screenshot_as_png()
+            url = drv.current_url
+            source = drv.page_source
+        except Exception:
+            return
+        shot = self.writer.submit_screenshot(name, png)
+        self.writer.submit_text(name, source, "html")
+        self.writer.submit_text(
+            name,
+            json.dumps(
+                {"url": url, "screenshot": str(shot), "console": _browser_logs(drv)},
+                indent=2,
+            ),
+            "json",
+        )
+        # Attach to pytest-html if available
+        if item.config.pluginmanager.hasplugin("html"):
+            from pytest_html import extras
+
+            rep.extras = getattr(rep, "extras", [])
+            rep.extras.append(extras.url(str(shot), name="screenshot"))
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
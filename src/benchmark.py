@@ -0,0 +1,146 @@
+from __future__ import annotations
+import json
+import pathlib
+import statistics
+import time
+from typing import Any, Callable
+
+import pytest
+
+USER_PROPERTY = "benchmark"
+
+
+def measure(func: Callable[[], Any], rounds: int = 50, warmup: int = 2) -> dict:
+    """Run `func` repeatedly and return timing statistics in seconds.
+
+    Args:
+        func: Zero-argument callable to time.
+        rounds: Number of timed calls.
+        warmup: Untimed calls made first (imports, caches).
+
+    Returns:
+        dict: `min`, `median`, `mean` and `rounds`.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "rounds": len(samples),
+    }
+
+
+def compare(
+    current: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float,
+    floor: float = 5e-6,
+) -> list[dict[str, Any]]:
+    """Return metrics whose median regressed beyond `threshold`.
+
+    Args:
+        current: Results of this run keyed by metric name.
+        baseline: Stored results keyed by metric name.
+        threshold: Allowed relative slowdown, e.g. 0.25 for +25 %.
+        floor: Absolute slowdown in seconds ignored as timer noise.
+
+    Returns:
+        list[dict]: One entry per regression with `name`, `baseline`,
+        `current` and `ratio`; metrics missing from the baseline are ignored.
+    """
+    regressions = []
+    for name, stats in sorted(current.items()):
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["median"], stats["median"]
+        if now - before > floor and now > before * (1 + threshold):
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline": before,
+                    "current": now,
+                    "ratio": now / before if before else float("inf"),
+                }
+            )
+    return regressions
+
+
+class BenchmarkPlugin:
+    """Collect `benchmark` fixture results, store baselines and gate regressions.
+
+    Results travel on test reports (`user_properties`), so they are merged on
+    the controller when benchmarks happen to run under pytest-xdist.
+
+    Attributes:
+        baseline_path: JSON file holding the reference results.
+        save: Overwrite the baseline with this run's results.
+        threshold: Allowed relative slowdown before the run fails.
+        results: Results gathered in this run keyed by metric name.
+        regressions: Metrics that exceeded the threshold.
+    """
+
+    def __init__(self, baseline_path: str, save: bool, threshold: float) -> None:
+        """Initialise the plugin.
+
+        Args:
+            baseline_path: Path of the JSON baseline file.
+            save: Write results to `baseline_path` instead of comparing.
+            threshold: Allowed relative slowdown, e.g. 0.25.
+        """
+        self.baseline_path = pathlib.Path(baseline_path)
+        self.save = save
+        self.threshold = threshold
+        self.results: dict[str, dict] = {}
+        self.regressions: list[dict[str, Any]] = []
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.results.update(value)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus) -> None:
+        if hasattr(session.config, "workerinput") or not self.results:
+            return
+        if self.save:
+            self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            self.baseline_path.write_text(
+                json.dumps(self.results, indent=2, sort_keys=True), encoding="utf-8"
+            )
+            return
+        if not self.baseline_path.exists():
+            return
+        baseline = json.loads(self.baseline_path.read_text(encoding="utf-8"))
+        self.regressions = compare(self.results, baseline, self.threshold)
+        if self.regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.results:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "benchmarks")
+        for name, stats in sorted(self.results.items()):
+            tr.write_line(
+                f"  {stats['median'] * 1e3:10.3f} ms median  "
+                f"{stats['min'] * 1e3:10.3f} ms min  {name}"
+            )
+        if self.save:
+            tr.write_line(f"baseline saved to {self.baseline_path}")
+        elif not self.baseline_path.exists():
+            tr.write_line(f"no baseline at {self.baseline_path}; use --benchmark-save")
+        for r in self.regressions:
+            tr.write_line(
+                f"REGRESSION {r['name']}: {r['baseline'] * 1e3:.3f} ms -> "
+                f"{r['current'] * 1e3:.3f} ms (x{r['ratio']:.2f}, "
+                f"threshold +{self.threshold:.0%})",
+                red=True,
+            )
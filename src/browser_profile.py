@@ -0,0 +1,296 @@
+from __future__ import annotations
+import functools
+import json
+import os
+import pathlib
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import selenium
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from src.resource_policy import PROFILES, ResourcePolicy, add_logging_prefs
+
+CHROME_DEFAULT_ARGS = ("--no-sandbox", "--disable-dev-shm-usage")
+# "dense" profile: drop background work and helper processes a test run does
+# not need, so more browsers fit on one runner.
+DENSE_CHROME_ARGS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+)
+DENSE_FIREFOX_PREFS: dict[str, Any] = {
+    "layers.acceleration.disabled": True,
+    "extensions.update.enabled": False,
+    "app.update.auto": False,
+    "browser.safebrowsing.update.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "services.sync.enabled": False,
+    "network.prefetch-next": False,
+    "media.autoplay.default": 5,
+}
+
+
+def _fingerprint(path: str) -> list[int] | None:
+    """Return `[size, mtime_ns]` of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class DriverPathCache:
+    """File-backed cache of driver/browser binaries resolved by Selenium Manager.
+
+    An entry is valid while both binaries still exist with the same size and
+    modification time and the Selenium version is unchanged, so a browser or
+    driver update triggers a fresh lookup. In offline mode a stored entry is
+    trusted as long as the files exist and Selenium Manager is never called.
+
+    Attributes:
+        path: JSON file holding the cache.
+        offline: Never call Selenium Manager; rely on the cache only.
+    """
+
+    def __init__(self, path: str | pathlib.Path, offline: bool = False) -> None:
+        """Initialise the cache.
+
+        Args:
+            path: JSON cache file (created on first successful resolution).
+            offline: Resolve from the cache only.
+        """
+        self.path = pathlib.Path(path)
+        self.offline = offline
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, data: dict[str, Any]) -> None:
+        # Atomic replace: several xdist workers may resolve at the same time
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(tmp, self.path)
+
+    def lookup(self, browser: str) -> dict[str, Any] | None:
+        """Return a still-valid entry for `browser`, or None."""
+        entry = self._load().get(browser)
+        if not entry:
+            return None
+        if self.offline:
+            return entry if os.path.isfile(entry["driver_path"]) else None
+        if entry.get("selenium") != selenium.__version__:
+            return None
+        for key in ("driver", "browser"):
+            path = entry.get(f"{key}_path")
+            if path and _fingerprint(path) != entry.get(f"{key}_fingerprint"):
+                return None
+        return entry
+
+    def resolve(self, browser: str, options) -> dict[str, Any] | None:
+        """Return driver/browser paths for `browser`, resolving on a cache miss.
+
+        Args:
+            browser: "chrome" or "firefox".
+            options: Options passed to Selenium Manager (browser version, binary).
+
+        Returns:
+            dict | None: Entry with `driver_path` and `browser_path`, or None
+            if resolution failed (Selenium then falls back to its own lookup).
+
+        Raises:
+            RuntimeError: In offline mode when the cache has no usable entry.
+        """
+        entry = self.lookup(browser)
+        if entry is not None:
+            return entry
+        if self.offline:
+            raise RuntimeError(
+                f"No cached {browser} driver in {self.path}; run once online first"
+            )
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        from selenium.webdriver.common.driver_finder import DriverFinder
+
+        try:
+            args = DriverFinder(None, options)._to_args()
+            output = SeleniumManager().binary_paths(args)
+        except Exception:
+            return None
+        entry = {
+            "driver_path": output.get("driver_path", ""),
+            "browser_path": output.get("browser_path", ""),
+            "driver_fingerprint": _fingerprint(output.get("driver_path", "")),
+            "browser_fingerprint": _fingerprint(output.get("browser_path", "")),
+            "selenium": selenium.__version__,
+            "resolved_at": time.time(),
+        }
+        data = self._load()
+        data[browser] = entry
+        self._store(data)
+        return entry
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Immutable browser launch profile built once per session.
+
+    Options are compiled on first use and reused for every browser the
+    session starts; driver binaries come from a `DriverPathCache` when one
+    is given, so Selenium Manager runs at most once per machine and version.
+
+    Attributes:
+        browser: "chrome" or "firefox" (anything else means chrome).
+        headless: Run without a visible window.
+        window_size: "width,height".
+        extra_args: Additional browser command-line arguments.
+        page_load_strategy: "normal", "eager" or "none".
+        resource_policy: Resource blocking profile.
+        dense: Apply the low-footprint flags (`DENSE_CHROME_ARGS`,
+            `DENSE_FIREFOX_PREFS`), cap renderer processes and use `cache_dir`.
+        renderer_process_limit: Renderer/content processes per browser in
+            dense mode.
+        cache_dir: Disk cache root shared by the browsers of a worker in
+            dense mode ("" for the browser's own per-profile cache).
+        console_log: Keep the browser console log for failure artifacts
+            (`goog:loggingPrefs` browser level; Chromium only).
+        path_cache: Driver/browser path cache, or None to always use
+            Selenium Manager.
+    """
+
+    browser: str = "chrome"
+    headless: bool = False
+    window_size: str = "1920,1080"
+    extra_args: tuple[str, ...] = ()
+    page_load_strategy: str = "normal"
+    resource_policy: ResourcePolicy = PROFILES["none"]
+    dense: bool = False
+    renderer_process_limit: int = 2
+    cache_dir: str = ""
+    console_log: bool = False
+    path_cache: DriverPathCache | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> "BrowserProfile":
+        """Build a profile from `Settings`, with CLI values in `overrides`."""
+        values = {
+            "browser": settings.browser,
+            "headless": settings.headless,
+            "window_size": settings.window_size,
+            "extra_args": tuple(settings.browser_args),
+            "page_load_strategy": settings.page_load_strategy,
+            "resource_policy": PROFILES[settings.resource_policy],
+            "dense": settings.browser_density == "dense",
+            "renderer_process_limit": settings.renderer_process_limit,
+            "cache_dir": settings.browser_cache_dir,
+            "path_cache": DriverPathCache(
+                settings.webdriver_cache, offline=settings.webdriver_offline
+            ),
+        }
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def is_firefox(self) -> bool:
+        return self.browser == "firefox"
+
+    @property
+    def worker_cache_dir(self) -> str:
+        """This xdist worker's subdirectory of `cache_dir` ("" if unset).
+
+        Browsers launched one after another by a worker share a warm cache;
+        concurrent browsers never write to the same cache directory.
+        """
+        if not self.cache_dir:
+            return ""
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        return str(pathlib.Path(self.cache_dir).resolve() / f"{self.browser}-{worker}")
+
+    @functools.cached_property
+    def options(self) -> ChromeOptions | FirefoxOptions:
+        """Browser options, compiled once and shared by every launch."""
+        width, height = (part.strip() for part in self.window_size.split(","))
+        if self.is_firefox:
+            options = FirefoxOptions()
+            if self.headless:
+                options.add_argument("--headless")
+            options.add_argument(f"--width={width}")
+            options.add_argument(f"--height={height}")
+            if self.dense:
+                for name, value in DENSE_FIREFOX_PREFS.items():
+                    options.set_preference(name, value)
+                options.set_preference(
+                    "dom.ipc.processCount", self.renderer_process_limit
+                )
+                if self.worker_cache_dir:
+                    options.set_preference(
+                        "browser.cache.disk.parent_directory", self.worker_cache_dir
+                    )
+            self.resource_policy.apply_to_firefox_options(options)
+        else:
+            options = ChromeOptions()
+            if self.headless:
+                options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={width},{height}")
+            for arg in CHROME_DEFAULT_ARGS:
+                options.add_argument(arg)
+            if self.dense:
+                for arg in DENSE_CHROME_ARGS:
+                    options.add_argument(arg)
+                options.add_argument(
+                    f"--renderer-process-limit={self.renderer_process_limit}"
+                )
+                if self.worker_cache_dir:
+                    options.add_argument(f"--disk-cache-dir={self.worker_cache_dir}")
+            if self.console_log:
+                add_logging_prefs(options, browser="ALL")
+            self.resource_policy.apply_to_chrome_options(options)
+        for arg in self.extra_args:
+            options.add_argument(arg)
+        options.page_load_strategy = self.page_load_strategy
+        return options
+
+    @functools.cached_property
+    def binaries(self) -> dict[str, Any] | None:
+        """Cached driver/browser paths, resolved once per profile."""
+        if self.path_cache is None:
+            return None
+        return self.path_cache.resolve(
+            "firefox" if self.is_firefox else "chrome", self.options
+        )
+
+    def launch(self) -> webdriver.Remote:
+        """Start a browser with this profile."""
+        options = self.options
+        service_cls = FirefoxService if self.is_firefox else ChromeService
+        paths = self.binaries
+        if paths:
+            service = service_cls(executable_path=paths["driver_path"])
+            if paths.get("browser_path"):
+                options.binary_location = paths["browser_path"]
+        else:
+            # Use Selenium Manager to resolve drivers automatically
+            service = service_cls()
+        if self.is_firefox:
+            drv = webdriver.Firefox(options=options, service=service)
+        else:
+            drv = webdriver.Chrome(options=options, service=service)
+        drv.implicitly_wait(0)  # rely on explicit waits
+        self.resource_policy.activate(drv)
+        return drv
@@ -1,7 +1,13 @@
 from __future__ import annotations
 import os
 import json
-from dataclasses import dataclass
+import pathlib
+from contextlib import ExitStack
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable
+
+# `.env` next to the project root; values from the real environment win.
+ENV_FILE = pathlib.Path(__file__).resolve().parents[1] / ".env"
 
 
 def _to_bool(value: str | None, default: bool) -> bool:
@@ -22,6 +28,43 @@ def _to_bool(value: str | None, default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+def _env(name: str, default: str | None = None) -> str | None:
+    """Read an environment variable, preferring its per-worker variant.
+
+    Under pytest-xdist, `NAME__GW1` (upper-cased worker id) overrides `NAME`
+    for worker `gw1` only.
+
+    Args:
+        name: Variable name.
+        default: Value returned if neither variant is set.
+
+    Returns:
+        str | None: The value found, or `default`.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        value = os.environ.get(f"{name}__{worker.upper()}")
+        if value is not None:
+            return value
+    return os.environ.get(name, default)
+
+
+def _from_env(name: str, default: str | None, parse: Callable[[Any], Any] = str):
+    """Declare a settings field read from env `name` when `Settings()` is built."""
+    return field(
+        default_factory=lambda: parse(_env(name, default)), metadata={"env": name}
+    )
+
+
+def _parse_json_object(value: str | None) -> dict[str, Any]:
+    """Parse a JSON object from an env value; anything else yields `{}`."""
+    try:
+        data = json.loads(value) if value else {}
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def _parse_users_from_env() -> dict[str, str]:
     """Parse E2E users from environment variables.
 
@@ -35,7 +78,7 @@ def _parse_users_from_env() -> dict[str, str]:
     Returns:
         dict[str, str]: Mapping of usernames to passwords. Guaranteed to be non-empty.
     """
-    users_json = os.getenv("E2E_USERS_JSON")
+    users_json = _env("E2E_USERS_JSON")
     if users_json:
         try:
             data = json.loads(users_json)
@@ -45,8 +88,8 @@ def _parse_users_from_env() -> dict[str, str]:
         except Exception:
             pass
 
-    default_user = os.getenv("E2E_DEFAULT_USER", "standard_user")
-    default_pass = os.getenv("E2E_PASSWORD_standard_user", "secret_sauce")
+    default_user = _env("E2E_DEFAULT_USER", "standard_user")
+    default_pass = _env("E2E_PASSWORD_standard_user", "secret_sauce")
     return {default_user: default_pass}
 
 
@@ -54,23 +97,162 @@ def _parse_users_from_env() -> dict[str, str]:
 class Settings:
     """Immutable runtime settings sourced from environment variables.
 
+    The environment is read when an instance is created, not at import;
+    use the module-level `settings` provider rather than building instances
+    directly.
+
     Attributes:
         base_url: Base URL used by tests (env `BASE_URL`).
         browser: Browser name, e.g. 'chrome' or 'firefox' (env `BROWSER`).
+        browsers: Browser matrix run in one session, e.g. ("chrome", "firefox");
+            empty for a single-browser run (env `BROWSERS`, comma separated).
         headless: Run browser in headless mode (env `HEADLESS`).
         default_timeout: Explicit wait timeout in seconds (env `DEFAULT_TIMEOUT`).
+        absence_timeout: Short wait budget in seconds for checks that expect
+            an element to be absent (env `ABSENCE_TIMEOUT`).
+        adaptive_timeouts: Derive per-locator wait timeouts from latencies
+            observed in earlier runs (env `ADAPTIVE_TIMEOUTS`).
+        adaptive_timeout_factor: Safety factor applied to a locator's p95
+            latency (env `ADAPTIVE_TIMEOUT_FACTOR`).
+        adaptive_timeout_min: Lower bound of a learned timeout in seconds
+            (env `ADAPTIVE_TIMEOUT_MIN`).
+        adaptive_timeout_max: Upper bound of a learned timeout in seconds
+            (env `ADAPTIVE_TIMEOUT_MAX`).
+        wait_engine: "poll" (WebDriverWait polling) or "event"
+            (MutationObserver-based waits) (env `WAIT_ENGINE`).
+        page_load_strategy: WebDriver page-load strategy: "normal", "eager"
+            or "none" (env `PAGE_LOAD_STRATEGY`).
+        resource_policy: Resource blocking profile: "none", "no-images",
+            "first-party-only" or "lean" (env `RESOURCE_POLICY`).
+        resource_report: Report per-test requests and bytes even without a
+            blocking policy, as the baseline for savings (env
+            `RESOURCE_REPORT`).
+        driver_pool: Reuse warm browsers between tests (env `DRIVER_POOL`).
+        driver_pool_max_uses: Tests served by a pooled browser before it is
+            recycled (env `DRIVER_POOL_MAX_USES`).
+        local_app: Serve the bundled stand-in app and point tests at it
+            (env `LOCAL_APP`).
+        storage_state: Restore cached login cookies/localStorage instead of
+            logging in through the UI (env `STORAGE_STATE`).
+        storage_state_ttl: Lifetime of a cached login in seconds
+            (env `STORAGE_STATE_TTL`).
+        preflight_routes: Routes probed before the run, relative to
+            `base_url` (env `PREFLIGHT_ROUTES`, comma separated).
+        preflight_cache: JSON file sharing preflight results between workers
+            and runs (env `PREFLIGHT_CACHE`).
+        preflight_ttl: Seconds a preflight result is reused (env `PREFLIGHT_TTL`).
+        preflight_slow_latency: Probe p95 in seconds above which wait
+            timeouts are scaled up (env `PREFLIGHT_SLOW_LATENCY`).
+        preflight_max_latency: Probe p95 in seconds above which the run is
+            skipped (env `PREFLIGHT_MAX_LATENCY`).
+        step_retries: Extra in-place tries of a page-object step failing
+            transiently; 0 disables step retries (env `STEP_RETRIES`).
+        step_retry_reruns: Whole-test reruns once step retries are exhausted
+            (env `STEP_RETRY_RERUNS`).
+        trace_mode: "off", "record" (save each test's driver commands) or
+            "replay" (answer them from the saved trace, no browser)
+            (env `TRACE_MODE`).
+        trace_dir: Directory holding one action trace per test (env `TRACE_DIR`).
+        browser_density: "standard" or "dense" (low-footprint flags for
+            packing more browsers per runner) (env `BROWSER_DENSITY`).
+        renderer_process_limit: Renderer processes per browser in dense mode
+            (env `RENDERER_PROCESS_LIMIT`).
+        browser_cache_dir: Disk cache root shared by a worker's browsers in
+            dense mode (env `BROWSER_CACHE_DIR`).
+        memory_report: Report browser and worker RSS at the end of the run
+            (env `MEMORY_REPORT`).
+        impact_base: Git ref whose diff selects the impacted tests; empty
+            runs everything (env `IMPACT_BASE`).
+        impact_full_run: Path patterns whose change runs the full suite
+            (env `IMPACT_FULL_RUN`, comma separated).
+        window_size: Browser window size as "width,height" (env `WINDOW_SIZE`).
+        browser_args: Extra browser command-line arguments, whitespace
+            separated (env `BROWSER_ARGS`).
+        webdriver_cache: JSON file caching driver/browser paths resolved by
+            Selenium Manager (env `WEBDRIVER_CACHE`).
+        webdriver_offline: Resolve drivers from `webdriver_cache` only and
+            never call Selenium Manager (env `WEBDRIVER_OFFLINE`).
+        user_pool: Lease a distinct account from `e2e_users` to each worker
+            or test (env `USER_POOL`).
+        user_pool_timeout: Seconds to queue for a free pooled account
+            (env `USER_POOL_TIMEOUT`).
+        e2e_user_meta: Per-user pool metadata,
+            `{"user": {"weight": 2, "tags": ["cart"]}}` (env `E2E_USER_META_JSON`).
         e2e_users: Mapping of usernames to passwords parsed by `_parse_users_from_env`.
         e2e_default_user: The username to be used by default (env `E2E_DEFAULT_USER`).
     """
 
-    base_url: str = os.getenv("BASE_URL", "https://www.saucedemo.com")
-    browser: str = os.getenv("BROWSER", "chrome").lower()
-    headless: bool = _to_bool(os.getenv("HEADLESS"), False)
-    default_timeout: int = int(os.getenv("DEFAULT_TIMEOUT", "10"))
+    base_url: str = _from_env("BASE_URL", "https://www.saucedemo.com")
+    browser: str = _from_env("BROWSER", "chrome", str.lower)
+    browsers: tuple[str, ...] = _from_env(
+        "BROWSERS",
+        "",
+        lambda v: tuple(b.strip().lower() for b in v.split(",") if b.strip()),
+    )
+    headless: bool = _from_env("HEADLESS", None, lambda v: _to_bool(v, False))
+    default_timeout: int = _from_env("DEFAULT_TIMEOUT", "10", int)
+    absence_timeout: float = _from_env("ABSENCE_TIMEOUT", "1.0", float)
+    adaptive_timeouts: bool = _from_env(
+        "ADAPTIVE_TIMEOUTS", None, lambda v: _to_bool(v, False)
+    )
+    adaptive_timeout_factor: float = _from_env("ADAPTIVE_TIMEOUT_FACTOR", "3.0", float)
+    adaptive_timeout_min: float = _from_env("ADAPTIVE_TIMEOUT_MIN", "1.0", float)
+    adaptive_timeout_max: float = _from_env("ADAPTIVE_TIMEOUT_MAX", "30.0", float)
+    wait_engine: str = _from_env("WAIT_ENGINE", "poll", str.lower)
+    page_load_strategy: str = _from_env("PAGE_LOAD_STRATEGY", "normal", str.lower)
+    resource_policy: str = _from_env("RESOURCE_POLICY", "none", str.lower)
+    resource_report: bool = _from_env(
+        "RESOURCE_REPORT", None, lambda v: _to_bool(v, False)
+    )
+    driver_pool: bool = _from_env("DRIVER_POOL", None, lambda v: _to_bool(v, False))
+    driver_pool_max_uses: int = _from_env("DRIVER_POOL_MAX_USES", "50", int)
+    local_app: bool = _from_env("LOCAL_APP", None, lambda v: _to_bool(v, False))
+    storage_state: bool = _from_env("STORAGE_STATE", None, lambda v: _to_bool(v, False))
+    storage_state_ttl: int = _from_env("STORAGE_STATE_TTL", "600", int)
+    preflight_routes: tuple[str, ...] = _from_env(
+        "PREFLIGHT_ROUTES",
+        "/,/inventory.html,/favicon.ico",
+        lambda v: tuple(r.strip() for r in v.split(",") if r.strip()),
+    )
+    preflight_cache: str = _from_env("PREFLIGHT_CACHE", ".cache/preflight.json")
+    preflight_ttl: float = _from_env("PREFLIGHT_TTL", "60", float)
+    preflight_slow_latency: float = _from_env("PREFLIGHT_SLOW_LATENCY", "1.0", float)
+    preflight_max_latency: float = _from_env("PREFLIGHT_MAX_LATENCY", "10.0", float)
+    step_retries: int = _from_env("STEP_RETRIES", "0", int)
+    step_retry_reruns: int = _from_env("STEP_RETRY_RERUNS", "1", int)
+    trace_mode: str = _from_env("TRACE_MODE", "off", str.lower)
+    trace_dir: str = _from_env("TRACE_DIR", "traces")
+    browser_density: str = _from_env("BROWSER_DENSITY", "standard", str.lower)
+    renderer_process_limit: int = _from_env("RENDERER_PROCESS_LIMIT", "2", int)
+    browser_cache_dir: str = _from_env("BROWSER_CACHE_DIR", ".cache/browser")
+    memory_report: bool = _from_env("MEMORY_REPORT", None, lambda v: _to_bool(v, False))
+    impact_base: str = _from_env("IMPACT_BASE", "")
+    # Changes to these paths can affect any test, so they run the full suite
+    # (matched from the right: "conftest.py" also covers tests/e2e/conftest.py)
+    impact_full_run: tuple[str, ...] = _from_env(
+        "IMPACT_FULL_RUN",
+        "conftest.py,pytest.ini,requirements.txt,src/*.py,src/pages/base_page.py,"
+        "src/pages/event_wait.py,src/pages/registry.py,src/pages/scripts.py",
+        lambda v: tuple(p.strip() for p in v.split(",") if p.strip()),
+    )
+    window_size: str = _from_env("WINDOW_SIZE", "1920,1080")
+    browser_args: tuple[str, ...] = _from_env(
+        "BROWSER_ARGS", "", lambda v: tuple(v.split())
+    )
+    webdriver_cache: str = _from_env("WEBDRIVER_CACHE", ".cache/webdriver-paths.json")
+    webdriver_offline: bool = _from_env(
+        "WEBDRIVER_OFFLINE", None, lambda v: _to_bool(v, False)
+    )
+
+    user_pool: bool = _from_env("USER_POOL", None, lambda v: _to_bool(v, False))
+    user_pool_timeout: float = _from_env("USER_POOL_TIMEOUT", "300", float)
 
     # Users
+    e2e_user_meta: dict[str, dict[str, Any]] = _from_env(
+        "E2E_USER_META_JSON", None, _parse_json_object
+    )
     e2e_users: dict[str, str] = None
-    e2e_default_user: str = os.getenv("E2E_DEFAULT_USER", "standard_user")
+    e2e_default_user: str = _from_env("E2E_DEFAULT_USER", "standard_user")
 
     def __post_init__(self):
         """Finalize settings after dataclass initialization.
@@ -87,5 +269,145 @@ class Settings:
             object.__setattr__(self, "e2e_default_user", first)
 
 
-# Singleton settings instance
-settings = Settings()
+# Variables that affect `Settings`; a change to any of them rebuilds it.
+_ENV_NAMES = frozenset(
+    [f.metadata["env"] for f in fields(Settings) if "env" in f.metadata]
+    + ["E2E_USERS_JSON", "PYTEST_XDIST_WORKER"]
+)
+
+
+def _env_fingerprint() -> tuple[tuple[str, str], ...]:
+    """Snapshot of every environment variable `Settings` may read."""
+    return tuple(
+        sorted(
+            (k, v)
+            for k, v in os.environ.items()
+            if k.split("__", 1)[0] in _ENV_NAMES or k.startswith("E2E_")
+        )
+    )
+
+
+class LazySettings:
+    """Process-wide `Settings` provider, built on first use.
+
+    Attribute access is forwarded to a memoized `Settings` instance and
+    costs one attribute lookup. `override()` and `invalidate()` drop it
+    explicitly; `refresh()` rebuilds it if a relevant environment variable
+    or the `.env` file changed (conftest calls it once per test). Since
+    xdist workers are separate processes, overrides (and `NAME__GWn`
+    variables) apply per worker.
+
+    Attributes:
+        env_file: `.env` file loaded into `os.environ` without overriding
+            variables that are already set.
+    """
+
+    def __init__(self, env_file: str | os.PathLike = ENV_FILE) -> None:
+        """Create the provider; nothing is read until the first access.
+
+        Args:
+            env_file: Path of the `.env` file.
+        """
+        self.env_file = pathlib.Path(env_file)
+        self._settings: Settings | None = None
+        self._key: tuple | None = None
+        self._overrides: dict[str, Any] = {}
+        self._env_file_stamp: tuple[int, int] | None = None
+        self._injected: dict[str, str] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        return f"LazySettings({self.get()!r})"
+
+    def get(self) -> Settings:
+        """Return the memoized settings, building them on first use."""
+        if self._settings is None:
+            self.refresh()
+        return self._settings  # type: ignore[return-value]
+
+    def refresh(self) -> bool:
+        """Re-read `.env` and the environment, rebuilding settings on change.
+
+        Returns:
+            bool: True if the settings were rebuilt.
+        """
+        self._load_env_file()
+        key = _env_fingerprint()
+        if self._settings is not None and key == self._key:
+            return False
+        current = Settings()
+        for name, value in self._overrides.items():
+            object.__setattr__(current, name, value)
+        self._settings, self._key = current, key
+        return True
+
+    def override(self, **values: Any) -> ExitStack:
+        """Override fields for this process.
+
+        Takes effect immediately; use the result as a context manager to
+        restore the previous values on exit.
+
+        Args:
+            **values: Field names and values, e.g. `base_url="http://..."`.
+
+        Returns:
+            ExitStack: Context manager that undoes the override.
+
+        Raises:
+            TypeError: For names that are not `Settings` fields.
+        """
+        unknown = set(values) - {f.name for f in fields(Settings)}
+        if unknown:
+            raise TypeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        previous = dict(self._overrides)
+        self._set_overrides({**self._overrides, **values})
+        restore = ExitStack()
+        restore.callback(self._set_overrides, previous)
+        return restore
+
+    def invalidate(self) -> None:
+        """Drop the memoized settings and re-read every source on next access."""
+        self._settings = None
+        self._env_file_stamp = None
+
+    def _set_overrides(self, overrides: dict[str, Any]) -> None:
+        self._overrides = overrides
+        self._settings = None
+
+    def _load_env_file(self) -> None:
+        """(Re)load `.env` into `os.environ` when the file changed.
+
+        Variables set outside the file always win; variables this provider
+        injected earlier are updated or removed along with the file.
+        """
+        try:
+            st = self.env_file.stat()
+            stamp: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._env_file_stamp:
+            return
+        self._env_file_stamp = stamp
+        values: dict[str, str] = {}
+        if stamp is not None:
+            from dotenv import dotenv_values
+
+            values = {
+                k: v for k, v in dotenv_values(self.env_file).items() if v is not None
+            }
+        injected: dict[str, str] = {}
+        for key, old in self._injected.items():
+            if os.environ.get(key) == old and key not in values:
+                del os.environ[key]
+        for key, value in values.items():
+            ours = key in self._injected and os.environ.get(key) == self._injected[key]
+            if key not in os.environ or ours:
+                os.environ[key] = value
+                injected[key] = value
+        self._injected = injected
+
+
+# Singleton settings provider
+settings = LazySettings()
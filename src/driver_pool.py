@@ -0,0 +1,133 @@
+from __future__ import annotations
+import threading
+from typing import Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.pages.scripts import CLEAR_STORAGE_JS, PING_JS
+
+# Seconds a pooled browser gets to answer the health probe. A wedged renderer
+# can leave `execute_script` blocked for the HTTP client's full timeout.
+HEALTH_TIMEOUT = 5.0
+
+
+class DriverPool:
+    """Keep warm WebDriver sessions and hand them out one test at a time.
+
+    A pool lives for the whole pytest session of one process, so under
+    pytest-xdist every worker owns its own pool. Between tests a browser is
+    reset (cookies, localStorage, sessionStorage, `about:blank`); it is
+    recycled after `max_uses` tests or as soon as a health check fails.
+
+    Attributes:
+        factory: Callable that launches a new WebDriver.
+        max_uses: Number of tests a browser may serve before it is recycled.
+        health_timeout: Seconds the health probe may take before the browser
+            counts as wedged.
+        created: Number of browsers launched by this pool.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WebDriver],
+        max_uses: int = 50,
+        health_timeout: float = HEALTH_TIMEOUT,
+    ) -> None:
+        """Initialise the pool.
+
+        Args:
+            factory: Callable returning a freshly started WebDriver.
+            max_uses: Recycle a browser after this many tests (minimum 1).
+            health_timeout: Deadline of the health probe in seconds.
+        """
+        self.factory = factory
+        self.max_uses = max(1, int(max_uses))
+        self.health_timeout = health_timeout
+        self.created = 0
+        self._idle: list[WebDriver] = []
+        self._uses: dict[int, int] = {}
+
+    def acquire(self) -> WebDriver:
+        """Return a healthy driver, reusing an idle one when possible.
+
+        Returns:
+            WebDriver: A driver positioned on `about:blank`.
+        """
+        while self._idle:
+            drv = self._idle.pop()
+            if self.is_healthy(drv):
+                self._uses[id(drv)] += 1
+                return drv
+            self._discard(drv)
+
+        drv = self.factory()
+        self.created += 1
+        self._uses[id(drv)] = 1
+        return drv
+
+    def release(self, drv: WebDriver) -> None:
+        """Reset a driver after a test and return it to the pool.
+
+        The driver is quit instead when it reached `max_uses`, when it no
+        longer responds, or when resetting its state fails.
+
+        Args:
+            drv: Driver previously returned by `acquire()`.
+        """
+        if self._uses.get(id(drv), 0) >= self.max_uses or not self.is_healthy(drv):
+            self._discard(drv)
+            return
+        try:
+            self.reset(drv)
+        except Exception:
+            self._discard(drv)
+            return
+        self._idle.append(drv)
+
+    @staticmethod
+    def reset(drv: WebDriver) -> None:
+        """Clear cookies and web storage, then park the driver on `about:blank`.
+
+        Args:
+            drv: Driver to reset.
+        """
+        drv.delete_all_cookies()
+        drv.execute_script(CLEAR_STORAGE_JS)
+        drv.get("about:blank")
+
+    def is_healthy(self, drv: WebDriver) -> bool:
+        """Return True if the session answers a trivial script call in time.
+
+        The probe runs on a daemon thread and is abandoned after
+        `health_timeout`, so a hung session costs at most that long.
+
+        Args:
+            drv: Driver to probe.
+
+        Returns:
+            bool: False for crashed, closed or wedged sessions.
+        """
+        answer: list[bool] = []
+
+        def probe() -> None:
+            try:
+                answer.append(drv.execute_script(PING_JS) == 1)
+            except Exception:
+                answer.append(False)
+
+        thread = threading.Thread(target=probe, name="driver-pool-probe", daemon=True)
+        thread.start()
+        thread.join(self.health_timeout)
+        return bool(answer) and answer[0]
+
+    def close(self) -> None:
+        """Quit every idle driver held by the pool."""
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def _discard(self, drv: WebDriver) -> None:
+        """Quit a driver, ignoring errors from already-dead sessions."""
+        self._uses.pop(id(drv), None)
+        try:
+            drv.quit()
+        except Exception:
+            pass
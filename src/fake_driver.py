@@ -0,0 +1,669 @@
+from __future__ import annotations
+import html
+import json
+import re
+from typing import Any, Callable, Iterator
+from urllib.parse import urljoin, urlsplit
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+from src.local_app import PRODUCTS, SESSION_COOKIE, slug
+from src.pages.scripts import (
+    CART_JS,
+    CLEAR_STORAGE_JS,
+    PING_JS,
+    QUERY_JS,
+    READ_LOCAL_STORAGE_JS,
+    READY_STATE_JS,
+    WRITE_LOCAL_STORAGE_JS,
+)
+
+# Route builder: returns the root element of the document for a path.
+Route = Callable[["FakeDriver"], "FakeElement"]
+# Script handler: `handler(driver, *args)` stands in for `execute_script`.
+ScriptHandler = Callable[..., Any]
+
+_ATTR_RE = re.compile(
+    r"""\[\s*([\w-]+)\s*(?:([~^$*|]?=)\s*(?:'([^']*)'|"([^"]*)"|([^\]\s]+)))?\s*\]"""
+)
+_COMPOUND_RE = re.compile(r"([a-zA-Z][\w-]*|\*)?((?:#[\w-]+|\.[\w-]+|\[[^\]]*\])*)$")
+_PART_RE = re.compile(r"#([\w-]+)|\.([\w-]+)|(\[[^\]]*\])")
+
+
+class FakeElement:
+    """Node of the declarative DOM model used by `FakeDriver`.
+
+    Implements the subset of `WebElement` that page objects and
+    `expected_conditions` use. Keyword arguments become HTML attributes
+    (`class_` -> `class`, `data_test` -> `data-test`).
+
+    Attributes:
+        tag_name: Lower-case tag name.
+        attrs: HTML attributes.
+        own_text: Text of this node, excluding children.
+        children: Child elements.
+        parent: Parent element, or None for a document root or detached node.
+        displayed: False hides the node and its subtree.
+        enabled: False makes the node non-interactable.
+        on_click: `handler(driver, element)` run by `click()`.
+        value: Current value of form fields (`send_keys`/`clear`).
+    """
+
+    def __init__(
+        self,
+        tag: str,
+        *children: "FakeElement",
+        text: str = "",
+        displayed: bool = True,
+        enabled: bool = True,
+        on_click: Callable[["FakeDriver", "FakeElement"], None] | None = None,
+        **attrs: str,
+    ) -> None:
+        """Build an element and attach `children` to it."""
+        self.tag_name = tag.lower()
+        self.attrs = {k.rstrip("_").replace("_", "-"): str(v) for k, v in attrs.items()}
+        self.own_text = text
+        self.displayed = displayed
+        self.enabled = enabled
+        self.on_click = on_click
+        self.value = self.attrs.get("value", "")
+        self.parent: FakeElement | None = None
+        self.children: list[FakeElement] = []
+        self._driver: FakeDriver | None = None
+        for child in children:
+            self.append(child)
+
+    def __repr__(self) -> str:
+        return f"<FakeElement {self.tag_name} {self.attrs}>"
+
+    # --- DOM editing (used by route builders and click handlers) -------------
+
+    def append(self, child: "FakeElement") -> "FakeElement":
+        """Attach `child` as the last child and return it."""
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    def remove(self) -> None:
+        """Detach the element from its parent; old references become stale."""
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    def iter(self) -> Iterator["FakeElement"]:
+        """Yield descendants in document order (excluding self)."""
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    @property
+    def classes(self) -> list[str]:
+        return self.attrs.get("class", "").split()
+
+    # --- WebElement API ------------------------------------------------------
+
+    @property
+    def text(self) -> str:
+        """Rendered text: own text and visible children, one per line."""
+        self._check()
+        return self._render_text()
+
+    def _render_text(self) -> str:
+        if not self.displayed:
+            return ""
+        parts = [self.own_text.strip()] + [c._render_text() for c in self.children]
+        return "\n".join(p for p in parts if p)
+
+    def click(self) -> None:
+        self._check_interactable()
+        driver = self._owner()
+        if self.on_click is not None:
+            self.on_click(driver, self)
+        elif self.tag_name == "a" and "href" in self.attrs:
+            driver.get(urljoin(driver.current_url, self.attrs["href"]))
+
+    def send_keys(self, *value: str) -> None:
+        self._check_interactable()
+        self.value += "".join(str(v) for v in value)
+
+    def clear(self) -> None:
+        self._check_interactable()
+        self.value = ""
+
+    def get_attribute(self, name: str) -> str | None:
+        self._check()
+        if name == "value" and self.tag_name in ("input", "textarea"):
+            return self.value
+        return self.attrs.get(name)
+
+    def get_dom_attribute(self, name: str) -> str | None:
+        self._check()
+        return self.attrs.get(name)
+
+    get_property = get_attribute
+
+    def is_displayed(self) -> bool:
+        self._check()
+        node: FakeElement | None = self
+        while node is not None:
+            if not node.displayed:
+                return False
+            node = node.parent
+        return True
+
+    def is_enabled(self) -> bool:
+        self._check()
+        return self.enabled and "disabled" not in self.attrs
+
+    def is_selected(self) -> bool:
+        self._check()
+        return "checked" in self.attrs or "selected" in self.attrs
+
+    def find_element(self, by: str = By.ID, value: str | None = None) -> "FakeElement":
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by}={value!r}")
+        return found[0]
+
+    def find_elements(
+        self, by: str = By.ID, value: str | None = None
+    ) -> list["FakeElement"]:
+        self._check()
+        match = _matcher(by, value or "")
+        return [el for el in self.iter() if match(el)]
+
+    # --- internals -----------------------------------------------------------
+
+    def _root(self) -> "FakeElement":
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def _owner(self) -> "FakeDriver":
+        return self._root()._driver  # type: ignore[return-value]
+
+    def _check(self) -> None:
+        """Raise if the element left the live document (navigation or removal)."""
+        driver = self._owner()
+        if driver is None or driver.document is not self._root():
+            raise StaleElementReferenceException(f"{self!r} is no longer attached")
+
+    def _check_interactable(self) -> None:
+        if not self.is_displayed() or not self.is_enabled():
+            raise ElementNotInteractableException(f"{self!r} is not interactable")
+
+    def _html(self) -> str:
+        attrs = "".join(f' {k}="{html.escape(v)}"' for k, v in self.attrs.items())
+        inner = html.escape(self.own_text) + "".join(c._html() for c in self.children)
+        return f"<{self.tag_name}{attrs}>{inner}</{self.tag_name}>"
+
+
+def _split_selector(selector: str) -> list[tuple[str, str]]:
+    """Split a CSS selector into `(combinator, compound)` steps, left to right."""
+    steps: list[tuple[str, str]] = []
+    combinator, buf, depth, quote = " ", "", 0, ""
+    for ch in selector.strip() + " ":
+        if quote:
+            buf += ch
+            quote = "" if ch == quote else quote
+        elif ch in "'\"":
+            buf, quote = buf + ch, ch
+        elif ch == "[":
+            buf, depth = buf + ch, depth + 1
+        elif ch == "]":
+            buf, depth = buf + ch, depth - 1
+        elif depth == 0 and ch in " >":
+            if buf:
+                steps.append((combinator, buf))
+                buf, combinator = "", " "
+            if ch == ">":
+                combinator = ">"
+        else:
+            buf += ch
+    return steps
+
+
+def _compound_matcher(compound: str) -> Callable[[FakeElement], bool]:
+    match = _COMPOUND_RE.match(compound)
+    if not match:
+        raise InvalidSelectorException(f"Unsupported CSS selector: {compound!r}")
+    tag, rest = match.group(1), match.group(2)
+    checks: list[Callable[[FakeElement], bool]] = []
+    if tag and tag != "*":
+        checks.append(lambda el, t=tag.lower(): el.tag_name == t)
+    for part in _PART_RE.finditer(rest):
+        ident, cls, attr = part.groups()
+        if ident:
+            checks.append(lambda el, v=ident: el.attrs.get("id") == v)
+        elif cls:
+            checks.append(lambda el, v=cls: v in el.classes)
+        else:
+            checks.append(_attr_matcher(attr))
+    return lambda el: all(check(el) for check in checks)
+
+
+def _attr_matcher(expr: str) -> Callable[[FakeElement], bool]:
+    match = _ATTR_RE.fullmatch(expr)
+    if not match:
+        raise InvalidSelectorException(f"Unsupported attribute selector: {expr!r}")
+    name, op = match.group(1), match.group(2)
+    want = next((g for g in match.groups()[2:] if g is not None), None)
+    tests: dict[str | None, Callable[[str], bool]] = {
+        None: lambda v: True,
+        "=": lambda v: v == want,
+        "~=": lambda v: want in v.split(),
+        "^=": lambda v: v.startswith(want),
+        "$=": lambda v: v.endswith(want),
+        "*=": lambda v: want in v,
+        "|=": lambda v: v == want or v.startswith(f"{want}-"),
+    }
+    test = tests[op]
+    return lambda el: name in el.attrs and test(el.attrs[name])
+
+
+def _css_matcher(selector: str) -> Callable[[FakeElement], bool]:
+    groups = []
+    for group in selector.split(","):
+        steps = [(comb, _compound_matcher(c)) for comb, c in _split_selector(group)]
+        if not steps:
+            raise InvalidSelectorException(f"Empty CSS selector: {selector!r}")
+        groups.append(steps)
+
+    def matches(el: FakeElement, steps) -> bool:
+        *ancestors, (combinator, match) = steps
+        if not match(el):
+            return False
+        if not ancestors:
+            return True
+        node = el.parent
+        while node is not None:
+            if matches(node, ancestors):
+                return True
+            if combinator == ">":
+                return False
+            node = node.parent
+        return False
+
+    return lambda el: any(matches(el, steps) for steps in groups)
+
+
+def _matcher(by: str, value: str) -> Callable[[FakeElement], bool]:
+    """Translate a Selenium `(by, value)` locator into an element predicate."""
+    if by == By.ID:
+        return lambda el: el.attrs.get("id") == value
+    if by == By.NAME:
+        return lambda el: el.attrs.get("name") == value
+    if by == By.CLASS_NAME:
+        return lambda el: value in el.classes
+    if by == By.TAG_NAME:
+        return lambda el: el.tag_name == value.lower()
+    if by == By.CSS_SELECTOR:
+        return _css_matcher(value)
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        exact = by == By.LINK_TEXT
+        return lambda el: el.tag_name == "a" and (
+            el._render_text() == value if exact else value in el._render_text()
+        )
+    raise InvalidSelectorException(f"FakeDriver does not support {by!r} locators")
+
+
+def _query(driver: "FakeDriver", locators: list, attributes: list) -> list[dict]:
+    """Python twin of `QUERY_JS` so `BasePage.query()` works on the fake."""
+    out = []
+    for by, value in locators:
+        els = driver.find_elements(by, value)
+        el = els[0] if els else None
+        out.append(
+            {
+                "count": len(els),
+                "visible": bool(el) and el.is_displayed(),
+                "text": el.text if el else None,
+                "attributes": (
+                    {a: el.get_attribute(a) for a in attributes} if el else {}
+                ),
+            }
+        )
+    return out
+
+
+def _cart(
+    driver: "FakeDriver",
+    sel: dict[str, str],
+    action: str,
+    names: list[str] | None,
+    count: int | None,
+) -> dict[str, Any]:
+    """Python twin of `CART_JS` (batched add/remove/read of cart items)."""
+    in_cart = _css_matcher(sel["inCart"])
+    clicked: list[str] = []
+    cart: list[str] = []
+    seen: set[str] = set()
+    for item in driver.find_elements(By.CSS_SELECTOR, sel["item"]):
+        name_els = item.find_elements(By.CSS_SELECTOR, sel["name"])
+        buttons = item.find_elements(By.CSS_SELECTOR, sel["button"])
+        if not name_els or not buttons:
+            continue
+        name, btn = name_els[0].text, buttons[0]
+        seen.add(name)
+        if in_cart(btn):
+            cart.append(name)
+        if action == "read" or in_cart(btn) != (action == "remove"):
+            continue
+        if names is not None and name not in names:
+            continue
+        if names is None and count is not None and len(clicked) >= count:
+            continue
+        btn.click()
+        clicked.append(name)
+    badges = driver.find_elements(By.CSS_SELECTOR, sel["badge"])
+    return {
+        "clicked": clicked,
+        "cart": cart,
+        "missing": [n for n in names or [] if n not in seen],
+        "badge": badges[0].text if badges else None,
+    }
+
+
+class FakeDriver:
+    """In-process stand-in for a Selenium WebDriver over `FakeElement` documents.
+
+    Navigation looks the URL path up in `routes` and builds a fresh document,
+    so element references from the previous page go stale exactly like in a
+    browser. `WebDriverWait` and `expected_conditions` work unchanged. Scripts
+    only run when a Python handler is registered for their exact source;
+    `BasePage.query()`, the bulk cart script, the driver pool reset and the
+    storage-state cache are supported out of the box, async scripts are not
+    (the event wait engine falls back to polling).
+
+    Attributes:
+        routes: `{path: builder}`; paths have no leading slash ("" is the root).
+        scripts: `{script source: handler(driver, *args)}` for `execute_script`.
+        document: Root element of the current page.
+        current_url: URL of the current page.
+        local_storage: Per-driver stand-in for `window.localStorage`.
+        history: Every URL passed to `get()`.
+        simulated: Marks a driver without a real browser (see
+            `adaptive_timeouts.latency_scope`).
+    """
+
+    simulated = True
+
+    def __init__(
+        self,
+        routes: dict[str, Route] | None = None,
+        scripts: dict[str, ScriptHandler] | None = None,
+    ) -> None:
+        """Create a driver parked on `about:blank`.
+
+        Args:
+            routes: Page builders keyed by path.
+            scripts: Extra `execute_script` handlers keyed by script source.
+        """
+        self.routes = dict(routes or {})
+        self.scripts: dict[str, ScriptHandler] = {
+            QUERY_JS: _query,
+            CART_JS: _cart,
+            PING_JS: lambda driver: 1,
+            CLEAR_STORAGE_JS: lambda driver: driver.local_storage.clear(),
+            READ_LOCAL_STORAGE_JS: lambda driver: dict(driver.local_storage),
+            READY_STATE_JS: lambda driver: "complete",
+            WRITE_LOCAL_STORAGE_JS: lambda driver, items: driver.local_storage.update(
+                items
+            ),
+        }
+        self.scripts.update(scripts or {})
+        self.current_url = "about:blank"
+        self.local_storage: dict[str, str] = {}
+        self.history: list[str] = []
+        self.closed = False
+        self._cookies: dict[str, dict[str, Any]] = {}
+        self.document = FakeElement("html")
+        self.load_document(self.document)
+
+    # --- navigation ----------------------------------------------------------
+
+    def get(self, url: str) -> None:
+        """Navigate to `url`, building the document from the matching route."""
+        self.history.append(url)
+        self.current_url = url
+        if url == "about:blank":
+            self.load_document(FakeElement("html"))
+            return
+        route = self.routes.get(urlsplit(url).path.lstrip("/"))
+        if route is None:
+            self.load_document(
+                FakeElement("html", FakeElement("body", text="Not found"))
+            )
+        else:
+            self.load_document(route(self))
+
+    def load_document(self, root: FakeElement) -> None:
+        """Replace the current document (e.g. a form post response)."""
+        self.document = root
+        root.parent = None
+        root._driver = self
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    @property
+    def title(self) -> str:
+        titles = self.document.find_elements(By.TAG_NAME, "title")
+        return titles[0].own_text if titles else ""
+
+    @property
+    def page_source(self) -> str:
+        return "<!doctype html>" + self.document._html()
+
+    # --- elements and scripts -------------------------------------------------
+
+    def find_element(self, by: str = By.ID, value: str | None = None) -> FakeElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by}={value!r}")
+        return found[0]
+
+    def find_elements(
+        self, by: str = By.ID, value: str | None = None
+    ) -> list[FakeElement]:
+        match = _matcher(by, value or "")
+        root = self.document
+        return [el for el in [root, *root.iter()] if match(el)]
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        handler = self.scripts.get(script)
+        if handler is None:
+            raise NotImplementedError("FakeDriver has no handler for this script")
+        return handler(self, *args)
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        raise NotImplementedError("FakeDriver does not run async scripts")
+
+    # --- cookies -------------------------------------------------------------
+
+    def add_cookie(self, cookie: dict[str, Any]) -> None:
+        self._cookies[cookie["name"]] = dict(cookie)
+
+    def get_cookie(self, name: str) -> dict[str, Any] | None:
+        return self._cookies.get(name)
+
+    def get_cookies(self) -> list[dict[str, Any]]:
+        return list(self._cookies.values())
+
+    def delete_cookie(self, name: str) -> None:
+        self._cookies.pop(name, None)
+
+    def delete_all_cookies(self) -> None:
+        self._cookies.clear()
+
+    # --- session -------------------------------------------------------------
+
+    def implicitly_wait(self, seconds: float) -> None:
+        pass
+
+    def set_script_timeout(self, seconds: float) -> None:
+        pass
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.closed = True
+
+
+CART_KEY = "cart-contents"
+
+
+def demo_site(users: dict[str, str]) -> dict[str, Route]:
+    """Routes modelling the SauceDemo pages served by `LocalApp`.
+
+    Args:
+        users: Accepted `{username: password}` pairs.
+
+    Returns:
+        dict[str, Route]: Routes for `FakeDriver`.
+    """
+
+    def login_page(driver: FakeDriver, error: str | None = None) -> FakeElement:
+        form = FakeElement(
+            "form",
+            FakeElement(
+                "input", id="user-name", name="user-name", data_test="username"
+            ),
+            FakeElement("input", id="password", name="password", data_test="password"),
+            class_="login_wrapper",
+        )
+        if error:
+            form.append(FakeElement("h3", text=error, data_test="error"))
+        form.append(
+            FakeElement(
+                "input",
+                id="login-button",
+                type="submit",
+                value="Login",
+                data_test="login-button",
+                on_click=submit,
+            )
+        )
+        return FakeElement(
+            "html",
+            FakeElement("title", text="Swag Labs", displayed=False),
+            FakeElement(
+                "body", FakeElement("div", text="Swag Labs", class_="login_logo"), form
+            ),
+        )
+
+    def submit(driver: FakeDriver, button: FakeElement) -> None:
+        user = driver.find_element(By.ID, "user-name").value
+        password = driver.find_element(By.ID, "password").value
+        if not user:
+            driver.load_document(
+                login_page(driver, "Epic sadface: Username is required")
+            )
+        elif not password or users.get(user) != password:
+            driver.load_document(
+                login_page(
+                    driver,
+                    "Epic sadface: Username and password do not match "
+                    "any user in this service",
+                )
+            )
+        else:
+            driver.add_cookie({"name": SESSION_COOKIE, "value": user, "path": "/"})
+            base = driver.current_url.split("#", 1)[0]
+            driver.get(urljoin(base, "/inventory.html"))
+
+    def read_cart(driver: FakeDriver) -> list[int]:
+        return json.loads(driver.local_storage.get(CART_KEY, "[]"))
+
+    def render_cart(driver: FakeDriver) -> None:
+        cart = read_cart(driver)
+        link = driver.find_element(By.CSS_SELECTOR, ".shopping_cart_link")
+        for badge in list(link.children):
+            badge.remove()
+        if cart:
+            link.append(
+                FakeElement(
+                    "span",
+                    text=str(len(cart)),
+                    class_="shopping_cart_badge",
+                    data_test="shopping-cart-badge",
+                )
+            )
+        for btn in driver.find_elements(By.CSS_SELECTOR, "button.btn_inventory"):
+            in_cart = int(btn.attrs["data-item-id"]) in cart
+            btn.own_text = "Remove" if in_cart else "Add to cart"
+            btn.attrs["id"] = ("remove-" if in_cart else "add-to-cart-") + btn.attrs[
+                "data-slug"
+            ]
+            btn.attrs["class"] = "btn btn_small btn_inventory " + (
+                "btn_secondary" if in_cart else "btn_primary"
+            )
+
+    def toggle(driver: FakeDriver, button: FakeElement) -> None:
+        item_id, cart = int(button.attrs["data-item-id"]), read_cart(driver)
+        if item_id in cart:
+            cart.remove(item_id)
+        else:
+            cart.append(item_id)
+        driver.local_storage[CART_KEY] = json.dumps(cart)
+        render_cart(driver)
+
+    def inventory_page(driver: FakeDriver) -> FakeElement:
+        cookie = driver.get_cookie(SESSION_COOKIE)
+        if cookie is None or cookie["value"] not in users:
+            return login_page(
+                driver,
+                "Epic sadface: You can only access '/inventory.html' "
+                "when you are logged in.",
+            )
+        items = [
+            FakeElement(
+                "div",
+                FakeElement("div", text=name, class_="inventory_item_name"),
+                FakeElement(
+                    "button",
+                    text="Add to cart",
+                    id=f"add-to-cart-{slug(name)}",
+                    class_="btn btn_small btn_inventory btn_primary",
+                    data_item_id=str(i),
+                    data_slug=slug(name),
+                    on_click=toggle,
+                ),
+                class_="inventory_item",
+                data_test="inventory-item",
+            )
+            for i, name in enumerate(PRODUCTS)
+        ]
+        root = FakeElement(
+            "html",
+            FakeElement("title", text="Swag Labs", displayed=False),
+            FakeElement(
+                "body",
+                FakeElement(
+                    "div",
+                    FakeElement(
+                        "span", text="Products", class_="title", data_test="title"
+                    ),
+                    FakeElement("a", class_="shopping_cart_link", href="#"),
+                    class_="header_container",
+                ),
+                FakeElement("div", *items, class_="inventory_list"),
+            ),
+        )
+        driver.load_document(root)
+        render_cart(driver)
+        return root
+
+    return {
+        "": login_page,
+        "index.html": login_page,
+        "inventory.html": inventory_page,
+    }
@@ -0,0 +1,255 @@
+from __future__ import annotations
+import ast
+import functools
+import importlib.util
+import inspect
+import pathlib
+import subprocess
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from src.config import settings
+from src.timing import hookimpl
+
+if TYPE_CHECKING:
+    import pytest
+
+CACHE_KEY = "e2e/impact-map"
+USER_PROPERTY = "impact_files"
+
+# Page classes read through `PageRegistry` since the last test report in this
+# process; None keeps `note_page` down to one check.
+used: set[type] | None = None
+
+
+def note_page(cls: type) -> None:
+    """Record that the running test used page class `cls`."""
+    if used is not None:
+        used.add(cls)
+
+
+def _relative(path: str | pathlib.Path | None, root: pathlib.Path) -> str | None:
+    """`path` relative to `root` in POSIX form, None if outside it."""
+    if not path:
+        return None
+    try:
+        return pathlib.Path(path).resolve().relative_to(root).as_posix()
+    except ValueError:
+        return None
+
+
+def page_files(classes: Iterable[type], root: pathlib.Path) -> list[str]:
+    """Source files of `classes` and their bases that live under `root`."""
+    files = set()
+    for cls in classes:
+        for klass in cls.__mro__:
+            try:
+                path = _relative(inspect.getsourcefile(klass), root)
+            except TypeError:  # builtins
+                continue
+            if path:
+                files.add(path)
+    return sorted(files)
+
+
+@functools.lru_cache(maxsize=None)
+def _module_imports(path: pathlib.Path, root: pathlib.Path) -> frozenset[str]:
+    """Files under `root` imported by the Python module at `path`."""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return frozenset()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    files = set()
+    for name in names:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        path_ = _relative(getattr(spec, "origin", None), root)
+        if path_ and path_.endswith(".py"):
+            files.add(path_)
+    return frozenset(files)
+
+
+def static_deps(item: pytest.Item, root: pathlib.Path) -> set[str]:
+    """Files a test depends on without running it.
+
+    These are the test module, the modules under `root` it imports, and the
+    files defining every fixture in its closure.
+    """
+    deps = {_relative(item.path, root)}
+    deps.update(_module_imports(pathlib.Path(item.path), root))
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    for defs in getattr(fixtureinfo, "name2fixturedefs", {}).values():
+        for fixturedef in defs:
+            try:
+                deps.add(_relative(inspect.getsourcefile(fixturedef.func), root))
+            except TypeError:
+                continue
+    deps.discard(None)
+    return deps
+
+
+def changed_files(base: str, cwd: pathlib.Path) -> list[str] | None:
+    """Paths (relative to `cwd`) changed since git ref `base`, incl. untracked.
+
+    Returns:
+        list[str] | None: Changed paths, or None if git could not tell.
+    """
+    try:
+        diff = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", base, "--"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return sorted({line for line in (diff + untracked).splitlines() if line})
+
+
+def shared_changes(changed: Sequence[str], full_run: Sequence[str]) -> list[str]:
+    """Changed paths matching a `full_run` pattern."""
+    return [
+        path
+        for path in changed
+        if any(pathlib.PurePosixPath(path).match(p) for p in full_run)
+    ]
+
+
+def select(
+    deps: dict[str, set[str]],
+    history: dict[str, list[str]],
+    changed: Sequence[str],
+    full_run: Sequence[str] | None = None,
+) -> tuple[set[str] | None, str]:
+    """Decide which tests a change impacts.
+
+    Args:
+        deps: Static dependencies per nodeid (`static_deps`).
+        history: Page files each nodeid used when it last ran.
+        changed: Changed paths.
+        full_run: Patterns of shared paths that impact every test;
+            `settings.impact_full_run` if None.
+
+    Returns:
+        tuple: Selected nodeids (None for all of them) and a short reason.
+        Tests without history are always selected; changed files other than
+        Python modules and `full_run` paths impact nothing.
+    """
+    if full_run is None:
+        full_run = settings.impact_full_run
+    shared = shared_changes(changed, full_run)
+    if shared:
+        more = f" (+{len(shared) - 3})" if len(shared) > 3 else ""
+        return None, f"shared code changed: {', '.join(shared[:3])}{more}"
+    modules = {p for p in changed if p.endswith(".py")}
+    selected = {
+        nodeid
+        for nodeid, static in deps.items()
+        if nodeid not in history or modules & (static | set(history[nodeid]))
+    }
+    return selected, f"{len(modules)} changed modules"
+
+
+class ImpactPlugin:
+    """Pytest plugin recording test dependencies and selecting impacted tests.
+
+    Every test reports the page files it used (via `PageRegistry`) on its
+    teardown report, so the controller merges them with or without
+    pytest-xdist and saves the map in the pytest cache. With a `base` git
+    ref, collection keeps only tests whose static dependencies or recorded
+    pages include a changed module.
+
+    Attributes:
+        base: Git ref to diff against, or None to record only.
+        full_run: Patterns of shared paths that impact every test.
+        history: `{nodeid: [page file, ...]}` loaded at configure time.
+    """
+
+    def __init__(
+        self, base: str | None = None, full_run: Sequence[str] | None = None
+    ) -> None:
+        """Initialise the plugin.
+
+        Args:
+            base: Git ref to diff against, or None to record only.
+            full_run: Patterns of shared paths that impact every test;
+                `settings.impact_full_run` if None.
+        """
+        self.base = base
+        self.full_run = tuple(
+            settings.impact_full_run if full_run is None else full_run
+        )
+        self.history: dict[str, list[str]] = {}
+        self.changed: list[str] | None = None
+        self._root = pathlib.Path.cwd()
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        global used
+        self._root = pathlib.Path(config.rootpath).resolve()
+        cache = getattr(config, "cache", None)
+        self.history = dict(cache.get(CACHE_KEY, {})) if cache is not None else {}
+        if self.base:
+            self.changed = changed_files(self.base, self._root)
+        used = set()
+
+    def pytest_unconfigure(self, config: pytest.Config) -> None:
+        global used
+        used = None
+
+    def pytest_report_header(self, config: pytest.Config) -> str | None:
+        if not self.base:
+            return None
+        if self.changed is None:
+            return f"impact: git diff against {self.base} failed -> full run"
+        mode = (
+            "full run" if shared_changes(self.changed, self.full_run) else "selective"
+        )
+        return f"impact: {len(self.changed)} changed path(s) vs {self.base} -> {mode}"
+
+    @hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items) -> None:
+        if not self.base or self.changed is None:
+            return
+        deps = {item.nodeid: static_deps(item, self._root) for item in items}
+        selected, _ = select(deps, self.history, self.changed, self.full_run)
+        if selected is None:
+            return
+        keep = [item for item in items if item.nodeid in selected]
+        dropped = [item for item in items if item.nodeid not in selected]
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = keep
+
+    @hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call) -> None:
+        if call.when == "teardown" and used is not None:
+            item.user_properties.append((USER_PROPERTY, page_files(used, self._root)))
+            used.clear()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.history[report.nodeid] = list(value)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        cache = getattr(session.config, "cache", None)
+        if cache is not None and not hasattr(session.config, "workerinput"):
+            cache.set(CACHE_KEY, self.history)
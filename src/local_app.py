@@ -0,0 +1,247 @@
+from __future__ import annotations
+import html
+import re
+import threading
+from http import cookies
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+SESSION_COOKIE = "session-username"
+
+PRODUCTS = [
+    "Sauce Labs Backpack",
+    "Sauce Labs Bike Light",
+    "Sauce Labs Bolt T-Shirt",
+    "Sauce Labs Fleece Jacket",
+    "Sauce Labs Onesie",
+    "Test.allTheThings() T-Shirt (Red)",
+]
+
+STYLESHEET = """
+body { font-family: sans-serif; margin: 0; }
+.header_container { display: flex; justify-content: space-between; padding: 8px; }
+.inventory_item { border-bottom: 1px solid #ddd; padding: 8px; }
+.shopping_cart_badge { background: #e2231a; color: #fff; border-radius: 50%; padding: 2px 6px; }
+"""
+
+_LOGIN_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Swag Labs</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body>
+<div class="login_logo">Swag Labs</div>
+<form class="login_wrapper" method="post" action="/">
+  <input id="user-name" name="user-name" data-test="username" type="text">
+  <input id="password" name="password" data-test="password" type="password">
+  {error}
+  <input id="login-button" data-test="login-button" type="submit" value="Login">
+</form>
+</body></html>
+"""
+
+_ERROR_HTML = '<h3 data-test="error">{message}</h3>'
+
+_INVENTORY_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Swag Labs</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body>
+<div class="header_container">
+  <span class="title" data-test="title">Products</span>
+  <a class="shopping_cart_link" data-test="shopping-cart-link" href="#"></a>
+</div>
+<div class="inventory_list">{items}</div>
+<script>
+(function () {{
+  var KEY = "cart-contents";
+  function read() {{
+    try {{ return JSON.parse(localStorage.getItem(KEY) || "[]"); }} catch (e) {{ return []; }}
+  }}
+  function render() {{
+    var cart = read();
+    var link = document.querySelector(".shopping_cart_link");
+    link.innerHTML = cart.length
+      ? '<span class="shopping_cart_badge" data-test="shopping-cart-badge">'
+        + cart.length + "</span>"
+      : "";
+    document.querySelectorAll("button.btn_inventory").forEach(function (btn) {{
+      var inCart = cart.indexOf(Number(btn.dataset.itemId)) !== -1;
+      btn.textContent = inCart ? "Remove" : "Add to cart";
+      btn.id = (inCart ? "remove-" : "add-to-cart-") + btn.dataset.slug;
+      btn.className = "btn btn_small btn_inventory "
+        + (inCart ? "btn_secondary" : "btn_primary");
+    }});
+  }}
+  document.addEventListener("click", function (ev) {{
+    var btn = ev.target.closest("button.btn_inventory");
+    if (!btn) {{ return; }}
+    var id = Number(btn.dataset.itemId), cart = read(), at = cart.indexOf(id);
+    if (at === -1) {{ cart.push(id); }} else {{ cart.splice(at, 1); }}
+    localStorage.setItem(KEY, JSON.stringify(cart));
+    render();
+  }});
+  render();
+}})();
+</script>
+</body></html>
+"""
+
+_ITEM_HTML = """<div class="inventory_item" data-test="inventory-item">
+  <div class="inventory_item_name" data-test="inventory-item-name">{name}</div>
+  <button class="btn btn_small btn_inventory btn_primary" data-item-id="{item_id}"
+    data-slug="{slug}" id="add-to-cart-{slug}">Add to cart</button>
+</div>"""
+
+
+def slug(name: str) -> str:
+    """Build a SauceDemo-style id suffix, e.g. 'sauce-labs-backpack'."""
+    return re.sub(r"[^a-z0-9().]+", "-", name.lower()).strip("-")
+
+
+def _render_login(error: str | None = None) -> str:
+    """Render the login page, optionally with an error banner."""
+    banner = _ERROR_HTML.format(message=html.escape(error)) if error else ""
+    return _LOGIN_HTML.format(error=banner)
+
+
+def _render_inventory() -> str:
+    """Render the product listing."""
+    items = "".join(
+        _ITEM_HTML.format(name=html.escape(name), item_id=i, slug=slug(name))
+        for i, name in enumerate(PRODUCTS)
+    )
+    return _INVENTORY_HTML.format(items=items)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler serving the stand-in login and inventory pages."""
+
+    server: "_AppServer"
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence per-request logging; it only adds noise to test output."""
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path in ("/", "/index.html"):
+            self._send(200, _render_login())
+        elif path == "/inventory.html":
+            if self._session_user() is None:
+                self._send(
+                    200,
+                    _render_login(
+                        "Epic sadface: You can only access '/inventory.html' "
+                        "when you are logged in."
+                    ),
+                )
+            else:
+                self._send(200, _render_inventory())
+        elif path == "/static/style.css":
+            self._send(200, STYLESHEET, content_type="text/css")
+        else:
+            self._send(404, "Not found", content_type="text/plain")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        user = form.get("user-name", [""])[0]
+        password = form.get("password", [""])[0]
+
+        if not user:
+            self._send(200, _render_login("Epic sadface: Username is required"))
+            return
+        if self.server.users.get(user) != password or not password:
+            self._send(
+                200,
+                _render_login(
+                    "Epic sadface: Username and password do not match "
+                    "any user in this service"
+                ),
+            )
+            return
+
+        self.send_response(303)
+        self.send_header("Location", "/inventory.html")
+        self.send_header("Set-Cookie", f"{SESSION_COOKIE}={user}; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _session_user(self) -> str | None:
+        """Return the logged-in username from the session cookie, if valid."""
+        jar = cookies.SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = jar.get(SESSION_COOKIE)
+        if morsel is None or morsel.value not in self.server.users:
+            return None
+        return morsel.value
+
+    def _send(self, status: int, body: str, content_type: str = "text/html") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _AppServer(ThreadingHTTPServer):
+    daemon_threads = True
+    users: dict[str, str]
+
+
+class LocalApp:
+    """Hermetic stand-in for the SauceDemo login and inventory pages.
+
+    Serves markup matching the locators of `LoginPage` and `InventoryPage`
+    from a background thread on an ephemeral localhost port.
+
+    Attributes:
+        users: Accepted `{username: password}` pairs.
+        host: Interface to bind to.
+    """
+
+    def __init__(self, users: dict[str, str], host: str = "127.0.0.1") -> None:
+        """Initialise the app (call `start()` to begin serving).
+
+        Args:
+            users: Accepted `{username: password}` pairs.
+            host: Interface to bind to.
+        """
+        self.users = dict(users)
+        self.host = host
+        self._server: _AppServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server, e.g. 'http://127.0.0.1:54321'."""
+        if self._server is None:
+            raise RuntimeError("LocalApp is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self) -> "LocalApp":
+        """Bind to an ephemeral port and serve in a daemon thread."""
+        self._server = _AppServer((self.host, 0), _Handler)
+        self._server.users = self.users
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-app", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and release the port."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+if __name__ == "__main__":
+    from src.config import settings
+
+    app = LocalApp(settings.e2e_users).start()
+    print(f"Serving stand-in app at {app.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        app.stop()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import html
+from typing import Sequence
+
+import pytest
+
+from src.scheduling import make_scheduler
+
+USER_PROPERTY = "browser"
+FIXTURE = "browser_name"
+
+
+def parse_browsers(value: str | Sequence[str] | None) -> list[str]:
+    """Parse `"chrome, firefox"` into a de-duplicated, lower-case list."""
+    if not value:
+        return []
+    items = value.split(",") if isinstance(value, str) else value
+    out: list[str] = []
+    for item in items:
+        name = item.strip().lower()
+        if name and name not in out:
+            out.append(name)
+    return out
+
+
+class BrowserMatrixPlugin:
+    """Run every browser-using test once per browser in a single session.
+
+    Parametrizes the session-scoped `browser_name` fixture, so everything
+    built on it (driver factory, pool, `driver`) exists once per browser and
+    test ids gain a `[chrome]`/`[firefox]` suffix. Under xdist, workers are
+    assigned a browser each (see `make_scheduler`). Reports are tagged with
+    the browser: a `browser` user property (JUnit), a Browser column in
+    pytest-html and an Allure tag.
+
+    Attributes:
+        browsers: Browsers of the matrix, in order.
+    """
+
+    def __init__(self, browsers: Sequence[str]) -> None:
+        """Initialise the plugin with the browsers to run."""
+        self.browsers = list(browsers)
+
+    def pytest_generate_tests(self, metafunc: pytest.Metafunc) -> None:
+        if FIXTURE in metafunc.fixturenames:
+            metafunc.parametrize(FIXTURE, self.browsers, indirect=True, scope="session")
+
+    def pytest_collection_modifyitems(self, config: pytest.Config, items) -> None:
+        allure = config.pluginmanager.hasplugin("allure_pytest")
+        for item in items:
+            callspec = getattr(item, "callspec", None)
+            browser = callspec.params.get(FIXTURE) if callspec else None
+            if browser is None:
+                continue
+            item.user_properties.append((USER_PROPERTY, browser))
+            if allure:
+                item.add_marker(pytest.mark.allure_label(browser, label_type="tag"))
+
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config: pytest.Config, log):
+        if config.getvalue("dist") == "each":
+            return None
+        if config.pluginmanager.has_plugin("duration-schedule"):
+            # The duration scheduler already knows the matrix
+            return None
+        return make_scheduler(config, log, None, self.browsers)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_header(self, cells: list[str]) -> None:
+        cells.insert(2, "<th>Browser</th>")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_row(self, report, cells: list[str]) -> None:
+        browser = dict(report.user_properties).get(USER_PROPERTY, "")
+        cells.insert(2, f"<td>{html.escape(str(browser))}</td>")
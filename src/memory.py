@@ -0,0 +1,185 @@
+from __future__ import annotations
+import os
+import pathlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pytest
+
+USER_PROPERTY = "browser_rss"
+MIB = 1024 * 1024
+_PROC = pathlib.Path("/proc")
+
+
+def _proc_rss(pid: int) -> int:
+    """Resident set size of one process from /proc, 0 if it is gone."""
+    try:
+        for line in (_PROC / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _proc_children() -> dict[int, list[int]]:
+    """Map each pid to its direct children by scanning /proc/<pid>/stat."""
+    children: dict[int, list[int]] = {}
+    for entry in _PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # The command name may contain spaces; fields resume after ')'
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+    return children
+
+
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def process_rss(pid: int) -> int:
+    """RSS in bytes of a single process, 0 if it cannot be measured."""
+    psutil = _psutil()
+    if psutil is None:
+        return _proc_rss(pid)
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return 0
+
+
+def tree_rss(pid: int) -> int | None:
+    """Summed RSS in bytes of `pid` and all its descendants.
+
+    Uses psutil when it is installed and /proc otherwise; returns None where
+    neither is available (e.g. macOS/Windows without psutil).
+    """
+    psutil = _psutil()
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            pids = [root.pid, *(p.pid for p in root.children(recursive=True))]
+        except psutil.Error:
+            return None
+    elif _PROC.is_dir():
+        children = _proc_children()
+        pids, stack = [], [pid]
+        while stack:
+            pids.append(stack.pop())
+            stack.extend(children.get(pids[-1], ()))
+    else:
+        return None
+    return sum(process_rss(p) for p in pids)
+
+
+def total_memory() -> int | None:
+    """Physical memory of this machine in bytes, None if unknown."""
+    psutil = _psutil()
+    if psutil is not None:
+        return psutil.virtual_memory().total
+    try:
+        for line in (_PROC / "meminfo").read_text().splitlines():
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def driver_pid(driver: Any) -> int | None:
+    """Pid of the chromedriver/geckodriver process behind a local WebDriver.
+
+    The browser and its renderer processes are children of that process.
+    Remote and fake drivers have none.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def sample(driver: Any) -> dict[str, Any] | None:
+    """RSS of the browser behind `driver` and of this worker process.
+
+    Returns:
+        dict | None: `{"worker": id, "browser": bytes, "process": bytes}`,
+        or None if the browser's processes cannot be measured.
+    """
+    pid = driver_pid(driver)
+    browser = tree_rss(pid) if pid is not None else None
+    if not browser:
+        return None
+    return {
+        "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+        "browser": browser,
+        "process": process_rss(os.getpid()),
+    }
+
+
+class MemoryReportPlugin:
+    """Pytest plugin summarising browser and worker memory at the end of the run.
+
+    The `driver` fixture samples the browser process tree before it quits or
+    returns the browser to the pool; samples travel on the teardown report
+    (`user_properties`), so the controller sees all xdist workers.
+
+    Attributes:
+        samples: Collected `sample()` results.
+    """
+
+    def __init__(self) -> None:
+        """Initialise with no samples."""
+        self.samples: list[dict[str, Any]] = []
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY and value:
+                self.samples.append(value)
+
+    def summary(self) -> list[str]:
+        """Lines of the terminal summary (empty without samples)."""
+        if not self.samples:
+            return []
+        browser = [s["browser"] for s in self.samples]
+        workers: dict[str, dict[str, int]] = {}
+        for s in self.samples:
+            peak = workers.setdefault(s["worker"], {"browser": 0, "process": 0})
+            peak["browser"] = max(peak["browser"], s["browser"])
+            peak["process"] = max(peak["process"], s["process"])
+        lines = [
+            f"  per browser: mean {sum(browser) / len(browser) / MIB:.1f} MiB, "
+            f"max {max(browser) / MIB:.1f} MiB ({len(browser)} samples)"
+        ]
+        for worker, peak in sorted(workers.items()):
+            total = peak["browser"] + peak["process"]
+            lines.append(
+                f"  {worker}: {total / MIB:.1f} MiB peak "
+                f"(browser {peak['browser'] / MIB:.1f} MiB, "
+                f"worker {peak['process'] / MIB:.1f} MiB)"
+            )
+        per_worker = max(p["browser"] + p["process"] for p in workers.values())
+        lines.append(f"  ~{1024 * MIB / per_worker:.1f} workers per GiB")
+        memory = total_memory()
+        if memory:
+            lines.append(
+                f"  this runner: {os.cpu_count()} CPUs, {memory / 1024 / MIB:.1f} GiB "
+                f"-> memory fits ~{memory // per_worker} workers"
+            )
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        lines = self.summary()
+        if not lines:
+            return
+        terminalreporter.write_sep("=", "browser memory")
+        for line in lines:
+            terminalreporter.write_line(line)
@@ -1,9 +1,46 @@
 from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import ClassVar, Iterable
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from src.adaptive_timeouts import adaptive
+from src.retry import retried, suspended
+from src.timing import timed
+from .event_wait import EventWait
+from .scripts import QUERY_JS
+
+# Poll interval for short "expected absent/present" budgets, where the
+# WebDriverWait default of 0.5 s would dominate the whole check.
+SHORT_POLL_FREQUENCY = 0.05
+
+Locator = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """Point-in-time state of the first element matched by a locator.
+
+    Attributes:
+        count: Number of matching elements.
+        visible: Whether the first match is displayed.
+        text: Rendered text of the first match, or None if absent.
+        attributes: Requested attribute values of the first match.
+    """
+
+    count: int = 0
+    visible: bool = False
+    text: str | None = None
+    attributes: dict[str, str | None] = field(default_factory=dict)
+
+    @property
+    def present(self) -> bool:
+        """True if at least one element matched."""
+        return self.count > 0
 
 
 class BasePage:
@@ -11,16 +48,48 @@ class BasePage:
 
     Encapsulates navigation, element lookup (presence/visibility), clicking,
     typing and simple text extraction. Designed to be inherited by concrete
-    page objects.
+    page objects. Actions and waits are `retried`: with `--step-retries` a
+    stale element, intercepted click or timed-out wait is retried in place.
+    Locator waits are `adaptive`: with `--adaptive-timeouts` each one uses a
+    timeout learned from how long that locator took in earlier runs.
 
     Attributes:
         driver: Selenium WebDriver instance.
         base_url: Base URL used by `open()` for relative paths.
+        default_timeout: Wait budget in seconds of `wait` and `event_wait`.
         wait: WebDriverWait configured with `default_timeout`.
+        absence_timeout: Short polling budget in seconds for checks that
+            expect an element to be absent (see `exists`, `is_absent`).
+        event_wait: `EventWait` engine when `wait_engine="event"`, else None.
+        timeout_scale: Factor already applied to `default_timeout`; learned
+            timeouts are scaled by it too.
+        latency_scope: Browser/site label `adaptive` waits learn under, or
+            None to neither use nor record learned timeouts.
+        SNAPSHOT: Named locators fetched together by `snapshot()`.
+        NAME: Attribute name in the `pages` registry (derived from the class
+            name when None).
+        TIMEOUT: Page-specific wait timeout used by the registry (falls back
+            to the global default when None).
+        READY: Locator whose visibility means the page is usable; `open()`
+            waits for it instead of relying on the browser's load event.
+        ready_on_open: Whether `open()` waits for `READY` by default.
     """
 
+    SNAPSHOT: ClassVar[dict[str, Locator]] = {}
+    NAME: ClassVar[str | None] = None
+    TIMEOUT: ClassVar[float | None] = None
+    READY: ClassVar[Locator | None] = None
+
     def __init__(
-        self, driver: WebDriver, base_url: str, default_timeout: int = 10
+        self,
+        driver: WebDriver,
+        base_url: str,
+        default_timeout: int = 10,
+        absence_timeout: float = 1.0,
+        wait_engine: str = "poll",
+        page_load_strategy: str = "normal",
+        timeout_scale: float = 1.0,
+        latency_scope: str | None = None,
     ) -> None:
         """Initialise the page.
 
@@ -28,20 +97,53 @@ class BasePage:
             driver: Selenium WebDriver.
             base_url: Base URL (e.g. "https://example.com").
             default_timeout: Explicit wait timeout in seconds.
+            absence_timeout: Polling budget in seconds for absence checks.
+            wait_engine: "poll" for `WebDriverWait` polling or "event" for
+                MutationObserver-based waits (`EventWait`).
+            page_load_strategy: The driver's page-load strategy. With "eager"
+                or "none" `driver.get` returns before the page has loaded, so
+                `open()` waits for the page's `READY` locator instead.
+            timeout_scale: Factor already applied to `default_timeout`.
+            latency_scope: Browser/site label for learned timeouts, e.g.
+                "chrome https://www.saucedemo.com"; None opts out.
+
+        Raises:
+            ValueError: If `wait_engine` is not "poll" or "event".
         """
+        if wait_engine not in ("poll", "event"):
+            raise ValueError(f"Unknown wait engine: {wait_engine!r}")
         self.driver = driver
         self.base_url = base_url.rstrip("/")
+        self.default_timeout = default_timeout
         self.wait = WebDriverWait(self.driver, default_timeout)
+        self.absence_timeout = absence_timeout
+        self.event_wait = (
+            EventWait(self.driver, default_timeout) if wait_engine == "event" else None
+        )
+        self.ready_on_open = page_load_strategy != "normal"
+        self.timeout_scale = timeout_scale
+        self.latency_scope = latency_scope
 
-    def open(self, path: str = "") -> None:
+    @timed
+    @retried
+    def open(self, path: str = "", wait_ready: bool | None = None) -> None:
         """Open a page by appending `path` to the base URL.
 
         Args:
             path: Relative path like "login" or "/inventory".
+            wait_ready: Wait for the page's `READY` locator after navigating;
+                defaults to `ready_on_open`. Ignored when `READY` is None.
         """
         url = f"{self.base_url}/{path.lstrip('/')}"
         self.driver.get(url)
+        if wait_ready is None:
+            wait_ready = self.ready_on_open
+        if wait_ready and self.READY is not None:
+            self.find_visible(*self.READY)
 
+    @timed
+    @retried
+    @adaptive
     def find(self, by: By, value: str) -> WebElement:
         """Wait for element presence in the DOM and return it.
 
@@ -52,8 +154,13 @@ class BasePage:
         Returns:
             WebElement: The found element (may be invisible).
         """
+        if self.event_wait is not None:
+            return self.event_wait.presence((by, value))
         return self.wait.until(EC.presence_of_element_located((by, value)))
 
+    @timed
+    @retried
+    @adaptive
     def find_visible(self, by: By, value: str) -> WebElement:
         """Wait for element visibility and return it.
 
@@ -64,8 +171,13 @@ class BasePage:
         Returns:
             WebElement: The visible element.
         """
+        if self.event_wait is not None:
+            return self.event_wait.visibility((by, value))
         return self.wait.until(EC.visibility_of_element_located((by, value)))
 
+    @timed
+    @retried
+    @adaptive
     def click(self, by: By, value: str) -> None:
         """Wait until element is clickable and click it.
 
@@ -73,9 +185,56 @@ class BasePage:
             by: Selenium locator strategy.
             value: Locator value.
         """
-        el = self.wait.until(EC.element_to_be_clickable((by, value)))
+        if self.event_wait is not None:
+            el = self.event_wait.clickable((by, value))
+        else:
+            el = self.wait.until(EC.element_to_be_clickable((by, value)))
         el.click()
 
+    @timed
+    @retried
+    @adaptive
+    def wait_for_text(self, by: By, value: str, text: str) -> bool:
+        """Wait until the element's text contains `text`.
+
+        Args:
+            by: Selenium locator strategy.
+            value: Locator value.
+            text: Expected substring.
+
+        Returns:
+            bool: True once the text is present.
+
+        Raises:
+            TimeoutException: If the text does not appear in time.
+        """
+        if self.event_wait is not None:
+            return self.event_wait.text((by, value), text)
+        return self.wait.until(EC.text_to_be_present_in_element((by, value), text))
+
+    @timed
+    @retried
+    @adaptive
+    def wait_for_count(self, by: By, value: str, count: int) -> bool:
+        """Wait until exactly `count` elements match the locator.
+
+        Args:
+            by: Selenium locator strategy.
+            value: Locator value.
+            count: Expected number of matches.
+
+        Returns:
+            bool: True once the count matches.
+
+        Raises:
+            TimeoutException: If the count is not reached in time.
+        """
+        if self.event_wait is not None:
+            return self.event_wait.count((by, value), count)
+        return self.wait.until(lambda d: len(d.find_elements(by, value)) == count)
+
+    @timed
+    @retried
     def type(self, by: By, value: str, text: str, clear: bool = True) -> None:
         """Type text into a visible element.
 
@@ -90,6 +249,8 @@ class BasePage:
             el.clear()
         el.send_keys(text)
 
+    @timed
+    @retried
     def text_of(self, by: By, value: str) -> str:
         """Return the visible text of an element.
 
@@ -102,18 +263,179 @@ class BasePage:
         """
         return self.find_visible(by, value).text
 
-    def exists(self, by: By, value: str) -> bool:
+    @timed
+    def exists(self, by: By, value: str, timeout: float | None = None) -> bool:
         """Check if element exists (present in DOM).
 
         Args:
             by: Selenium locator strategy.
             value: Locator value.
+            timeout: Override for the wait budget in seconds; `default_timeout`
+                is used when None. Pass `self.absence_timeout` when the element
+                is usually absent so a negative answer stays cheap.
 
         Returns:
             bool: True if element is present within the wait timeout, else False.
         """
+        if timeout is None:
+            try:
+                with suspended():
+                    self.find(by, value)
+                return True
+            except Exception:
+                return False
+        try:
+            self._short_wait(timeout).until(EC.presence_of_element_located((by, value)))
+            return True
+        except TimeoutException:
+            return False
+
+    @timed
+    def first_present(
+        self, *locators: Locator, timeout: float | None = None
+    ) -> Locator | None:
+        """Wait until one of `locators` is in the DOM and return it.
+
+        Useful when a navigation can end on different pages (e.g. a login
+        redirect), so neither outcome has to time out first.
+
+        Args:
+            *locators: Candidate `(by, value)` locators, checked in order.
+            timeout: Wait budget in seconds; `default_timeout` if None.
+
+        Returns:
+            Locator | None: The first locator found, or None on timeout.
+        """
+
+        def any_present(driver):
+            return next((loc for loc in locators if driver.find_elements(*loc)), False)
+
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            return self._short_wait(timeout).until(any_present)
+        except TimeoutException:
+            return None
+
+    @timed
+    def is_present(self, by: By, value: str) -> bool:
+        """Return True if the element is in the DOM right now, without waiting.
+
+        Args:
+            by: Selenium locator strategy.
+            value: Locator value.
+
+        Returns:
+            bool: Result of a single `find_elements` call.
+        """
+        return len(self.driver.find_elements(by, value)) > 0
+
+    @timed
+    def is_absent(self, by: By, value: str, timeout: float | None = None) -> bool:
+        """Return True once no element matches, polling for a short budget.
+
+        Returns immediately when the element is already absent.
+
+        Args:
+            by: Selenium locator strategy.
+            value: Locator value.
+            timeout: Polling budget in seconds; `absence_timeout` if None.
+
+        Returns:
+            bool: True if the element is (or became) absent, False otherwise.
+        """
+        timeout = self.absence_timeout if timeout is None else timeout
+        try:
+            self._short_wait(timeout).until(
+                lambda d: len(d.find_elements(by, value)) == 0
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    @timed
+    def wait_for_removal(
+        self, by: By, value: str, timeout: float | None = None
+    ) -> bool:
+        """Wait until the currently matched element is detached from the DOM.
+
+        Tracks the concrete element rather than re-running the locator. With
+        the event engine a MutationObserver ends the wait as soon as the node
+        is removed; otherwise (or if the async script fails) `staleness_of`
+        is polled at `SHORT_POLL_FREQUENCY`.
+
+        Args:
+            by: Selenium locator strategy.
+            value: Locator value.
+            timeout: Wait budget in seconds; `default_timeout` if None.
+
+        Returns:
+            bool: True if the element is gone, False if it is still attached.
+        """
+        els = self.driver.find_elements(by, value)
+        if not els:
+            return True
+        timeout = self.default_timeout if timeout is None else timeout
         try:
-            self.find(by, value)
+            if self.event_wait is not None:
+                return self.event_wait.removed(
+                    (by, value),
+                    els[0],
+                    timeout=timeout,
+                    poll_frequency=SHORT_POLL_FREQUENCY,
+                )
+            self._short_wait(timeout).until(EC.staleness_of(els[0]))
             return True
-        except Exception:
+        except TimeoutException:
             return False
+
+    def _set_timeout(self, timeout: float) -> float:
+        """Switch `wait`/`event_wait` to `timeout`; return the previous budget."""
+        previous = self.default_timeout
+        if timeout != previous:
+            self.default_timeout = timeout
+            self.wait = WebDriverWait(self.driver, timeout)
+            if self.event_wait is not None:
+                self.event_wait.timeout = timeout
+        return previous
+
+    def _short_wait(self, timeout: float) -> WebDriverWait:
+        """Build a WebDriverWait with a fine poll interval for short budgets."""
+        return WebDriverWait(self.driver, timeout, poll_frequency=SHORT_POLL_FREQUENCY)
+
+    @timed
+    def query(
+        self, *locators: Locator, attributes: Iterable[str] = ()
+    ) -> list[ElementState]:
+        """Read the state of several locators in a single script round trip.
+
+        Does not wait: each result reflects the DOM at the moment of the call.
+
+        Args:
+            *locators: `(by, value)` tuples, e.g. `InventoryPage.TITLE`.
+            attributes: Attribute names to read from each first match.
+
+        Returns:
+            list[ElementState]: One state per locator, in the same order.
+        """
+        if not locators:
+            return []
+        raw = self.driver.execute_script(
+            QUERY_JS, [list(loc) for loc in locators], list(attributes)
+        )
+        return [ElementState(**item) for item in raw]
+
+    def snapshot(
+        self, names: Iterable[str] | None = None, attributes: Iterable[str] = ()
+    ) -> dict[str, ElementState]:
+        """Fetch the page's `SNAPSHOT` bundle (or a subset) in one call.
+
+        Args:
+            names: Keys of `SNAPSHOT` to fetch; all of them if None.
+            attributes: Attribute names to read from each first match.
+
+        Returns:
+            dict[str, ElementState]: States keyed by bundle name.
+        """
+        keys = list(self.SNAPSHOT) if names is None else list(names)
+        states = self.query(*(self.SNAPSHOT[k] for k in keys), attributes=attributes)
+        return dict(zip(keys, states))
@@ -0,0 +1,155 @@
+from __future__ import annotations
+import time
+from typing import Any, Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from .scripts import WAIT_JS
+
+# Extra script-timeout headroom so the browser-side timer always fires first.
+SCRIPT_TIMEOUT_MARGIN = 5
+
+
+class EventWait:
+    """Wait engine that resolves as soon as the DOM condition holds.
+
+    Each wait is a single `execute_async_script` call backed by a
+    MutationObserver, so there is no fixed poll interval between the moment
+    the element is ready and the moment the wait returns. If the async call
+    fails (navigation replaced the document, the driver does not support
+    async scripts, ...) the remaining time is spent in a regular polling
+    `WebDriverWait` with the equivalent expected condition.
+
+    Attributes:
+        driver: Selenium WebDriver.
+        timeout: Wait timeout in seconds.
+        supported: False once the driver proved it cannot run async scripts.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float) -> None:
+        """Initialise the engine.
+
+        Args:
+            driver: Selenium WebDriver.
+            timeout: Wait timeout in seconds.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.supported = True
+        self._script_timeout = 0.0
+
+    def presence(self, locator: tuple[str, str]) -> WebElement:
+        """Wait until the element is in the DOM and return it."""
+        return self._until(
+            "presence", locator, None, EC.presence_of_element_located(locator)
+        )
+
+    def visibility(self, locator: tuple[str, str]) -> WebElement:
+        """Wait until the element is displayed and return it."""
+        return self._until(
+            "visible", locator, None, EC.visibility_of_element_located(locator)
+        )
+
+    def clickable(self, locator: tuple[str, str]) -> WebElement:
+        """Wait until the element is displayed and enabled and return it."""
+        return self._until(
+            "clickable", locator, None, EC.element_to_be_clickable(locator)
+        )
+
+    def text(self, locator: tuple[str, str], text: str) -> bool:
+        """Wait until the element's text contains `text`."""
+        self._until(
+            "text", locator, text, EC.text_to_be_present_in_element(locator, text)
+        )
+        return True
+
+    def count(self, locator: tuple[str, str], expected: int) -> bool:
+        """Wait until exactly `expected` elements match the locator."""
+        self._until(
+            "count",
+            locator,
+            expected,
+            lambda d: len(d.find_elements(*locator)) == expected,
+        )
+        return True
+
+    def removed(
+        self,
+        locator: tuple[str, str],
+        element: WebElement,
+        timeout: float | None = None,
+        poll_frequency: float = 0.5,
+    ) -> bool:
+        """Wait until `element` (matched by `locator`) is detached from the DOM.
+
+        Args:
+            locator: Locator that matched `element`, for error messages.
+            element: The concrete node to watch.
+            timeout: Wait budget in seconds; `timeout` of the engine if None.
+            poll_frequency: Poll interval of the fallback wait.
+        """
+        self._until(
+            "removed",
+            locator,
+            element,
+            EC.staleness_of(element),
+            timeout=timeout,
+            poll_frequency=poll_frequency,
+        )
+        return True
+
+    def _until(
+        self,
+        cond: str,
+        locator: tuple[str, str],
+        expected: Any,
+        fallback: Callable[[WebDriver], Any],
+        timeout: float | None = None,
+        poll_frequency: float = 0.5,
+    ) -> Any:
+        """Run the async wait, falling back to polling for the remaining time."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        if self.supported:
+            try:
+                self._ensure_script_timeout(timeout)
+                result = self.driver.execute_async_script(
+                    WAIT_JS,
+                    locator[0],
+                    locator[1],
+                    cond,
+                    expected,
+                    int(timeout * 1000),
+                )
+            except NotImplementedError:
+                self.supported = False
+            except TimeoutException:
+                pass
+            except WebDriverException:
+                # e.g. the document was replaced mid-wait; poll out the rest
+                pass
+            else:
+                if result and result.get("ok"):
+                    return result.get("element", True)
+                if result and result.get("error"):
+                    raise ValueError(result["error"])
+                raise TimeoutException(
+                    f"Condition '{cond}' not met for {locator} " f"within {timeout}s"
+                )
+        remaining = max(0.0, deadline - time.monotonic())
+        return WebDriverWait(
+            self.driver, remaining, poll_frequency=poll_frequency
+        ).until(fallback)
+
+    def _ensure_script_timeout(self, timeout: float) -> None:
+        """Raise the driver's script timeout so long waits are not cut off.
+
+        Only called again when `timeout` grew past the value already set.
+        """
+        needed = timeout + SCRIPT_TIMEOUT_MARGIN
+        if self._script_timeout < needed:
+            self.driver.set_script_timeout(needed)
+            self._script_timeout = needed
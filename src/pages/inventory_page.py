@@ -1,6 +1,11 @@
 from __future__ import annotations
+from typing import Any, Iterable
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
+
+from src.timing import timed
 from .base_page import BasePage
+from .scripts import CART_JS
 
 
 class InventoryPage(BasePage):
@@ -9,6 +14,29 @@ class InventoryPage(BasePage):
     TITLE = (By.CSS_SELECTOR, ".title")
     ADD_TO_CART_BUTTONS = (By.CSS_SELECTOR, "button.btn_inventory")
     CART_BADGE = (By.CSS_SELECTOR, ".shopping_cart_badge")
+    ITEMS = (By.CSS_SELECTOR, ".inventory_item")
+    ITEM_NAME = (By.CSS_SELECTOR, ".inventory_item_name")
+    # An item's button switches to "Remove" (id `remove-<slug>`) once in the cart
+    IN_CART_BUTTON = (By.CSS_SELECTOR, "button.btn_inventory[id^='remove']")
+
+    PATH = "inventory.html"
+
+    READY = TITLE
+
+    SNAPSHOT = {
+        "title": TITLE,
+        "add_to_cart_buttons": ADD_TO_CART_BUTTONS,
+        "cart_badge": CART_BADGE,
+    }
+
+    def open_inventory(self, wait_ready: bool | None = None) -> None:
+        """Navigate directly to the inventory page (requires an authenticated session).
+
+        Args:
+            wait_ready: Passed to `open()`; use False when the caller checks
+                `is_loaded()` itself and must not fail on a login redirect.
+        """
+        self.open(self.PATH, wait_ready=wait_ready)
 
     def is_loaded(self) -> bool:
         """Return True if the inventory page appears to be loaded."""
@@ -17,19 +45,118 @@ class InventoryPage(BasePage):
     def add_first_item_to_cart(self) -> None:
         """Add the first visible item to the shopping cart.
 
+        Returns once the cart badge shows the new count, so a following
+        `cart_count()` does not race the page's re-render.
+
         Raises:
             AssertionError: If no inventory items are found.
         """
         btns = self.driver.find_elements(*self.ADD_TO_CART_BUTTONS)
         assert btns, "No inventory items found"
+        expected = self.cart_count() + 1
         btns[0].click()
+        self._wait_for_badge(expected)
 
     def cart_count(self) -> int:
         """Return the numeric badge value of items in the cart.
 
+        Does not wait for the badge: an empty cart has none, so the answer
+        comes from a single `find_elements` call. Cart actions wait for the
+        badge to update before they return.
+
         Returns:
             int: Count shown in the cart badge, or 0 if the badge is absent.
         """
-        if not self.exists(*self.CART_BADGE):
+        if not self.is_present(*self.CART_BADGE):
             return 0
         return int(self.text_of(*self.CART_BADGE))
+
+    @timed
+    def add_items_to_cart(
+        self, count: int | None = None, names: Iterable[str] | None = None
+    ) -> list[str]:
+        """Add several items in one script call, then wait once for the badge.
+
+        Items already in the cart are skipped.
+
+        Args:
+            count: Add the first `count` items not yet in the cart.
+            names: Add these items (by displayed name) instead.
+                With neither argument, every item is added.
+
+        Returns:
+            list[str]: Names of the items that were added.
+
+        Raises:
+            AssertionError: If a name is unknown or fewer than `count` items
+                could be added.
+        """
+        return self._cart_batch("add", count, names)
+
+    @timed
+    def remove_items_from_cart(self, names: Iterable[str] | None = None) -> list[str]:
+        """Remove several items in one script call, then wait once for the badge.
+
+        Args:
+            names: Items to remove (by displayed name); all cart items if None.
+
+        Returns:
+            list[str]: Names of the items that were removed.
+
+        Raises:
+            AssertionError: If a name is unknown.
+        """
+        return self._cart_batch("remove", None, names)
+
+    @timed
+    def cart_contents(self) -> list[str]:
+        """Return the names of the items currently in the cart (one round trip)."""
+        return self._run_cart_script("read", None, None)["cart"]
+
+    def _run_cart_script(
+        self, action: str, count: int | None, names: list[str] | None
+    ) -> dict[str, Any]:
+        selectors = {
+            "item": self.ITEMS[1],
+            "name": self.ITEM_NAME[1],
+            "button": self.ADD_TO_CART_BUTTONS[1],
+            "inCart": self.IN_CART_BUTTON[1],
+            "badge": self.CART_BADGE[1],
+        }
+        return self.driver.execute_script(CART_JS, selectors, action, names, count)
+
+    def _cart_batch(
+        self, action: str, count: int | None, names: Iterable[str] | None
+    ) -> list[str]:
+        """Run one batched add/remove and verify the badge reflects it."""
+        wanted = list(names) if names is not None else None
+        result = self._run_cart_script(action, count, wanted)
+        assert not result["missing"], f"Items not found: {result['missing']}"
+        clicked = result["clicked"]
+        if count is not None:
+            assert (
+                len(clicked) == count
+            ), f"Only {len(clicked)} of {count} items could be added to the cart"
+        delta = len(clicked) if action == "add" else -len(clicked)
+        expected = len(result["cart"]) + delta
+        if result["badge"] != (str(expected) if expected else None):
+            # The page has not re-rendered yet; a single wait covers the batch
+            self._wait_for_badge(expected)
+        return clicked
+
+    def _wait_for_badge(self, expected: int) -> None:
+        """Wait until the cart badge shows `expected` (absent for 0)."""
+        if expected == 0:
+            self.wait_for_count(*self.CART_BADGE, 0)
+            return
+        text = str(expected)
+
+        def badge_shows(driver) -> bool:
+            # Exact match: "contains" would accept "12" while waiting for "1"
+            try:
+                badges = driver.find_elements(*self.CART_BADGE)
+                return bool(badges) and badges[0].text.strip() == text
+            except StaleElementReferenceException:
+                return False
+
+        self.wait.until(badge_shows)
@@ -11,6 +11,15 @@ class LoginPage(BasePage):
     LOGIN_BTN = (By.ID, "login-button")
     ERROR = (By.CSS_SELECTOR, "[data-test='error']")
 
+    READY = USERNAME
+
+    SNAPSHOT = {
+        "username": USERNAME,
+        "password": PASSWORD,
+        "login_btn": LOGIN_BTN,
+        "error": ERROR,
+    }
+
     def open_login(self) -> None:
         """Navigate to the login page (root of the site)."""
         self.open("")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import functools
+import importlib
+import inspect
+import pathlib
+import pkgutil
+import re
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src import impact
+
+from .base_page import BasePage
+
+PAGES_DIR = pathlib.Path(__file__).resolve().parent
+
+
+def page_name(cls: type[BasePage]) -> str:
+    """Return the registry attribute for a page class.
+
+    `NAME` on the class wins; otherwise the class name is converted to
+    snake_case without the `Page` suffix (`InventoryPage` -> `inventory`).
+    """
+    explicit = getattr(cls, "NAME", None)
+    if explicit:
+        return explicit
+    base = (
+        cls.__name__[: -len("Page")] if cls.__name__.endswith("Page") else cls.__name__
+    )
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", base).lower()
+
+
+@functools.lru_cache(maxsize=None)
+def discover_pages(package: str = "src.pages") -> dict[str, type[BasePage]]:
+    """Import every module of `package` once and collect its page classes.
+
+    Only `BasePage` subclasses defined in the scanned module itself are
+    registered, so re-exports and `BasePage` are skipped.
+
+    Args:
+        package: Dotted package name whose directory is `PAGES_DIR`.
+
+    Returns:
+        dict[str, type[BasePage]]: Page classes keyed by `page_name()`.
+
+    Raises:
+        ValueError: If two page classes map to the same name.
+    """
+    found: dict[str, type[BasePage]] = {}
+    for info in sorted(pkgutil.iter_modules([str(PAGES_DIR)]), key=lambda i: i.name):
+        module = importlib.import_module(f"{package}.{info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(cls, BasePage)
+                and cls is not BasePage
+                and cls.__module__ == module.__name__
+            ):
+                name = page_name(cls)
+                if name in found and found[name] is not cls:
+                    raise ValueError(
+                        f"Duplicate page name '{name}': {found[name]!r} and {cls!r}"
+                    )
+                found[name] = cls
+    return found
+
+
+class PageRegistry:
+    """Attribute-style access to page objects, built on first use.
+
+    `pages.login` instantiates `LoginPage` the first time it is read and
+    returns the same instance afterwards, so a test only pays for the
+    pages (and their `WebDriverWait`s) it actually touches.
+
+    Attributes:
+        driver: WebDriver shared by all pages.
+        base_url: Base URL passed to every page.
+    """
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        base_url: str,
+        classes: dict[str, type[BasePage]] | None = None,
+        default_timeout: int = 10,
+        timeouts: dict[str, float] | None = None,
+        timeout_scale: float = 1.0,
+        **page_options,
+    ) -> None:
+        """Initialise the registry.
+
+        Args:
+            driver: Selenium WebDriver.
+            base_url: Base URL for all pages.
+            classes: Page classes by name; `discover_pages()` if None.
+            default_timeout: Wait timeout for pages without their own.
+            timeouts: Per-page wait timeouts by name; these override the
+                page class's `TIMEOUT` attribute.
+            timeout_scale: Factor applied to every page's wait timeout, e.g.
+                from preflight latency on a slow environment.
+            **page_options: Extra keyword arguments for every page, e.g.
+                `absence_timeout` or `wait_engine`.
+        """
+        self.driver = driver
+        self.base_url = base_url
+        self._classes = discover_pages() if classes is None else classes
+        self._default_timeout = default_timeout
+        self._timeouts = timeouts or {}
+        self._timeout_scale = timeout_scale
+        self._page_options = page_options
+        self._pages: dict[str, BasePage] = {}
+
+    def __getattr__(self, name: str) -> BasePage:
+        # Pages are not cached as attributes, so every read lands here and
+        # test impact recording sees which pages each test uses
+        page = self.__dict__.get("_pages", {}).get(name)
+        if page is not None:
+            impact.note_page(type(page))
+            return page
+        classes = self.__dict__.get("_classes", {})
+        if name not in classes:
+            raise AttributeError(
+                f"No page named '{name}'. Available: {', '.join(sorted(classes))}"
+            )
+        cls = classes[name]
+        impact.note_page(cls)
+        timeout = self._timeouts.get(name, cls.TIMEOUT or self._default_timeout)
+        page = cls(
+            self.driver,
+            self.base_url,
+            default_timeout=timeout * self._timeout_scale,
+            timeout_scale=self._timeout_scale,
+            **self._page_options,
+        )
+        self._pages[name] = page
+        return page
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._classes
+
+    def __dir__(self) -> list[str]:
+        return sorted(set(super().__dir__()) | set(self._classes))
@@ -0,0 +1,186 @@
+# JavaScript executed in the browser by page objects and session helpers.
+# Kept in one module so the batched query (`BasePage.query`) and the
+# event-driven wait engine (`EventWait`) resolve locators and visibility the
+# same way, and so `FakeDriver` can answer each script by its source.
+
+# Resolves a Selenium (by, value) pair to a list of DOM nodes inside the page.
+FIND_ALL_JS = """
+function __findAll(by, value) {
+  var root = document;
+  switch (by) {
+    case "id":
+      var byId = root.getElementById(value);
+      return byId ? [byId] : [];
+    case "css selector":
+      return Array.prototype.slice.call(root.querySelectorAll(value));
+    case "name":
+      return Array.prototype.slice.call(root.getElementsByName(value));
+    case "class name":
+      return Array.prototype.slice.call(root.getElementsByClassName(value));
+    case "tag name":
+      return Array.prototype.slice.call(root.getElementsByTagName(value));
+    case "xpath":
+      var res = root.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var nodes = [];
+      for (var i = 0; i < res.snapshotLength; i++) { nodes.push(res.snapshotItem(i)); }
+      return nodes;
+    case "link text":
+    case "partial link text":
+      return Array.prototype.filter.call(root.getElementsByTagName("a"), function (a) {
+        var t = (a.innerText || "").trim();
+        return by === "link text" ? t === value : t.indexOf(value) !== -1;
+      });
+  }
+  return [];
+}
+function __isVisible(el) {
+  if (!el.getClientRects().length) { return false; }
+  var style = window.getComputedStyle(el);
+  return style.visibility !== "hidden" && style.display !== "none";
+}
+"""
+
+QUERY_JS = (
+    FIND_ALL_JS
+    + """
+var locators = arguments[0], attrs = arguments[1], out = [];
+for (var i = 0; i < locators.length; i++) {
+  var els = __findAll(locators[i][0], locators[i][1]);
+  var el = els[0];
+  var values = {};
+  if (el) {
+    for (var j = 0; j < attrs.length; j++) { values[attrs[j]] = el.getAttribute(attrs[j]); }
+  }
+  out.push({
+    count: els.length,
+    visible: !!el && __isVisible(el),
+    text: el ? (el.innerText || "").trim() : null,
+    attributes: values
+  });
+}
+return out;
+"""
+)
+
+# Async script: resolves as soon as a condition holds. Re-checks on DOM
+# mutations (coalesced to one check per animation frame) plus a slow safety
+# tick for changes no mutation reports (e.g. a stylesheet finishing loading).
+WAIT_JS = (
+    FIND_ALL_JS
+    + """
+var by = arguments[0], value = arguments[1], cond = arguments[2];
+var expected = arguments[3], timeoutMs = arguments[4];
+var done = arguments[arguments.length - 1];
+
+function check() {
+  var els = __findAll(by, value), el = els[0];
+  switch (cond) {
+    case "presence":
+      return el ? { ok: true, element: el } : null;
+    case "visible":
+      return el && __isVisible(el) ? { ok: true, element: el } : null;
+    case "clickable":
+      return el && __isVisible(el) && !el.disabled ? { ok: true, element: el } : null;
+    case "text":
+      return el && (el.innerText || "").indexOf(expected) !== -1
+        ? { ok: true, element: el } : null;
+    case "count":
+      return els.length === expected ? { ok: true, count: els.length } : null;
+    case "removed":
+      return !expected.isConnected ? { ok: true } : null;
+  }
+  return { ok: false, error: "unknown condition " + cond };
+}
+
+var initial = check();
+if (initial) { done(initial); return; }
+
+var finished = false, frame = null, tick = null, timer = null;
+var raf = window.requestAnimationFrame
+  ? window.requestAnimationFrame.bind(window)
+  : function (fn) { return setTimeout(fn, 0); };
+var observer = new MutationObserver(schedule);
+
+function finish(result) {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearInterval(tick);
+  clearTimeout(timer);
+  done(result);
+}
+function recheck() {
+  frame = null;
+  var result = check();
+  if (result) { finish(result); }
+}
+function schedule() {
+  if (frame === null) { frame = raf(recheck); }
+}
+
+observer.observe(document, {
+  childList: true, subtree: true, attributes: true, characterData: true
+});
+tick = setInterval(recheck, 250);
+timer = setTimeout(function () { finish({ ok: false }); }, timeoutMs);
+"""
+)
+
+# Batched cart update: clicks every matching add/remove button in one call
+# and reports the cart (before the clicks) and the badge text (after them).
+# Selectors are passed in so the script stays free of page-specific markup.
+CART_JS = """
+var sel = arguments[0], action = arguments[1], names = arguments[2];
+var count = arguments[3];
+var items = document.querySelectorAll(sel.item);
+var clicked = [], cart = [], seen = {};
+for (var i = 0; i < items.length; i++) {
+  var nameEl = items[i].querySelector(sel.name);
+  var btn = items[i].querySelector(sel.button);
+  if (!nameEl || !btn) { continue; }
+  var name = (nameEl.innerText || nameEl.textContent || "").trim();
+  var inCart = btn.matches(sel.inCart);
+  seen[name] = true;
+  if (inCart) { cart.push(name); }
+  if (action === "read" || inCart !== (action === "remove")) { continue; }
+  if (names ? names.indexOf(name) === -1 : count !== null && clicked.length >= count) {
+    continue;
+  }
+  btn.click();
+  clicked.push(name);
+}
+var badge = document.querySelector(sel.badge);
+return {
+  clicked: clicked,
+  cart: cart,
+  missing: names ? names.filter(function (n) { return !seen[n]; }) : [],
+  badge: badge ? (badge.innerText || badge.textContent || "").trim() : null
+};
+"""
+
+# Health probe of a pooled browser (`DriverPool.is_healthy`).
+PING_JS = "return 1;"
+
+# Runs on the page under test before navigating away, so storage is cleared
+# for the application origin rather than for about:blank.
+CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+# localStorage snapshot and restore (`StorageStateCache`).
+READ_LOCAL_STORAGE_JS = """
+var out = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+  var k = window.localStorage.key(i);
+  out[k] = window.localStorage.getItem(k);
+}
+return out;
+"""
+
+WRITE_LOCAL_STORAGE_JS = """
+var items = arguments[0];
+for (var k in items) { window.localStorage.setItem(k, items[k]); }
+"""
+
+READY_STATE_JS = "return document.readyState;"
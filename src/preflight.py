@@ -0,0 +1,273 @@
+from __future__ import annotations
+import json
+import os
+import pathlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Sequence
+
+from src.stats import percentile
+
+# Requests per route; enough for a p95 that is not just the single slowest call.
+SAMPLES = 3
+# How long a worker waits for another worker's probe before probing itself.
+LOCK_TIMEOUT = 30.0
+POLL_INTERVAL = 0.05
+# Failed results are reused only this long, so a fixed environment is seen
+# by the next run; within a run they still reach every worker.
+FAILURE_TTL = 10.0
+
+
+@dataclass(frozen=True)
+class Probe:
+    """Result of one HTTP request to a route.
+
+    Attributes:
+        route: Path relative to the base URL, e.g. "/inventory.html".
+        status: HTTP status, or None if the request failed.
+        latency: Seconds until the response headers arrived.
+        error: Exception text when the request failed, else "".
+    """
+
+    route: str
+    status: int | None
+    latency: float
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """True unless the request failed or the server answered 5xx."""
+        return not self.error and self.status is not None and self.status < 500
+
+
+@dataclass(frozen=True)
+class PreflightReport:
+    """Probes of one environment and the verdict derived from them.
+
+    Attributes:
+        base_url: Probed base URL.
+        probes: Every request made, in completion order.
+        checked_at: Epoch seconds when the probes finished.
+    """
+
+    base_url: str
+    probes: tuple[Probe, ...]
+    checked_at: float
+
+    @property
+    def failures(self) -> list[Probe]:
+        """Probes that failed or returned 5xx."""
+        return [p for p in self.probes if not p.ok]
+
+    @property
+    def p50(self) -> float:
+        """Median latency of successful probes in seconds."""
+        return percentile([p.latency for p in self.probes if p.ok], 50)
+
+    @property
+    def p95(self) -> float:
+        """95th percentile latency of successful probes in seconds."""
+        return percentile([p.latency for p in self.probes if p.ok], 95)
+
+    def skip_reason(self, max_latency: float) -> str | None:
+        """Why the run should be skipped, or None if the environment is usable.
+
+        Args:
+            max_latency: p95 in seconds above which the environment counts
+                as too slow to test against.
+        """
+        if self.failures:
+            first = self.failures[0]
+            detail = first.error or f"responded with {first.status}"
+            return f"{self.base_url}{first.route} {detail}"
+        if self.p95 > max_latency:
+            return f"{self.base_url} p95 latency {self.p95:.2f}s > {max_latency:.2f}s"
+        return None
+
+    def timeout_scale(self, slow_latency: float, max_scale: float = 3.0) -> float:
+        """Factor for wait timeouts: 1.0 up to `slow_latency`, then p95-proportional.
+
+        Args:
+            slow_latency: p95 in seconds up to which timeouts are left alone.
+            max_scale: Upper bound of the factor.
+        """
+        if slow_latency <= 0 or self.p95 <= slow_latency:
+            return 1.0
+        return min(max_scale, self.p95 / slow_latency)
+
+    def summary(self) -> str:
+        """One-line description for logs and skip messages."""
+        return (
+            f"{len(self.probes)} probes, {len(self.failures)} failed, "
+            f"p50 {self.p50 * 1000:.0f} ms, p95 {self.p95 * 1000:.0f} ms"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "probes": [asdict(p) for p in self.probes],
+            "checked_at": self.checked_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PreflightReport":
+        return cls(
+            data["base_url"],
+            tuple(Probe(**p) for p in data["probes"]),
+            data["checked_at"],
+        )
+
+
+def probe_routes(
+    base_url: str,
+    routes: Sequence[str],
+    samples: int = SAMPLES,
+    timeout: float = 5.0,
+) -> PreflightReport:
+    """Request every route `samples` times concurrently over one pooled session.
+
+    Args:
+        base_url: Base URL of the environment.
+        routes: Paths to probe, e.g. ("/", "/inventory.html").
+        samples: Requests per route.
+        timeout: Per-request timeout in seconds.
+
+    Returns:
+        PreflightReport: All probes of this round.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    base = base_url.rstrip("/")
+    jobs = [f"/{route.lstrip('/')}" for route in routes for _ in range(samples)]
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(jobs))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        def probe(route: str) -> Probe:
+            started = time.perf_counter()
+            try:
+                # Headers are enough to judge health; skip downloading bodies
+                resp = session.get(f"{base}{route}", timeout=timeout, stream=True)
+                resp.close()
+            except Exception as exc:
+                return Probe(route, None, time.perf_counter() - started, str(exc))
+            return Probe(route, resp.status_code, resp.elapsed.total_seconds())
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            probes = tuple(pool.map(probe, jobs))
+    return PreflightReport(base_url, probes, time.time())
+
+
+class PreflightCache:
+    """File-backed preflight results shared by xdist workers and later runs.
+
+    The first process to ask probes while holding a lock file; the others
+    wait for the lock and then read its result. Entries expire after `ttl`
+    seconds (`FAILURE_TTL` for failed probes) and are keyed by base URL and
+    route list.
+
+    Attributes:
+        path: JSON file holding the results.
+        ttl: Lifetime of a result in seconds.
+    """
+
+    def __init__(self, path: str | pathlib.Path, ttl: float = 60.0) -> None:
+        """Initialise the cache.
+
+        Args:
+            path: JSON cache file (created on first store).
+            ttl: Seconds a stored result is reused.
+        """
+        self.path = pathlib.Path(path)
+        self.ttl = ttl
+
+    @property
+    def lock_path(self) -> pathlib.Path:
+        return self.path.with_name(self.path.name + ".lock")
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, data: dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(tmp, self.path)
+
+    def lookup(self, key: str) -> PreflightReport | None:
+        """Return the stored result for `key` if it is younger than `ttl`."""
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        report = PreflightReport.from_dict(entry)
+        ttl = min(self.ttl, FAILURE_TTL) if report.failures else self.ttl
+        return report if time.time() - report.checked_at <= ttl else None
+
+    def get_or_probe(
+        self, key: str, probe: Callable[[], PreflightReport]
+    ) -> PreflightReport:
+        """Return a fresh cached result for `key`, probing under the lock if needed.
+
+        Args:
+            key: Cache key, e.g. base URL plus routes.
+            probe: Called (by one process at a time) when no fresh result exists.
+
+        Returns:
+            PreflightReport: Cached or newly probed result.
+        """
+        report = self.lookup(key)
+        if report is not None:
+            return report
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        locked = self._acquire()
+        try:
+            # Another worker may have probed while we waited
+            report = self.lookup(key)
+            if report is None:
+                report = probe()
+                # Drop expired entries, e.g. from ephemeral --local-app ports
+                now = time.time()
+                data = {
+                    k: v
+                    for k, v in self._load().items()
+                    if now - v.get("checked_at", 0) <= self.ttl
+                }
+                data[key] = report.to_dict()
+                self._store(data)
+            return report
+        finally:
+            if locked:
+                self.lock_path.unlink(missing_ok=True)
+
+    def _acquire(self) -> bool:
+        """Take the lock file; give up (return False) after `LOCK_TIMEOUT`."""
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                pass
+            try:
+                age = time.time() - self.lock_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age > LOCK_TIMEOUT:
+                # Left behind by a crashed process
+                self.lock_path.unlink(missing_ok=True)
+                continue
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+
+
+def cache_key(base_url: str, routes: Sequence[str]) -> str:
+    """Key a result by base URL and the exact route list."""
+    return f"{base_url.rstrip('/')}|{','.join(routes)}"
@@ -0,0 +1,257 @@
+from __future__ import annotations
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+USER_PROPERTY = "resource_stats"
+CACHE_KEY = "e2e/resource-stats"
+
+# Third-party hosts commonly pulled in by demo/staging sites (analytics, tag
+# managers, error reporting, ad networks, web fonts). CDP `setBlockedURLs`
+# only supports wildcard blocking, not "allow first party", so
+# "first-party-only" is approximated with this deny list.
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*optimizely.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*backtrace.io*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+)
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico")
+FONT_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf")
+MEDIA_PATTERNS = ("*.mp4", "*.webm", "*.mp3")
+
+
+def add_logging_prefs(options, **levels: str) -> None:
+    """Merge log levels into the `goog:loggingPrefs` capability of `options`.
+
+    Several features enable Chromium logs (console for failure artifacts,
+    performance for blocked requests); setting the capability outright would
+    drop the levels already requested.
+    """
+    prefs = dict(options.capabilities.get("goog:loggingPrefs") or {})
+    prefs.update(levels)
+    options.set_capability("goog:loggingPrefs", prefs)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Named set of resources the browser should not load.
+
+    Attributes:
+        name: Profile name used on the command line.
+        block_images: Disable image loading through browser preferences.
+        block_fonts: Prefer system fonts over downloaded web fonts. This is a
+            Firefox preference; Chromium has none, so profiles that set it
+            also block `FONT_PATTERNS` in `blocked_urls`.
+        blocked_urls: Wildcard URL patterns blocked via CDP (Chromium only).
+        report: Collect per-test stats even if nothing is blocked, e.g. to
+            record the `none` baseline savings are measured against.
+    """
+
+    name: str
+    block_images: bool = False
+    block_fonts: bool = False
+    blocked_urls: tuple[str, ...] = ()
+    report: bool = False
+
+    @property
+    def active(self) -> bool:
+        """True if the policy blocks anything at all."""
+        return self.block_images or self.block_fonts or bool(self.blocked_urls)
+
+    @property
+    def measured(self) -> bool:
+        """True if per-test stats are collected."""
+        return self.active or self.report
+
+    def apply_to_chrome_options(self, options) -> None:
+        """Add preferences and logging capabilities to `ChromeOptions`."""
+        prefs: dict[str, Any] = {}
+        if self.block_images:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+        if self.measured:
+            # Performance log exposes every request of every page (`collect`)
+            add_logging_prefs(options, performance="ALL")
+
+    def apply_to_firefox_options(self, options) -> None:
+        """Add the equivalent preferences to `FirefoxOptions`.
+
+        Firefox has no CDP URL blocking, so `blocked_urls` is not applied.
+        """
+        if self.block_images:
+            options.set_preference("permissions.default.image", 2)
+        if self.block_fonts:
+            options.set_preference("browser.display.use_document_fonts", 0)
+
+    def activate(self, driver) -> None:
+        """Enable CDP URL blocking on a running Chromium driver."""
+        if not self.blocked_urls or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": list(self.blocked_urls)}
+        )
+
+    def collect(self, driver) -> dict[str, int] | None:
+        """Return request/byte counts since the previous call on `driver`.
+
+        The Chromium performance log is drained on every read, so it holds
+        the requests of every page loaded in between: `requests` and `bytes`
+        count `Network.loadingFinished` events and sum their
+        `encodedDataLength`, `blocked` counts `Network.loadingFailed` events
+        with a `blockedReason`.
+
+        Returns:
+            dict | None: The counts, or None if the driver has no performance
+            log (Firefox).
+        """
+        try:
+            logs = driver.get_log("performance")
+        except Exception:
+            return None
+        stats = {"requests": 0, "bytes": 0, "blocked": 0}
+        for entry in logs:
+            method, params = _network_event(entry)
+            if method == "Network.loadingFinished":
+                stats["requests"] += 1
+                stats["bytes"] += int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats["blocked"] += 1
+        return stats
+
+
+def _network_event(entry: dict[str, Any]) -> tuple[str | None, dict[str, Any]]:
+    """Return the method and params of a performance-log entry."""
+    try:
+        message = json.loads(entry["message"])["message"]
+        return message.get("method"), message.get("params") or {}
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None, {}
+
+
+PROFILES: dict[str, ResourcePolicy] = {
+    "none": ResourcePolicy("none"),
+    "no-images": ResourcePolicy(
+        "no-images", block_images=True, blocked_urls=IMAGE_PATTERNS
+    ),
+    "first-party-only": ResourcePolicy(
+        "first-party-only",
+        block_fonts=True,
+        blocked_urls=THIRD_PARTY_PATTERNS + FONT_PATTERNS,
+    ),
+    "lean": ResourcePolicy(
+        "lean",
+        block_images=True,
+        block_fonts=True,
+        blocked_urls=IMAGE_PATTERNS
+        + FONT_PATTERNS
+        + MEDIA_PATTERNS
+        + THIRD_PARTY_PATTERNS,
+    ),
+}
+
+
+class ResourceReportPlugin:
+    """Aggregate per-test resource stats and print totals at the end of the run.
+
+    Per-test stats are kept in the pytest cache per policy. Savings are the
+    blocked requests plus, for tests that also have stats from a
+    `--resource-policy none` run, the requests and bytes loaded there but
+    not here.
+
+    Attributes:
+        policy: Active policy name.
+        totals: Summed `requests`, `bytes` and `blocked` over all tests.
+        tests: Number of tests that reported stats.
+        per_test: `{nodeid: stats}` of this run.
+        baseline: `{nodeid: stats}` of the last `none` run.
+    """
+
+    def __init__(self, policy: str) -> None:
+        """Initialise with the name of the active policy."""
+        self.policy = policy
+        self.totals = {"requests": 0, "bytes": 0, "blocked": 0}
+        self.tests = 0
+        self.per_test: dict[str, dict[str, int]] = {}
+        self.baseline: dict[str, dict[str, int]] = {}
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        cache = getattr(config, "cache", None)
+        if cache is not None and self.policy != "none":
+            self.baseline = cache.get(f"{CACHE_KEY}/none", {})
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY and value is not None:
+                self.tests += 1
+                self.per_test[report.nodeid] = value
+                for key in self.totals:
+                    self.totals[key] += int(value.get(key, 0))
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        cache = getattr(session.config, "cache", None)
+        if cache is None or hasattr(session.config, "workerinput"):
+            return
+        key = f"{CACHE_KEY}/{self.policy}"
+        cache.set(key, {**cache.get(key, {}), **self.per_test})
+
+    def saved(self) -> dict[str, int]:
+        """Requests and bytes saved against the `none` baseline.
+
+        Returns:
+            dict: `requests`, `bytes` and the number of `tests` compared.
+        """
+        saved = {"requests": 0, "bytes": 0, "tests": 0}
+        for nodeid, stats in self.per_test.items():
+            base = self.baseline.get(nodeid)
+            if base is None:
+                continue
+            saved["tests"] += 1
+            for key in ("requests", "bytes"):
+                saved[key] += max(0, int(base.get(key, 0)) - int(stats.get(key, 0)))
+        return saved
+
+    def summary(self) -> list[str]:
+        """Lines of the terminal summary (empty without stats)."""
+        if not self.tests:
+            return []
+        t = self.totals
+        lines = [
+            f"  {self.tests} tests, {t['requests']} requests loaded, "
+            f"{t['bytes'] / 1024:.1f} KiB transferred"
+        ]
+        if self.policy == "none":
+            lines.append("  recorded as the baseline for other policies")
+            return lines
+        saved = self.saved()
+        line = f"  saved: {t['blocked']} requests blocked"
+        if saved["tests"]:
+            line += (
+                f"; {saved['requests']} requests, {saved['bytes'] / 1024:.1f} KiB "
+                f"fewer than --resource-policy=none ({saved['tests']} tests)"
+            )
+        lines.append(line)
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        lines = self.summary()
+        if not lines:
+            return
+        terminalreporter.write_sep("=", f"resource policy: {self.policy}")
+        for line in lines:
+            terminalreporter.write_line(line)
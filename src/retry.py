@@ -0,0 +1,254 @@
+from __future__ import annotations
+import functools
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from src.timing import describe_step, hookimpl
+
+if TYPE_CHECKING:
+    import pytest
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+USER_PROPERTY = "step_retries"
+
+# Failures that usually pass when the same step is tried again: the DOM was
+# re-rendered under us, an overlay was still fading out, or a wait lost a race.
+TRANSIENT = (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    TimeoutException,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how patiently a failing page-object step is retried.
+
+    Attributes:
+        attempts: Total tries of a step failing with a stale element or an
+            intercepted click.
+        timeout_attempts: Total tries of a step whose wait timed out. Each
+            try already spends a full wait budget, so this is kept lower.
+        backoff: Delay in seconds before the first retry; doubled per retry.
+        max_backoff: Upper bound of a single delay in seconds.
+    """
+
+    attempts: int = 3
+    timeout_attempts: int = 2
+    backoff: float = 0.1
+    max_backoff: float = 1.0
+
+    def allows(self, exc: BaseException, attempt: int) -> bool:
+        """Return True if a step that raised `exc` on try `attempt` may retry."""
+        if isinstance(exc, TimeoutException):
+            return attempt < self.timeout_attempts
+        return attempt < self.attempts
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to sleep after failed try `attempt` (1-based)."""
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+
+class RetryLog:
+    """Collect retried steps of one process.
+
+    A record is a dict with `test`, `step`, `locator`, `error`, `retries`
+    and `recovered` keys, written once per step call that needed a retry.
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty log."""
+        self.current_test: str = ""
+        self.records: list[dict[str, Any]] = []
+
+    def add(
+        self, step: str, locator: str, error: str, retries: int, recovered: bool
+    ) -> None:
+        """Record a step call that was retried `retries` times."""
+        self.records.append(
+            {
+                "test": self.current_test,
+                "step": step,
+                "locator": locator,
+                "error": error,
+                "retries": retries,
+                "recovered": recovered,
+            }
+        )
+
+    def pop_test(self, nodeid: str) -> list[dict[str, Any]]:
+        """Remove and return the records belonging to `nodeid`."""
+        mine = [r for r in self.records if r["test"] == nodeid]
+        self.records = [r for r in self.records if r["test"] != nodeid]
+        return mine
+
+
+# Active policy and log for this process; None keeps `retried` to one check.
+policy: RetryPolicy | None = None
+log = RetryLog()
+# True while a retried step runs, so nested steps (`find_visible` inside
+# `type`) fail straight through to the outermost one instead of multiplying.
+_in_step = False
+
+
+@contextmanager
+def suspended() -> Iterator[None]:
+    """Run a block without in-place retries (e.g. checks expecting a timeout)."""
+    global _in_step
+    outer = _in_step
+    _in_step = True
+    try:
+        yield
+    finally:
+        _in_step = outer
+
+
+def retried(func: F) -> F:
+    """Decorate a page-object step so transient failures are retried in place.
+
+    The step is repeated with the same page object and browser; only the
+    outermost retried step of a call chain retries.
+    """
+    step = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        global _in_step
+        if policy is None or _in_step:
+            return func(self, *args, **kwargs)
+        _in_step = True
+        try:
+            attempt, error = 1, ""
+            while True:
+                try:
+                    result = func(self, *args, **kwargs)
+                except TRANSIENT as exc:
+                    error = type(exc).__name__
+                    if not policy.allows(exc, attempt):
+                        if attempt > 1:
+                            log.add(
+                                step, describe_step(args), error, attempt - 1, False
+                            )
+                        raise
+                    time.sleep(policy.delay(attempt))
+                    attempt += 1
+                    continue
+                if attempt > 1:
+                    log.add(step, describe_step(args), error, attempt - 1, True)
+                return result
+        finally:
+            _in_step = False
+
+    return wrapper  # type: ignore[return-value]
+
+
+def summarize(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregate records per locator, most retried first."""
+    groups: dict[str, dict[str, Any]] = defaultdict(
+        lambda: {"retries": 0, "recovered": 0, "exhausted": 0, "errors": set()}
+    )
+    for r in records:
+        row = groups[r["locator"] or r["step"]]
+        row["retries"] += r["retries"]
+        row["recovered" if r["recovered"] else "exhausted"] += 1
+        row["errors"].add(r["error"])
+    rows = [
+        {"locator": name, **row, "errors": sorted(row["errors"])}
+        for name, row in groups.items()
+    ]
+    return sorted(rows, key=lambda row: row["retries"], reverse=True)
+
+
+class SmartRetryPlugin:
+    """Pytest plugin: retry failing steps in place, rerun the test as a fallback.
+
+    While active, `BasePage` steps decorated with `retried` repeat on a
+    transient failure with exponential backoff, keeping the browser and the
+    logged-in session. Only when a step still fails does the test fail; if
+    pytest-rerunfailures is installed and `--reruns` was not given, such a
+    test is then rerun up to `reruns` times, for transient errors only.
+    Retried steps travel on each test's teardown report (`user_properties`)
+    and are summarised per locator at the end of the run.
+
+    Attributes:
+        policy: In-place retry policy.
+        reruns: Whole-test reruns after in-place retries are exhausted.
+        records: Retried steps collected from all test reports.
+        rerun_tests: Number of whole-test reruns per test id.
+    """
+
+    def __init__(self, policy: RetryPolicy, reruns: int = 1) -> None:
+        """Initialise the plugin.
+
+        Args:
+            policy: In-place retry policy.
+            reruns: Whole-test reruns for tests still failing transiently.
+        """
+        self.policy = policy
+        self.reruns = reruns
+        self.records: list[dict[str, Any]] = []
+        self.rerun_tests: dict[str, int] = defaultdict(int)
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        global policy
+        policy = self.policy
+        option = config.option
+        if (
+            self.reruns
+            and config.pluginmanager.hasplugin("rerunfailures")
+            and getattr(option, "reruns", 0) is None
+            and not config.getini("reruns")
+        ):
+            option.reruns = self.reruns
+            if not option.only_rerun:
+                option.only_rerun = [exc.__name__ for exc in TRANSIENT]
+
+    def pytest_unconfigure(self, config: pytest.Config) -> None:
+        global policy
+        policy = None
+
+    @hookimpl(tryfirst=True)
+    def pytest_runtest_logstart(self, nodeid: str, location) -> None:
+        log.current_test = nodeid
+
+    @hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call) -> None:
+        if call.when == "teardown":
+            item.user_properties.append((USER_PROPERTY, log.pop_test(item.nodeid)))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.outcome == "rerun":
+            self.rerun_tests[report.nodeid] += 1
+            return
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.records.extend(value)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.records and not self.rerun_tests:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "step retries")
+        for row in summarize(self.records):
+            tr.write_line(
+                f"  {row['retries']:4d} retries  {row['recovered']:4d} recovered  "
+                f"{row['exhausted']:4d} exhausted  {row['locator']}  "
+                f"({', '.join(row['errors'])})"
+            )
+        if self.rerun_tests:
+            tr.write_line(
+                f"tests rerun after in-place retries: {len(self.rerun_tests)} "
+                f"({sum(self.rerun_tests.values())} reruns)"
+            )
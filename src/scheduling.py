@@ -0,0 +1,257 @@
+from __future__ import annotations
+import statistics
+from collections import OrderedDict
+from typing import Any, Sequence
+
+import pytest
+
+CACHE_KEY = "e2e/durations"
+USER_PROPERTY = "login_user"
+
+# Weight of the newest run when blending it into the stored duration.
+SMOOTHING = 0.5
+# Estimate for tests without history when nothing else is known.
+DEFAULT_DURATION = 1.0
+
+
+class DurationStore:
+    """Per-test durations and login users persisted in the pytest cache.
+
+    Attributes:
+        entries: `{nodeid: {"duration": float, "user": str | None}}`.
+    """
+
+    def __init__(self, entries: dict[str, dict[str, Any]] | None = None) -> None:
+        """Initialise the store with previously saved entries."""
+        self.entries: dict[str, dict[str, Any]] = dict(entries or {})
+
+    @classmethod
+    def load(cls, config: pytest.Config) -> "DurationStore":
+        """Read the store from `config.cache` (empty if caching is disabled)."""
+        cache = getattr(config, "cache", None)
+        return cls(cache.get(CACHE_KEY, {}) if cache is not None else {})
+
+    def save(self, config: pytest.Config) -> None:
+        """Write the store back to `config.cache`, if caching is enabled."""
+        cache = getattr(config, "cache", None)
+        if cache is not None:
+            cache.set(CACHE_KEY, self.entries)
+
+    def record(self, nodeid: str, duration: float, user: str | None) -> None:
+        """Blend a fresh measurement into the stored estimate."""
+        old = self.entries.get(nodeid)
+        if old is not None:
+            duration = SMOOTHING * duration + (1 - SMOOTHING) * old["duration"]
+        self.entries[nodeid] = {
+            "duration": duration,
+            "user": user if user is not None else (old or {}).get("user"),
+        }
+
+    def estimate(self, nodeids: list[str]) -> dict[str, float]:
+        """Return a duration for every nodeid, using the median for new tests."""
+        known = [e["duration"] for e in self.entries.values()]
+        fallback = statistics.median(known) if known else DEFAULT_DURATION
+        return {
+            n: self.entries[n]["duration"] if n in self.entries else fallback
+            for n in nodeids
+        }
+
+    def user_of(self, nodeid: str) -> str | None:
+        """Return the login user recorded for `nodeid`, if any."""
+        return self.entries.get(nodeid, {}).get("user")
+
+
+def plan_units(
+    nodeids: list[str],
+    durations: dict[str, float],
+    users: dict[str, str | None],
+    workers: int,
+) -> "OrderedDict[str, list[str]]":
+    """Split tests into work units ordered longest first (LPT).
+
+    Tests that share a login user are packed together (first-fit decreasing)
+    into units of at most `total / (2 * workers)` seconds, so a worker keeps
+    reusing the same cached login while no unit grows large enough to
+    unbalance the run. Tests without a user form single-test units.
+
+    Args:
+        nodeids: Collected test ids.
+        durations: Estimated seconds per nodeid.
+        users: Login user per nodeid (None if the test does not log in).
+        workers: Number of xdist workers.
+
+    Returns:
+        OrderedDict[str, list[str]]: Unit key -> nodeids, heaviest unit first.
+    """
+    total = sum(durations[n] for n in nodeids)
+    cap = total / (2 * max(1, workers))
+
+    by_user: dict[str, list[str]] = {}
+    units: dict[str, list[str]] = {}
+    for nodeid in nodeids:
+        user = users.get(nodeid)
+        if user is None:
+            units[nodeid] = [nodeid]
+        else:
+            by_user.setdefault(user, []).append(nodeid)
+
+    for user, members in by_user.items():
+        bins: list[tuple[float, list[str]]] = []
+        for nodeid in sorted(members, key=lambda n: -durations[n]):
+            for i, (load, tests) in enumerate(bins):
+                if load + durations[nodeid] <= cap:
+                    bins[i] = (load + durations[nodeid], tests + [nodeid])
+                    break
+            else:
+                bins.append((durations[nodeid], [nodeid]))
+        for i, (_, tests) in enumerate(bins):
+            units[f"user:{user}#{i}"] = tests
+
+    ordered = sorted(units.items(), key=lambda kv: -sum(durations[n] for n in kv[1]))
+    return OrderedDict(ordered)
+
+
+def browser_of(nodeid: str, browsers: Sequence[str]) -> str | None:
+    """Return the matrix browser in a nodeid's parameter id, e.g. `t[firefox]`.
+
+    pytest joins parameter ids with "-", and browser names may contain "-"
+    themselves (`fake-chrome`), so a browser matches a whole run of
+    segments; longer names are tried first so `chrome` does not claim
+    `fake-chrome`.
+    """
+    if not browsers or not nodeid.endswith("]") or "[" not in nodeid:
+        return None
+    params = f"-{nodeid[nodeid.rindex('[') + 1 : -1]}-"
+    return next(
+        (b for b in sorted(browsers, key=len, reverse=True) if f"-{b}-" in params),
+        None,
+    )
+
+
+def _worker_index(node) -> int:
+    """Numeric index of an xdist worker controller ("gw3" -> 3)."""
+    worker = str(getattr(getattr(node, "gateway", None), "id", ""))
+    return int(worker[2:]) if worker[2:].isdigit() else 0
+
+
+def make_scheduler(
+    config: pytest.Config,
+    log,
+    store: DurationStore | None,
+    browsers: Sequence[str] = (),
+):
+    """Build an xdist scheduler for duration-aware and/or browser-matrix runs.
+
+    Built on `LoadScopeScheduling`: a unit is a "scope". With a `store`, the
+    units come from `plan_units()` and the work queue is re-ordered by
+    estimated unit duration before the first unit is handed out, so idle
+    workers always pull the heaviest remaining unit. Without one, every test
+    is its own unit.
+
+    With `browsers`, units never mix browsers and worker `gwN` serves
+    `browsers[N % len(browsers)]` first, so it keeps one warm browser type;
+    it only takes other browsers' units once its own queue is empty.
+    """
+    from xdist.scheduler import LoadScopeScheduling
+
+    class DurationScheduling(LoadScopeScheduling):
+        def __init__(self, config: pytest.Config, log=None) -> None:
+            super().__init__(config, log)
+            self._unit_of: dict[str, str] | None = None
+            self._weights: dict[str, float] = {}
+            self._browser_of_unit: dict[str, str | None] = {}
+
+        def _plan(self) -> dict[str, str]:
+            nodeids = list(self.collection or [])
+            if store is None:
+                unit_of = {n: n for n in nodeids}
+            else:
+                durations = store.estimate(nodeids)
+                users = {n: store.user_of(n) for n in nodeids}
+                if browsers:
+                    # Group logins per browser: a unit must not mix browsers
+                    users = {
+                        n: f"{u}@{browser_of(n, browsers)}" if u else None
+                        for n, u in users.items()
+                    }
+                units = plan_units(nodeids, durations, users, len(self.nodes))
+                self._weights = {
+                    key: sum(durations[n] for n in tests)
+                    for key, tests in units.items()
+                }
+                unit_of = {n: key for key, tests in units.items() for n in tests}
+            for nodeid, unit in unit_of.items():
+                self._browser_of_unit[unit] = browser_of(nodeid, browsers)
+            return unit_of
+
+        def _split_scope(self, nodeid: str) -> str:
+            if self._unit_of is None:
+                self._unit_of = self._plan()
+            return self._unit_of.get(nodeid, nodeid)
+
+        def _assign_work_unit(self, node) -> None:
+            if self._weights:
+                self.workqueue = OrderedDict(
+                    sorted(
+                        self.workqueue.items(),
+                        key=lambda kv: -self._weights.get(kv[0], 0.0),
+                    )
+                )
+                self._weights = {}
+            if browsers:
+                wanted = browsers[_worker_index(node) % len(browsers)]
+                for unit in self.workqueue:
+                    if self._browser_of_unit.get(unit) == wanted:
+                        self.workqueue.move_to_end(unit, last=False)
+                        break
+            super()._assign_work_unit(node)
+
+    return DurationScheduling(config, log)
+
+
+class DurationSchedulingPlugin:
+    """Record per-test durations and schedule xdist runs longest-first.
+
+    Durations (setup + call + teardown) and the `login` user of each test are
+    read from reports on the controller and saved to the pytest cache at the
+    end of the session, so every run improves the next run's estimates.
+
+    Attributes:
+        browsers: Browser matrix of the run, empty for single-browser runs.
+        store: Durations loaded at configure time and updated during the run.
+    """
+
+    def __init__(self, browsers: Sequence[str] = ()) -> None:
+        """Initialise the plugin with an empty store.
+
+        Args:
+            browsers: Browser matrix of the run (see `make_scheduler`).
+        """
+        self.browsers = tuple(browsers)
+        self.store = DurationStore()
+        self._current: dict[str, float] = {}
+        self._users: dict[str, str] = {}
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        self.store = DurationStore.load(config)
+
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config: pytest.Config, log):
+        if config.getvalue("dist") == "each":
+            return None
+        return make_scheduler(config, log, self.store, self.browsers)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        self._current[report.nodeid] = (
+            self._current.get(report.nodeid, 0.0) + report.duration
+        )
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self._users[report.nodeid] = value
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(session.config, "workerinput"):
+            return
+        for nodeid, duration in self._current.items():
+            self.store.record(nodeid, duration, self._users.get(nodeid))
+        self.store.save(session.config)
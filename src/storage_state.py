@@ -0,0 +1,132 @@
+from __future__ import annotations
+import time
+from typing import Any
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.pages.scripts import (
+    READ_LOCAL_STORAGE_JS,
+    READY_STATE_JS,
+    WRITE_LOCAL_STORAGE_JS,
+)
+
+
+class StorageStateCache:
+    """In-process cache of authenticated browser state keyed by `(base_url, user)`.
+
+    The first test for a user logs in through the UI and `capture()`s the
+    session cookies and localStorage. Later tests `restore()` that state
+    into a fresh (or pooled) browser instead of driving the login form.
+
+    Attributes:
+        ttl: Maximum age of a snapshot in seconds before it is considered stale.
+        ready_timeout: Seconds `restore()` waits for `base_url` to be parsed.
+    """
+
+    def __init__(self, ttl: float = 600, ready_timeout: float = 10) -> None:
+        """Initialise an empty cache.
+
+        Args:
+            ttl: Snapshot lifetime in seconds.
+            ready_timeout: Seconds `restore()` waits for the document to
+                leave the "loading" state.
+        """
+        self.ttl = ttl
+        self.ready_timeout = ready_timeout
+        self._states: dict[tuple[str, str], dict[str, Any]] = {}
+
+    @staticmethod
+    def capture(driver: WebDriver) -> dict[str, Any]:
+        """Snapshot cookies and localStorage of the current page's origin.
+
+        Args:
+            driver: Driver positioned on an authenticated page.
+
+        Returns:
+            dict: State with `cookies`, `local_storage` and `captured_at` keys.
+        """
+        return {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(READ_LOCAL_STORAGE_JS) or {},
+            "captured_at": time.time(),
+        }
+
+    def save(self, base_url: str, user: str, state: dict[str, Any]) -> None:
+        """Store a snapshot for `(base_url, user)`."""
+        self._states[(base_url.rstrip("/"), user)] = state
+
+    def get(self, base_url: str, user: str) -> dict[str, Any] | None:
+        """Return a still-valid snapshot, dropping it if it went stale.
+
+        Args:
+            base_url: Application base URL.
+            user: Username the snapshot was captured for.
+
+        Returns:
+            dict | None: Snapshot, or None if missing or stale.
+        """
+        key = (base_url.rstrip("/"), user)
+        state = self._states.get(key)
+        if state is None:
+            return None
+        if not self.is_valid(state):
+            self._states.pop(key, None)
+            return None
+        return state
+
+    def invalidate(self, base_url: str, user: str) -> None:
+        """Forget the snapshot for `(base_url, user)`, e.g. after a failed restore."""
+        self._states.pop((base_url.rstrip("/"), user), None)
+
+    def is_valid(self, state: dict[str, Any], now: float | None = None) -> bool:
+        """Check snapshot age and cookie expiry.
+
+        Args:
+            state: Snapshot produced by `capture()`.
+            now: Current epoch time (defaults to `time.time()`).
+
+        Returns:
+            bool: False if the snapshot is older than `ttl`, has no cookies,
+            or any cookie has already expired.
+        """
+        now = time.time() if now is None else now
+        if now - state.get("captured_at", 0) > self.ttl:
+            return False
+        cookies = state.get("cookies") or []
+        if not cookies:
+            return False
+        return all(c.get("expiry") is None or c["expiry"] > now for c in cookies)
+
+    def restore(self, driver: WebDriver, base_url: str, user: str) -> bool:
+        """Load a cached snapshot into `driver`.
+
+        Navigates to `base_url` first because cookies and localStorage can
+        only be written for the origin currently loaded. With the "eager" or
+        "none" page-load strategy `driver.get` may return before that origin
+        is committed, so writes wait until `document.readyState` is past
+        "loading".
+
+        Args:
+            driver: Target driver.
+            base_url: Application base URL.
+            user: Username to restore.
+
+        Returns:
+            bool: True if a snapshot was applied, False if none was usable.
+        """
+        state = self.get(base_url, user)
+        if state is None:
+            return False
+        try:
+            driver.get(base_url)
+            WebDriverWait(driver, self.ready_timeout, poll_frequency=0.05).until(
+                lambda d: d.execute_script(READY_STATE_JS) != "loading"
+            )
+            for cookie in state["cookies"]:
+                driver.add_cookie(cookie)
+            if state["local_storage"]:
+                driver.execute_script(WRITE_LOCAL_STORAGE_JS, state["local_storage"])
+        except Exception:
+            self.invalidate(base_url, user)
+            return False
+        return True
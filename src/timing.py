@@ -0,0 +1,243 @@
+from __future__ import annotations
+import csv
+import functools
+import json
+import pathlib
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+import pluggy
+
+if TYPE_CHECKING:
+    import pytest
+
+# Same marker as `pytest.hookimpl`; page objects import this module, and
+# importing pytest itself would make every page-object import pay for it.
+hookimpl = pluggy.HookimplMarker("pytest")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+USER_PROPERTY = "step_timings"
+
+
+class StepRecorder:
+    """Collect timings of page-object steps and fixture phases for one process.
+
+    Steps are recorded as dicts with `test`, `step`, `detail`, `depth` and
+    `duration` keys. `depth` is 0 for outermost steps, so nested helpers
+    (e.g. `find_visible` inside `type`) are visible without being counted
+    twice in per-test totals.
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty recorder."""
+        self.current_test: str = ""
+        self.records: list[dict[str, Any]] = []
+        self._depth = 0
+
+    @contextmanager
+    def span(self, step: str, detail: str = "") -> Iterator[None]:
+        """Time the enclosed block as `step`.
+
+        Args:
+            step: Step name, e.g. "BasePage.click" or "driver.setup".
+            detail: Locator, path or other qualifier.
+        """
+        depth = self._depth
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.records.append(
+                {
+                    "test": self.current_test,
+                    "step": step,
+                    "detail": detail,
+                    "depth": depth,
+                    "duration": time.perf_counter() - started,
+                }
+            )
+
+    def pop_test(self, nodeid: str) -> list[dict[str, Any]]:
+        """Remove and return the records belonging to `nodeid`."""
+        mine = [r for r in self.records if r["test"] == nodeid]
+        self.records = [r for r in self.records if r["test"] != nodeid]
+        return mine
+
+
+# Active recorder for this process; None keeps `timed` down to one check.
+recorder: StepRecorder | None = None
+
+
+@contextmanager
+def span(step: str, detail: str = "") -> Iterator[None]:
+    """Time a block with the active recorder, or do nothing when disabled."""
+    if recorder is None:
+        yield
+        return
+    with recorder.span(step, detail):
+        yield
+
+
+def describe_step(args: tuple) -> str:
+    """Render the locator (or path) part of a page-object call."""
+    if len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        return f"{args[0]}={args[1]}"
+    if args and isinstance(args[0], str):
+        return args[0]
+    return ""
+
+
+def timed(func: F) -> F:
+    """Decorate a page-object method so calls are recorded while timing is on."""
+    step = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if recorder is None:
+            return func(self, *args, **kwargs)
+        with recorder.span(step, describe_step(args)):
+            return func(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def summarize(records: list[dict[str, Any]], key: str) -> list[dict[str, Any]]:
+    """Aggregate records by `key` ("step" or "detail"), slowest total first."""
+    groups: dict[str, list[float]] = defaultdict(list)
+    for r in records:
+        if r[key]:
+            groups[r[key]].append(r["duration"])
+    rows = [
+        {
+            key: name,
+            "calls": len(durations),
+            "total": sum(durations),
+            "max": max(durations),
+        }
+        for name, durations in groups.items()
+    ]
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def write_records(records: list[dict[str, Any]], path: pathlib.Path) -> None:
+    """Write records as CSV when `path` ends with `.csv`, JSON otherwise."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".csv":
+        with path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(
+                fh, fieldnames=["test", "step", "detail", "depth", "duration"]
+            )
+            writer.writeheader()
+            writer.writerows(records)
+        return
+    payload = {
+        "records": records,
+        "by_step": summarize(records, "step"),
+        "by_locator": summarize(records, "detail"),
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+class StepTimingPlugin:
+    """Pytest plugin that wires a `StepRecorder` into the test lifecycle.
+
+    Each test's records travel on its teardown report (`user_properties`), so
+    the controller aggregates them the same way with or without pytest-xdist.
+
+    Attributes:
+        output: Optional JSON/CSV file written at session end.
+        top: Number of rows shown in the terminal summary.
+        records: Records collected from all test reports.
+    """
+
+    def __init__(self, output: str | None = None, top: int = 10) -> None:
+        """Initialise the plugin.
+
+        Args:
+            output: Path of the JSON or CSV file to write, if any.
+            top: Number of slowest steps/locators shown in the summary.
+        """
+        self.output = pathlib.Path(output) if output else None
+        self.top = top
+        self.records: list[dict[str, Any]] = []
+        self.recorder = StepRecorder()
+
+    def pytest_configure(self, config: pytest.Config) -> None:
+        global recorder
+        recorder = self.recorder
+
+    def pytest_unconfigure(self, config: pytest.Config) -> None:
+        global recorder
+        recorder = None
+
+    @hookimpl(tryfirst=True)
+    def pytest_runtest_logstart(self, nodeid: str, location) -> None:
+        self.recorder.current_test = nodeid
+
+    @hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call):
+        if call.when == "teardown":
+            mine = self.recorder.pop_test(item.nodeid)
+            item.user_properties.append((USER_PROPERTY, mine))
+            if mine:
+                _attach_to_reports(mine)
+        outcome = yield
+        if call.when == "teardown":
+            props = dict(item.user_properties)
+            _add_html_extra(outcome.get_result(), props.get(USER_PROPERTY) or [])
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.records.extend(value)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self.output and not hasattr(session.config, "workerinput"):
+            write_records(self.records, self.output)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.records:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "step timings")
+        for key, title in (("step", "slowest steps"), ("detail", "slowest locators")):
+            tr.write_line(f"{title}:")
+            for row in summarize(self.records, key)[: self.top]:
+                tr.write_line(
+                    f"  {row['total']:8.3f}s total  {row['max']:7.3f}s max  "
+                    f"{row['calls']:5d}x  {row[key]}"
+                )
+        if self.output:
+            tr.write_line(f"step timings written to {self.output}")
+
+
+def _attach_to_reports(records: list[dict[str, Any]]) -> None:
+    """Attach a test's step timings to Allure if allure-pytest is installed."""
+    try:
+        import allure
+    except ImportError:
+        return
+    allure.attach(
+        json.dumps(records, indent=2),
+        name="step timings",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+def _add_html_extra(rep: pytest.TestReport, records: list[dict[str, Any]]) -> None:
+    """Add step timings as a pytest-html JSON extra, if pytest-html is installed."""
+    if not records:
+        return
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    rep.extras = getattr(rep, "extras", [])
+    rep.extras.append(extras.json(records, name="step timings"))
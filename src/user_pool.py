@@ -0,0 +1,214 @@
+from __future__ import annotations
+import json
+import os
+import pathlib
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Poll interval while waiting for a lease when every slot is taken.
+POLL_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class PoolUser:
+    """Account that can be leased from a `UserPool`.
+
+    Attributes:
+        name: Username.
+        password: Password.
+        weight: Concurrent leases the account tolerates (slots); accounts
+            are handed out one per lease until every account is busy, and
+            only then shared up to `weight`.
+        tags: Labels tests can ask for, e.g. "admin" or "cart".
+    """
+
+    name: str
+    password: str
+    weight: int = 1
+    tags: frozenset[str] = field(default_factory=frozenset)
+
+
+def users_from_settings(
+    users: dict[str, str], meta: dict[str, dict[str, Any]]
+) -> list[PoolUser]:
+    """Combine credentials with optional per-user `weight`/`tags` metadata.
+
+    Args:
+        users: `{username: password}` (e.g. `settings.e2e_users`).
+        meta: `{username: {"weight": int, "tags": [str, ...]}}`.
+
+    Returns:
+        list[PoolUser]: One entry per user, in the order of `users`.
+    """
+    out = []
+    for name, password in users.items():
+        info = meta.get(name, {})
+        out.append(
+            PoolUser(
+                name,
+                password,
+                weight=max(1, int(info.get("weight", 1))),
+                tags=frozenset(str(t) for t in info.get("tags", ())),
+            )
+        )
+    return out
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Lease:
+    """Exclusive hold on one slot of a pooled account.
+
+    Attributes:
+        user: Leased account.
+        path: Lock file backing the lease.
+    """
+
+    def __init__(self, user: PoolUser, path: pathlib.Path) -> None:
+        """Wrap an acquired lock file."""
+        self.user = user
+        self.path = path
+        self.released = False
+
+    def release(self) -> None:
+        """Give the slot back (idempotent)."""
+        if not self.released:
+            self.released = True
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "Lease":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class UserPool:
+    """Lease distinct accounts to parallel workers using lock files.
+
+    Each account has `weight` slots; a slot is a lock file created with
+    `O_EXCL` in `lock_dir`, so leases are exclusive across processes
+    (xdist workers, or separate runs sharing the directory). Locks left by
+    dead processes on this host are reclaimed. When every matching slot is
+    taken, `acquire()` queues until one frees up or `timeout` expires.
+
+    Attributes:
+        users: Accounts in the pool.
+        lock_dir: Directory shared by every process using the pool.
+        timeout: Seconds `acquire()` waits for a free slot.
+    """
+
+    def __init__(
+        self,
+        users: Iterable[PoolUser],
+        lock_dir: str | pathlib.Path,
+        timeout: float = 300.0,
+    ) -> None:
+        """Initialise the pool.
+
+        Args:
+            users: Accounts to lease.
+            lock_dir: Lock directory (created if missing).
+            timeout: Seconds to wait for a free slot before giving up.
+        """
+        self.users = list(users)
+        self.lock_dir = pathlib.Path(lock_dir)
+        self.timeout = timeout
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def candidates(self, tags: Iterable[str] = ()) -> list[PoolUser]:
+        """Return the accounts carrying every tag in `tags`."""
+        wanted = set(tags)
+        return [u for u in self.users if wanted <= u.tags]
+
+    def acquire(
+        self, tags: Iterable[str] = (), owner: str = "", prefer: int = 0
+    ) -> Lease:
+        """Lease a slot, waiting while the pool is exhausted.
+
+        Free accounts are preferred over sharing a busy one; among equally
+        loaded accounts the search starts at index `prefer`, so workers
+        passing their index tend to get different accounts.
+
+        Args:
+            tags: Required tags.
+            owner: Free-form label stored in the lock (e.g. a test id).
+            prefer: Rotation offset, e.g. the xdist worker number.
+
+        Returns:
+            Lease: The acquired lease; release it when done.
+
+        Raises:
+            LookupError: If no account carries the requested tags.
+            TimeoutError: If no slot became free within `timeout`.
+        """
+        users = self.candidates(tags)
+        if not users:
+            raise LookupError(f"No pooled user has tags {sorted(tags)}")
+        start = prefer % len(users)
+        order = users[start:] + users[:start]
+        deadline = time.monotonic() + self.timeout
+        while True:
+            for slot in range(max(u.weight for u in order)):
+                for user in order:
+                    if slot < user.weight:
+                        lease = self._try_lock(user, slot, owner)
+                        if lease is not None:
+                            return lease
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No pooled user with tags {sorted(tags)} became free "
+                    f"within {self.timeout}s"
+                )
+            time.sleep(POLL_INTERVAL)
+
+    def _try_lock(self, user: PoolUser, slot: int, owner: str) -> Lease | None:
+        path = self.lock_dir / f"{user.name}.{slot}.lock"
+        info = {
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "owner": owner,
+            "since": time.time(),
+        }
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._reclaim_stale(path):
+                    return None
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(info, fh)
+            return Lease(user, path)
+        return None
+
+    @staticmethod
+    def _reclaim_stale(path: pathlib.Path) -> bool:
+        """Remove a lock whose owning process on this host has died."""
+        try:
+            info = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError):
+            # Being written right now, or unreadable: treat as held
+            return False
+        if info.get("host") != socket.gethostname() or _pid_alive(info.get("pid", 0)):
+            return False
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        return True
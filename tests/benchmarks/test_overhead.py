@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+import pathlib
+import pytest
+from selenium.webdriver.common.by import By
+
+from src.browser_profile import BrowserProfile
+from src.driver_pool import DriverPool
+from src.fake_driver import FakeDriver, demo_site
+from src.pages.base_page import BasePage
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+URL = "http://stub.local"
+
+
+class StubElement:
+    text = "1"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *value):
+        pass
+
+
+class StubDriver:
+    """Answers every WebDriver call instantly, so only our own overhead is timed."""
+
+    def __init__(self, *args, **kwargs):
+        self.el = StubElement()
+
+    def find_element(self, by, value):
+        return self.el
+
+    def find_elements(self, by, value):
+        return [self.el]
+
+    def execute_script(self, script, *args):
+        if args and isinstance(args[0], list):
+            return [
+                {"count": 1, "visible": True, "text": "1", "attributes": {}}
+                for _ in args[0]
+            ]
+        return 1
+
+    def get(self, url):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        pass
+
+
+def test_driver_creation_overhead(benchmark, monkeypatch):
+    monkeypatch.setattr("selenium.webdriver.Chrome", StubDriver)
+    monkeypatch.setattr("selenium.webdriver.Firefox", StubDriver)
+    chrome = BrowserProfile("chrome", headless=True)
+    firefox = BrowserProfile("firefox", headless=True)
+    benchmark("driver.create.chrome", chrome.launch)
+    benchmark("driver.create.firefox", firefox.launch)
+
+
+def test_driver_pool_cycle(benchmark):
+    pool = DriverPool(StubDriver, max_uses=10**9)
+
+    def cycle():
+        pool.release(pool.acquire())
+
+    benchmark("driver_pool.acquire_release", cycle, rounds=200)
+
+
+def test_login_flow(benchmark):
+    drv = StubDriver()
+    login = LoginPage(drv, URL)
+    inventory = InventoryPage(drv, URL)
+
+    def flow():
+        login.open_login()
+        login.login_as("standard_user", "secret_sauce")
+        assert inventory.is_loaded()
+
+    benchmark("login.ui_flow", flow, rounds=200)
+
+
+def test_login_flow_on_fake_driver(benchmark):
+    drv = FakeDriver(demo_site({"standard_user": "secret_sauce"}))
+    login = LoginPage(drv, URL)
+    inventory = InventoryPage(drv, URL)
+
+    def flow():
+        drv.delete_all_cookies()
+        login.open_login()
+        login.login_as("standard_user", "secret_sauce")
+        assert inventory.is_loaded()
+
+    benchmark("login.fake_driver_flow", flow, rounds=200)
+
+
+@pytest.mark.parametrize(
+    "helper, args",
+    [
+        ("find", (By.ID, "x")),
+        ("find_visible", (By.ID, "x")),
+        ("click", (By.ID, "x")),
+        ("type", (By.ID, "x", "text")),
+        ("text_of", (By.ID, "x")),
+        ("exists", (By.ID, "x")),
+        ("is_present", (By.ID, "x")),
+        ("query", ((By.ID, "x"), (By.ID, "y"))),
+    ],
+)
+def test_base_page_helpers(benchmark, helper, args):
+    page = BasePage(StubDriver(), URL)
+    method = getattr(page, helper)
+    benchmark(f"base_page.{helper}", lambda: method(*args), rounds=500)
+
+
+def test_pytest_collection_startup(benchmark):
+    env = dict(os.environ, SKIP_PRERUN_CHECK="true")
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "--collect-only",
+        "-q",
+        "-p",
+        "no:cacheprovider",
+    ]
+
+    def collect():
+        subprocess.run(
+            cmd + ["tests/unit"], cwd=ROOT, env=env, check=True, capture_output=True
+        )
+
+    benchmark("pytest.collect_unit", collect, rounds=3)
@@ -17,3 +17,16 @@ def test_add_item_to_cart_updates_badge(pages):
     # Add first item
     pages.inventory.add_first_item_to_cart()
     assert pages.inventory.cart_count() == 1, "Cart badge did not update to 1"
+
+
+@pytest.mark.usefixtures("login")
+@pytest.mark.e2e
+@pytest.mark.regression
+def test_bulk_add_and_remove_updates_badge(pages):
+    added = pages.inventory.add_items_to_cart(count=3)
+    assert pages.inventory.cart_contents() == added
+    assert pages.inventory.cart_count() == 3
+
+    pages.inventory.remove_items_from_cart(added[:2])
+    assert pages.inventory.cart_contents() == added[2:]
+    assert pages.inventory.cart_count() == 1
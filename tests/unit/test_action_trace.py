@@ -0,0 +1,143 @@
+import gzip
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from src.action_trace import (
+    ReplayDriver,
+    TraceMismatch,
+    TracePlugin,
+    TraceRecorder,
+    load_trace,
+    recording_driver,
+    trace_path,
+)
+from src.fake_driver import FakeDriver, FakeElement, demo_site
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+
+URL = "https://shop.test"
+USERS = {"standard_user": "secret_sauce"}
+
+
+def record(flow, tmp_path, base_url=URL):
+    recorder = TraceRecorder(base_url)
+    flow(recording_driver(FakeDriver(demo_site(USERS)), recorder), base_url)
+    path = trace_path(tmp_path, "tests/e2e/test_x.py::test_flow[chrome]")
+    recorder.save(path, "tests/e2e/test_x.py::test_flow[chrome]")
+    return recorder, load_trace(path)
+
+
+def login(drv, base_url, password="secret_sauce"):
+    login_page = LoginPage(drv, base_url, default_timeout=1, absence_timeout=0)
+    login_page.open_login()
+    login_page.login_as("standard_user", password)
+    if password != "secret_sauce":
+        return login_page.error_message()
+    return InventoryPage(drv, base_url, default_timeout=1).is_loaded()
+
+
+def test_trace_path_is_a_safe_file_name(tmp_path):
+    path = trace_path(tmp_path, "tests/e2e/test_x.py::test_flow[chrome]")
+    assert path.parent == tmp_path
+    assert path.name == "tests_e2e_test_x.py_test_flow_chrome_.json.gz"
+
+
+def test_recorded_flow_replays_without_a_browser(tmp_path):
+    _, trace = record(login, tmp_path)
+    drv = ReplayDriver(trace, "http://127.0.0.1:8000")
+
+    assert login(drv, "http://127.0.0.1:8000") is True
+    assert drv.mismatches == []
+
+
+def test_typed_text_is_not_stored(tmp_path):
+    recorder, _ = record(login, tmp_path)
+    typed = [e[3] for e in recorder.entries.values() if e[2] == "send_keys"]
+
+    assert len(typed) == 2
+    assert "secret_sauce" not in str(recorder.entries)
+    assert all(set(args[0]) == {"$sha"} for args in typed)
+
+
+def test_recorded_errors_replay_as_the_same_exception(tmp_path):
+    _, trace = record(lambda d, u: login(d, u, password="nope"), tmp_path)
+    drv = ReplayDriver(trace, URL)
+
+    assert "Epic sadface" in login(drv, URL, password="nope")
+    assert drv.mismatches == []
+
+
+def test_polls_within_a_step_keep_only_the_last_response():
+    fake = FakeDriver(demo_site(USERS))
+    recorder = TraceRecorder(URL)
+    drv = recording_driver(fake, recorder)
+    drv.get(URL + "/")
+    for _ in range(3):
+        with pytest.raises(NoSuchElementException):
+            drv.find_element(By.ID, "late")
+    fake.document.append(FakeElement("div", id="late", text="here"))
+    assert drv.find_element(By.ID, "late").text == "here"
+
+    finds = [e for e in recorder.entries.values() if e[2] == "find_element"]
+    assert len(finds) == 1
+    assert finds[0][4] == {"value": {"$el": "e1"}}
+    replay = ReplayDriver({"entries": list(recorder.entries.values())}, URL)
+    replay.get(URL + "/")
+    assert replay.find_element(By.ID, "late").text == "here"
+
+
+def test_base_url_and_long_scripts_are_normalised():
+    fake = FakeDriver(demo_site(USERS), scripts={"x" * 200: lambda d: 1})
+    recorder = TraceRecorder(URL)
+    drv = recording_driver(fake, recorder)
+    drv.get(URL + "/inventory.html")
+    drv.execute_script("x" * 200)
+
+    (get, script) = recorder.entries.values()
+    assert get[3] == ["{base_url}/inventory.html"]
+    assert set(script[3][0]) == {"$sha"}
+
+
+def test_diverging_replay_raises_and_records_mismatch(tmp_path):
+    _, trace = record(login, tmp_path)
+    drv = ReplayDriver(trace, URL)
+    drv.get(URL + "/")
+
+    with pytest.raises(TraceMismatch, match="find_element"):
+        drv.find_element(By.ID, "not-in-trace")
+    assert len(drv.mismatches) == 1
+
+
+def test_missing_or_outdated_trace_loads_as_none(tmp_path):
+    assert load_trace(tmp_path / "missing.json.gz") is None
+    recorder = TraceRecorder(URL)
+    path = tmp_path / "t.json.gz"
+    recorder.save(path, "t")
+    assert load_trace(path)["entries"] == []
+    with gzip.open(path, "wt") as fh:
+        json.dump({"version": 0, "entries": []}, fh)
+    assert load_trace(path) is None
+
+
+def test_plugin_fails_passed_test_with_swallowed_mismatch():
+    plugin = TracePlugin("replay", "traces")
+    drv = ReplayDriver({"entries": []}, URL)
+    drv.mismatches.append("step 0: driver.title was not recorded")
+    item = MagicMock(funcargs={"driver": drv})
+    rep = MagicMock(when="call", passed=True, user_properties=[])
+    outcome = MagicMock()
+    outcome.get_result.return_value = rep
+
+    hook = plugin.pytest_runtest_makereport(item, MagicMock())
+    next(hook)
+    with pytest.raises(StopIteration):
+        hook.send(outcome)
+    plugin.pytest_runtest_logreport(rep)
+
+    assert rep.outcome == "failed"
+    assert "driver.title" in rep.longrepr
+    assert (plugin.tests, plugin.mismatched) == (1, 1)
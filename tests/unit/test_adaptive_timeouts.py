@@ -0,0 +1,166 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from src import adaptive_timeouts
+from src.adaptive_timeouts import (
+    MIN_SAMPLES,
+    WINDOW,
+    AdaptiveTimeoutPlugin,
+    LatencyStore,
+    latency_scope,
+    locator_name,
+)
+from src.action_trace import ReplayDriver, TraceRecorder, recording_driver
+from src.fake_driver import FakeDriver, demo_site
+from src.pages.base_page import BasePage
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+
+URL = "https://shop.test"
+SCOPE = f"chrome {URL}"
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = LatencyStore(factor=3.0, min_timeout=0.1, max_timeout=30.0)
+    monkeypatch.setattr(adaptive_timeouts, "store", store)
+    monkeypatch.setattr(adaptive_timeouts, "observed", [])
+    return store
+
+
+def test_no_timeout_without_enough_samples():
+    store = LatencyStore({"a": [0.5] * (MIN_SAMPLES - 1)})
+    assert store.timeout_for("a", 10) == 10
+    assert store.timeout_for("b", 10) == 10
+
+
+def test_timeout_is_percentile_times_factor_within_bounds():
+    store = LatencyStore(factor=3.0, min_timeout=1.0, max_timeout=30.0)
+    for seconds in [0.5] * 19 + [2.0]:
+        store.record("a", seconds)
+    for _ in range(MIN_SAMPLES):
+        store.record("fast", 0.01)
+        store.record("slow", 20.0)
+
+    assert store.timeout_for("a", 10) == 1.5
+    assert store.timeout_for("fast", 10) == 1.0
+    assert store.timeout_for("slow", 10) == 30.0
+
+
+def test_record_keeps_a_sliding_window():
+    store = LatencyStore()
+    for i in range(WINDOW + 10):
+        store.record("a", i)
+
+    assert len(store.samples["a"]) == WINDOW
+    assert store.samples["a"][0] == 10
+
+
+def test_locators_are_named_after_page_attributes():
+    assert locator_name(LoginPage, *LoginPage.LOGIN_BTN) == "LoginPage.LOGIN_BTN"
+    assert locator_name(InventoryPage, *InventoryPage.TITLE) == "InventoryPage.TITLE"
+    assert locator_name(BasePage, "id", "x") == "id=x"
+
+
+def test_waits_record_latency_and_use_learned_timeout(store):
+    drv = FakeDriver(demo_site({"u": "p"}))
+    page = LoginPage(drv, URL, default_timeout=10, latency_scope=SCOPE)
+    page.open_login()
+    for _ in range(MIN_SAMPLES):
+        store.record(f"{SCOPE} LoginPage.ERROR", 0.01)
+
+    with pytest.raises(TimeoutException):
+        page.find(*page.ERROR)
+
+    assert page.default_timeout == 10
+    assert page.wait._timeout == 10
+    page.find_visible(*page.USERNAME)
+    # Only successful waits teach anything
+    assert [name for name, _ in adaptive_timeouts.observed] == [
+        f"{SCOPE} LoginPage.USERNAME"
+    ]
+
+
+def test_learned_timeout_reaches_the_wait(store):
+    page = BasePage(MagicMock(), URL, default_timeout=10, latency_scope=SCOPE)
+    seen = []
+    page._set_timeout = lambda t: seen.append(t) or 10
+    for _ in range(MIN_SAMPLES):
+        store.record(f"{SCOPE} id=x", 0.5)
+
+    page.wait.until = MagicMock()
+    page.find("id", "x")
+
+    assert seen == [1.5, 10]
+
+
+def test_learned_timeout_keeps_the_page_timeout_scale(store):
+    # e.g. a slow preflight (x2) or replay (x0.01) scaled the page's timeouts
+    page = BasePage(
+        MagicMock(), URL, default_timeout=20, timeout_scale=2.0, latency_scope=SCOPE
+    )
+    seen = []
+    page._set_timeout = lambda t: seen.append(t) or 20
+    for _ in range(MIN_SAMPLES):
+        store.record(f"{SCOPE} id=x", 0.5)
+
+    page.wait.until = MagicMock()
+    page.find("id", "x")
+
+    assert seen == [3.0, 20]
+    # Samples are stored unscaled
+    assert adaptive_timeouts.observed[0][1] < 0.5 * page.timeout_scale
+
+
+def test_latencies_are_kept_per_browser_and_site(store):
+    for _ in range(MIN_SAMPLES):
+        store.record(f"firefox {URL} id=x", 5.0)
+    page = BasePage(MagicMock(), URL, default_timeout=10, latency_scope=SCOPE)
+    seen = []
+    page._set_timeout = lambda t: seen.append(t) or 10
+
+    page.wait.until = MagicMock()
+    page.find("id", "x")
+
+    assert seen == [10, 10]
+    assert adaptive_timeouts.observed[0][0] == f"{SCOPE} id=x"
+
+
+def test_fake_and_replayed_drivers_do_not_learn(store):
+    fake = FakeDriver(demo_site({"u": "p"}))
+    replay = ReplayDriver({"entries": []}, URL)
+    recorded_fake = recording_driver(fake, TraceRecorder(URL))
+
+    assert latency_scope(MagicMock(), "chrome", URL) == SCOPE
+    for drv in (fake, replay, recorded_fake):
+        assert latency_scope(drv, "fake", URL) is None
+
+    page = LoginPage(fake, URL, default_timeout=10, latency_scope=None)
+    page.open_login()
+    page.find_visible(*page.USERNAME)
+    assert adaptive_timeouts.observed == []
+
+
+def test_plugin_merges_report_samples_and_saves(tmp_path):
+    config = MagicMock()
+    config.cache.get.return_value = {"LoginPage.USERNAME": [0.2]}
+    plugin = AdaptiveTimeoutPlugin()
+    plugin.pytest_configure(config)
+    try:
+        assert adaptive_timeouts.store is not None
+        report = MagicMock(
+            when="teardown",
+            user_properties=[("wait_latencies", [("LoginPage.USERNAME", 0.3)])],
+        )
+        plugin.pytest_runtest_logreport(report)
+        del config.workerinput
+        plugin.pytest_sessionfinish(MagicMock(config=config))
+    finally:
+        plugin.pytest_unconfigure(config)
+
+    config.cache.set.assert_called_once_with(
+        "e2e/wait-latencies", {"LoginPage.USERNAME": [0.2, 0.3]}
+    )
+    assert adaptive_timeouts.store is None
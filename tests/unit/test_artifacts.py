@@ -0,0 +1,89 @@
+import gzip
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from src.artifacts import ArtifactWriter, FailureArtifactsPlugin
+
+
+def test_writer_writes_after_close(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    shot = writer.submit_screenshot("test_a", b"\x89PNG fake")
+    page = writer.submit_text("test_a", "<html></html>", "html")
+    writer.close()
+
+    assert shot == tmp_path / "screenshots" / "test_a.png"
+    assert shot.read_bytes() == b"\x89PNG fake"
+    assert page.read_text() == "<html></html>"
+
+
+def test_identical_screenshots_are_deduplicated(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    first = writer.submit_screenshot("a", b"same")
+    second = writer.submit_screenshot("b", b"same")
+    writer.close()
+
+    assert second == first
+    assert sorted(p.name for p in (tmp_path / "screenshots").iterdir()) == ["a.png"]
+
+
+def test_compress_gzips_text(tmp_path):
+    writer = ArtifactWriter(tmp_path, compress=True)
+    path = writer.submit_text("t", "hello", "html")
+    writer.close()
+
+    assert path.name == "t.html.gz"
+    assert gzip.decompress(path.read_bytes()) == b"hello"
+
+
+def test_queue_is_bounded(tmp_path):
+    writer = ArtifactWriter(tmp_path, max_pending=3)
+    assert writer._queue.maxsize == 3
+    writer.close()
+
+
+def make_item(tmp_path, drv):
+    item = MagicMock()
+    item.nodeid = "tests/e2e/test_x.py::test_y"
+    item.funcargs = {"driver": drv}
+    item.config.pluginmanager.hasplugin.return_value = False
+    return item
+
+
+def run_hook(plugin, item, when="call", failed=True):
+    rep = MagicMock(when=when, failed=failed)
+    outcome = MagicMock()
+    outcome.get_result.return_value = rep
+    gen = plugin.pytest_runtest_makereport(item, MagicMock())
+    next(gen)
+    with pytest.raises(StopIteration):
+        gen.send(outcome)
+    return rep
+
+
+def test_plugin_captures_failure_artifacts(tmp_path):
+    drv = MagicMock()
+    drv.get_screenshot_as_png.return_value = b"png"
+    drv.current_url = "https://example.com/inventory.html"
+    drv.page_source = "<html/>"
+    drv.get_log.return_value = [{"level": "SEVERE", "message": "boom"}]
+    plugin = FailureArtifactsPlugin(out_dir=str(tmp_path))
+
+    run_hook(plugin, make_item(tmp_path, drv))
+    plugin.pytest_sessionfinish(MagicMock())
+
+    meta_file = next((tmp_path / "pages").glob("*.json"))
+    meta = json.loads(meta_file.read_text())
+    assert meta["url"] == "https://example.com/inventory.html"
+    assert meta["console"][0]["message"] == "boom"
+    assert len(list((tmp_path / "screenshots").glob("*.png"))) == 1
+    drv.save_screenshot.assert_not_called()
+
+
+def test_plugin_ignores_passing_tests(tmp_path):
+    drv = MagicMock()
+    plugin = FailureArtifactsPlugin(out_dir=str(tmp_path))
+    run_hook(plugin, make_item(tmp_path, drv), failed=False)
+
+    drv.get_screenshot_as_png.assert_not_called()
+    assert plugin._writer is None
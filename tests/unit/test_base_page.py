@@ -1,7 +1,12 @@
+import time
 import pytest
 from unittest.mock import MagicMock
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 
 from src.pages.base_page import BasePage
 
@@ -82,3 +87,134 @@ def test_exists_true(page):
 def test_exists_false_on_timeout(page):
     page.wait.until.side_effect = TimeoutException("nope")
     assert page.exists(By.ID, "missing") is False
+
+
+def test_query_uses_single_script_call(page, mock_driver):
+    mock_driver.execute_script.return_value = [
+        {"count": 1, "visible": True, "text": "Products", "attributes": {}},
+        {"count": 0, "visible": False, "text": None, "attributes": {}},
+    ]
+    title, badge = page.query((By.CSS_SELECTOR, ".title"), (By.ID, "badge"))
+
+    mock_driver.execute_script.assert_called_once()
+    args = mock_driver.execute_script.call_args.args
+    assert args[1] == [["css selector", ".title"], ["id", "badge"]]
+    assert title.present and title.visible and title.text == "Products"
+    assert not badge.present and badge.text is None
+
+
+def test_query_without_locators_skips_driver(page, mock_driver):
+    assert page.query() == []
+    mock_driver.execute_script.assert_not_called()
+
+
+def test_snapshot_maps_bundle_names(page, mock_driver):
+    page.SNAPSHOT = {"a": (By.ID, "a"), "b": (By.ID, "b")}
+    mock_driver.execute_script.return_value = [
+        {"count": 1, "visible": True, "text": "A", "attributes": {"class": "x"}},
+        {"count": 2, "visible": False, "text": "", "attributes": {"class": None}},
+    ]
+    snap = page.snapshot(attributes=["class"])
+
+    assert set(snap) == {"a", "b"}
+    assert snap["a"].attributes == {"class": "x"}
+    assert snap["b"].count == 2
+    assert mock_driver.execute_script.call_args.args[2] == ["class"]
+
+
+def test_snapshot_subset(page, mock_driver):
+    page.SNAPSHOT = {"a": (By.ID, "a"), "b": (By.ID, "b")}
+    mock_driver.execute_script.return_value = [
+        {"count": 0, "visible": False, "text": None, "attributes": {}}
+    ]
+    snap = page.snapshot(names=["b"])
+
+    assert list(snap) == ["b"]
+    assert mock_driver.execute_script.call_args.args[1] == [["id", "b"]]
+
+
+def test_is_present_does_not_wait(page, mock_driver):
+    mock_driver.find_elements.return_value = []
+    assert page.is_present(By.ID, "badge") is False
+    mock_driver.find_elements.return_value = [MagicMock()]
+    assert page.is_present(By.ID, "badge") is True
+    page.wait.until.assert_not_called()
+
+
+def test_first_present_returns_the_locator_that_appeared(page, mock_driver):
+    title, form = (By.CSS_SELECTOR, ".title"), (By.ID, "user-name")
+    mock_driver.find_elements.side_effect = lambda by, value: (
+        [MagicMock()] if (by, value) == form else []
+    )
+    assert page.first_present(title, form) == form
+
+    mock_driver.find_elements.side_effect = None
+    mock_driver.find_elements.return_value = []
+    assert page.first_present(title, form, timeout=0.1) is None
+
+
+def test_exists_with_short_timeout_fails_fast(page, mock_driver):
+    mock_driver.find_element.side_effect = NoSuchElementException("missing")
+    started = time.monotonic()
+    assert page.exists(By.ID, "badge", timeout=0.1) is False
+    assert time.monotonic() - started < 1
+    page.wait.until.assert_not_called()
+
+
+def test_is_absent_returns_immediately_when_missing(page, mock_driver):
+    mock_driver.find_elements.return_value = []
+    assert page.is_absent(By.ID, "badge") is True
+    mock_driver.find_elements.assert_called_once()
+
+
+def test_is_absent_false_when_element_stays(page, mock_driver):
+    page.absence_timeout = 0.1
+    mock_driver.find_elements.return_value = [MagicMock()]
+    assert page.is_absent(By.ID, "badge") is False
+
+
+def test_wait_for_removal_true_when_already_gone(page, mock_driver):
+    mock_driver.find_elements.return_value = []
+    assert page.wait_for_removal(By.ID, "spinner") is True
+
+
+def test_wait_for_removal_detects_stale_element(page, mock_driver):
+    el = MagicMock()
+    el.is_enabled.side_effect = StaleElementReferenceException("gone")
+    mock_driver.find_elements.return_value = [el]
+    assert page.wait_for_removal(By.ID, "spinner", timeout=1) is True
+
+
+def test_wait_for_removal_false_when_attached(page, mock_driver):
+    el = MagicMock()
+    mock_driver.find_elements.return_value = [el]
+    assert page.wait_for_removal(By.ID, "spinner", timeout=0.1) is False
+
+
+def test_wait_for_text_and_count_use_polling_wait(page):
+    page.wait.until.return_value = True
+    assert page.wait_for_text(By.CSS_SELECTOR, ".title", "Products") is True
+    assert page.wait_for_count(By.CSS_SELECTOR, ".item", 6) is True
+    assert page.wait.until.call_count == 2
+
+
+def test_open_waits_for_ready_locator_when_requested(page, mock_driver):
+    page.READY = (By.CSS_SELECTOR, ".title")
+    page.open("inventory.html", wait_ready=True)
+
+    mock_driver.get.assert_called_once_with(f"{TEST_URL}/inventory.html")
+    page.wait.until.assert_called_once()
+
+
+def test_open_skips_ready_wait_with_normal_strategy(page):
+    page.READY = (By.CSS_SELECTOR, ".title")
+    page.open("inventory.html")
+    page.wait.until.assert_not_called()
+
+
+def test_eager_strategy_enables_ready_wait(mock_driver):
+    p = BasePage(mock_driver, TEST_URL, page_load_strategy="eager")
+    p.wait.until = MagicMock()
+    p.READY = (By.ID, "root")
+    p.open("")
+    p.wait.until.assert_called_once()
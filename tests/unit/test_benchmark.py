@@ -0,0 +1,33 @@
+from src.benchmark import compare, measure
+
+
+def stats(median):
+    return {"min": median, "median": median, "mean": median, "rounds": 1}
+
+
+def test_measure_runs_warmup_and_rounds():
+    calls = []
+    result = measure(lambda: calls.append(1), rounds=5, warmup=2)
+
+    assert len(calls) == 7
+    assert result["rounds"] == 5
+    assert 0 <= result["min"] <= result["median"]
+
+
+def test_compare_flags_regression_beyond_threshold():
+    regressions = compare({"a": stats(0.2)}, {"a": stats(0.1)}, threshold=0.25)
+
+    assert [r["name"] for r in regressions] == ["a"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_compare_allows_slowdown_within_threshold():
+    assert compare({"a": stats(0.11)}, {"a": stats(0.1)}, threshold=0.25) == []
+
+
+def test_compare_ignores_noise_below_floor():
+    assert compare({"a": stats(2e-6)}, {"a": stats(1e-6)}, threshold=0.1) == []
+
+
+def test_compare_ignores_new_metrics():
+    assert compare({"new": stats(1.0)}, {}, threshold=0.1) == []
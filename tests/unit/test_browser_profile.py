@@ -0,0 +1,156 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import selenium
+
+from src import browser_profile
+from src.browser_profile import BrowserProfile, DriverPathCache
+from src.resource_policy import PROFILES
+
+
+@pytest.fixture
+def binaries(tmp_path):
+    driver = tmp_path / "chromedriver"
+    browser = tmp_path / "chrome"
+    driver.write_text("driver")
+    browser.write_text("browser")
+    return str(driver), str(browser)
+
+
+@pytest.fixture
+def selenium_manager(monkeypatch, binaries):
+    manager = MagicMock()
+    manager.return_value.binary_paths.return_value = {
+        "driver_path": binaries[0],
+        "browser_path": binaries[1],
+    }
+    monkeypatch.setattr(
+        "selenium.webdriver.common.selenium_manager.SeleniumManager", manager
+    )
+    return manager
+
+
+def test_options_are_compiled_once():
+    profile = BrowserProfile("chrome", headless=True, extra_args=("--lang=en",))
+
+    assert profile.options is profile.options
+    args = profile.options.arguments
+    assert "--headless=new" in args
+    assert "--window-size=1920,1080" in args
+    assert "--lang=en" in args
+
+
+def test_firefox_options_use_width_and_height():
+    profile = BrowserProfile(
+        "firefox", window_size="800,600", page_load_strategy="eager"
+    )
+
+    assert profile.options.arguments == ["--width=800", "--height=600"]
+    assert profile.options.page_load_strategy == "eager"
+
+
+def test_resource_policy_is_applied():
+    profile = BrowserProfile("chrome", resource_policy=PROFILES["no-images"])
+
+    prefs = profile.options.experimental_options["prefs"]
+    assert prefs["profile.managed_default_content_settings.images"] == 2
+
+
+def test_console_log_is_merged_with_resource_policy_logging():
+    options = BrowserProfile(console_log=True, resource_policy=PROFILES["lean"]).options
+
+    assert options.to_capabilities()["goog:loggingPrefs"] == {
+        "browser": "ALL",
+        "performance": "ALL",
+    }
+    assert "goog:loggingPrefs" not in BrowserProfile().options.to_capabilities()
+
+
+def test_cache_miss_resolves_and_stores(tmp_path, selenium_manager, binaries):
+    cache = DriverPathCache(tmp_path / "paths.json")
+
+    entry = cache.resolve("chrome", BrowserProfile().options)
+
+    assert entry["driver_path"] == binaries[0]
+    stored = json.loads((tmp_path / "paths.json").read_text())
+    assert stored["chrome"]["selenium"] == selenium.__version__
+
+
+def test_cache_hit_skips_selenium_manager(tmp_path, selenium_manager):
+    cache = DriverPathCache(tmp_path / "paths.json")
+    cache.resolve("chrome", BrowserProfile().options)
+
+    cache.resolve("chrome", BrowserProfile().options)
+
+    assert selenium_manager.return_value.binary_paths.call_count == 1
+
+
+def test_changed_binary_invalidates_entry(tmp_path, selenium_manager, binaries):
+    cache = DriverPathCache(tmp_path / "paths.json")
+    cache.resolve("chrome", BrowserProfile().options)
+
+    with open(binaries[1], "a") as fh:
+        fh.write(" updated")
+
+    assert cache.lookup("chrome") is None
+
+
+def test_offline_uses_cache_without_version_check(tmp_path, selenium_manager, binaries):
+    DriverPathCache(tmp_path / "paths.json").resolve("chrome", BrowserProfile().options)
+    with open(binaries[1], "a") as fh:
+        fh.write(" updated")
+    selenium_manager.reset_mock()
+
+    entry = DriverPathCache(tmp_path / "paths.json", offline=True).resolve(
+        "chrome", BrowserProfile().options
+    )
+
+    assert entry["driver_path"] == binaries[0]
+    selenium_manager.assert_not_called()
+
+
+def test_offline_without_cache_raises(tmp_path):
+    cache = DriverPathCache(tmp_path / "paths.json", offline=True)
+
+    with pytest.raises(RuntimeError, match="No cached chrome driver"):
+        cache.resolve("chrome", BrowserProfile().options)
+
+
+def test_launch_passes_cached_paths_to_service(
+    tmp_path, monkeypatch, selenium_manager, binaries
+):
+    chrome = MagicMock()
+    monkeypatch.setattr(browser_profile.webdriver, "Chrome", chrome)
+    profile = BrowserProfile(path_cache=DriverPathCache(tmp_path / "paths.json"))
+
+    profile.launch()
+    profile.launch()
+
+    service = chrome.call_args.kwargs["service"]
+    assert service.path == binaries[0]
+    assert chrome.call_args.kwargs["options"].binary_location == binaries[1]
+    assert selenium_manager.return_value.binary_paths.call_count == 1
+    chrome.return_value.implicitly_wait.assert_called_with(0)
+
+
+def test_dense_chrome_profile_trims_processes(monkeypatch, tmp_path):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+    profile = BrowserProfile(
+        "chrome", dense=True, renderer_process_limit=3, cache_dir=str(tmp_path)
+    )
+
+    args = profile.options.arguments
+    assert set(browser_profile.DENSE_CHROME_ARGS) <= set(args)
+    assert "--renderer-process-limit=3" in args
+    assert f"--disk-cache-dir={tmp_path / 'chrome-gw2'}" in args
+    assert "--disable-gpu" not in BrowserProfile("chrome").options.arguments
+
+
+def test_dense_firefox_profile_caps_content_processes(tmp_path):
+    profile = BrowserProfile("firefox", dense=True, cache_dir=str(tmp_path))
+
+    prefs = profile.options.preferences
+    assert prefs["dom.ipc.processCount"] == 2
+    assert prefs["layers.acceleration.disabled"] is True
+    assert prefs["browser.cache.disk.parent_directory"].startswith(str(tmp_path))
@@ -1,5 +1,7 @@
 from importlib import reload
 
+import pytest
+
 from src import config
 
 
@@ -29,3 +31,83 @@ def test_settings_reads_env(monkeypatch):
     assert s.browser == "firefox"
     assert s.headless is True
     assert s.default_timeout == 15
+
+
+def test_lazy_settings_memoizes_until_env_changes(monkeypatch, tmp_path):
+    monkeypatch.setenv("BASE_URL", "https://one.local")
+    provider = config.LazySettings(env_file=tmp_path / ".env")
+
+    first = provider.get()
+    assert provider.get() is first
+    assert provider.base_url == "https://one.local"
+
+    monkeypatch.setenv("BASE_URL", "https://two.local")
+    # Reads stay memoized until an explicit refresh
+    assert provider.get() is first
+    assert provider.refresh() is True
+    assert provider.get() is not first
+    assert provider.base_url == "https://two.local"
+    assert provider.refresh() is False
+
+
+def test_lazy_settings_reads_do_not_fingerprint_the_environment(monkeypatch, tmp_path):
+    provider = config.LazySettings(env_file=tmp_path / ".env")
+    provider.get()
+    calls = []
+    monkeypatch.setattr(config, "_env_fingerprint", lambda: calls.append(1) or ())
+
+    for _ in range(100):
+        provider.base_url
+    assert calls == []
+
+    provider.invalidate()
+    provider.base_url
+    assert calls == [1]
+
+
+def test_lazy_settings_reloads_env_file(monkeypatch, tmp_path):
+    monkeypatch.delenv("WAIT_ENGINE", raising=False)
+    monkeypatch.setenv("BROWSER", "firefox")
+    env_file = tmp_path / ".env"
+    env_file.write_text("WAIT_ENGINE=event\nBROWSER=chrome\n")
+    provider = config.LazySettings(env_file=env_file)
+
+    assert provider.wait_engine == "event"
+    # Real environment wins over the file
+    assert provider.browser == "firefox"
+
+    env_file.write_text("WAIT_ENGINE=poll-changed\n")
+    provider.refresh()
+    assert provider.wait_engine == "poll-changed"
+
+    env_file.unlink()
+    provider.refresh()
+    assert provider.wait_engine == "poll"
+    assert "WAIT_ENGINE" not in config.os.environ
+
+
+def test_lazy_settings_override_is_scoped(tmp_path):
+    provider = config.LazySettings(env_file=tmp_path / ".env")
+    before = provider.default_timeout
+
+    with provider.override(default_timeout=99):
+        assert provider.default_timeout == 99
+    assert provider.default_timeout == before
+
+
+def test_lazy_settings_rejects_unknown_override(tmp_path):
+    provider = config.LazySettings(env_file=tmp_path / ".env")
+    with pytest.raises(TypeError, match="nope"):
+        provider.override(nope=1)
+
+
+def test_per_worker_env_variant(monkeypatch, tmp_path):
+    monkeypatch.setenv("BASE_URL", "https://shared.local")
+    monkeypatch.setenv("BASE_URL__GW1", "https://gw1.local")
+    provider = config.LazySettings(env_file=tmp_path / ".env")
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    assert provider.base_url == "https://shared.local"
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    provider.refresh()
+    assert provider.base_url == "https://gw1.local"
@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.driver_pool import DriverPool
+
+
+def make_driver(healthy=True):
+    drv = MagicMock()
+    drv.execute_script.return_value = 1 if healthy else None
+    return drv
+
+
+@pytest.fixture
+def factory():
+    return MagicMock(side_effect=lambda: make_driver())
+
+
+def test_acquire_reuses_released_driver(factory):
+    pool = DriverPool(factory, max_uses=5)
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert pool.created == 1
+
+
+def test_release_resets_state(factory):
+    pool = DriverPool(factory)
+    drv = pool.acquire()
+    pool.release(drv)
+
+    drv.delete_all_cookies.assert_called_once()
+    drv.get.assert_called_once_with("about:blank")
+    scripts = [c.args[0] for c in drv.execute_script.call_args_list]
+    assert any(
+        "localStorage.clear" in s and "sessionStorage.clear" in s for s in scripts
+    )
+
+
+def test_recycles_after_max_uses(factory):
+    pool = DriverPool(factory, max_uses=2)
+    drv = pool.acquire()
+    pool.release(drv)
+    assert pool.acquire() is drv
+    pool.release(drv)
+
+    drv.quit.assert_called_once()
+    assert pool.acquire() is not drv
+    assert pool.created == 2
+
+
+def test_crashed_driver_is_discarded_on_release(factory):
+    pool = DriverPool(factory)
+    drv = pool.acquire()
+    drv.execute_script.side_effect = Exception("session deleted")
+    pool.release(drv)
+
+    drv.quit.assert_called_once()
+    assert pool.acquire() is not drv
+
+
+def test_wedged_idle_driver_is_replaced_on_acquire(factory):
+    pool = DriverPool(factory)
+    drv = pool.acquire()
+    pool.release(drv)
+    drv.execute_script.side_effect = Exception("timeout")
+
+    assert pool.acquire() is not drv
+    drv.quit.assert_called_once()
+
+
+def test_hung_health_probe_counts_as_unhealthy(factory):
+    pool = DriverPool(factory, health_timeout=0.05)
+    drv = pool.acquire()
+    pool.release(drv)
+    hang = threading.Event()
+    drv.execute_script.side_effect = lambda script: hang.wait(5)
+
+    started = time.monotonic()
+    try:
+        assert pool.acquire() is not drv
+    finally:
+        hang.set()
+    assert time.monotonic() - started < 1
+    drv.quit.assert_called_once()
+
+
+def test_failed_reset_discards_driver(factory):
+    pool = DriverPool(factory)
+    drv = pool.acquire()
+    drv.delete_all_cookies.side_effect = Exception("boom")
+    pool.release(drv)
+
+    drv.quit.assert_called_once()
+    assert pool.acquire() is not drv
+
+
+def test_close_quits_idle_drivers(factory):
+    pool = DriverPool(factory)
+    drv = pool.acquire()
+    pool.release(drv)
+    pool.close()
+
+    drv.quit.assert_called_once()
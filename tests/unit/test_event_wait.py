@@ -0,0 +1,121 @@
+import pytest
+from unittest.mock import MagicMock
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from src.pages.base_page import BasePage
+from src.pages.event_wait import EventWait
+
+LOCATOR = (By.ID, "title")
+
+
+@pytest.fixture
+def driver():
+    return MagicMock()
+
+
+def test_returns_element_from_async_script(driver):
+    el = MagicMock()
+    driver.execute_async_script.return_value = {"ok": True, "element": el}
+    engine = EventWait(driver, timeout=5)
+
+    assert engine.visibility(LOCATOR) is el
+    args = driver.execute_async_script.call_args.args
+    assert args[1:] == ("id", "title", "visible", None, 5000)
+
+
+def test_script_timeout_is_raised_once(driver):
+    driver.execute_async_script.return_value = {"ok": True, "element": MagicMock()}
+    engine = EventWait(driver, timeout=5)
+    engine.presence(LOCATOR)
+    engine.presence(LOCATOR)
+
+    driver.set_script_timeout.assert_called_once_with(10)
+
+
+def test_unmet_condition_raises_timeout(driver):
+    driver.execute_async_script.return_value = {"ok": False}
+    with pytest.raises(TimeoutException):
+        EventWait(driver, timeout=1).count(LOCATOR, 3)
+
+
+def test_text_and_count_conditions_pass_expected_value(driver):
+    driver.execute_async_script.return_value = {"ok": True, "count": 2}
+    engine = EventWait(driver, timeout=1)
+
+    assert engine.count(LOCATOR, 2) is True
+    assert driver.execute_async_script.call_args.args[3:5] == ("count", 2)
+    assert engine.text(LOCATOR, "Products") is True
+    assert driver.execute_async_script.call_args.args[3:5] == ("text", "Products")
+
+
+def test_removed_watches_the_element_and_falls_back_to_staleness(driver):
+    el = MagicMock()
+    driver.execute_async_script.return_value = {"ok": True}
+    engine = EventWait(driver, timeout=5)
+
+    assert engine.removed(LOCATOR, el, timeout=2) is True
+    assert driver.execute_async_script.call_args.args[3:] == ("removed", el, 2000)
+
+    driver.execute_async_script.side_effect = JavascriptException("unloaded")
+    el.is_enabled.side_effect = StaleElementReferenceException("gone")
+    assert engine.removed(LOCATOR, el, timeout=1, poll_frequency=0.01) is True
+
+
+def test_base_page_waits_for_removal_with_event_engine(driver):
+    el = MagicMock()
+    driver.find_elements.return_value = [el]
+    driver.execute_async_script.return_value = {"ok": False}
+    page = BasePage(driver, "https://example.com", wait_engine="event")
+
+    assert page.wait_for_removal(By.ID, "spinner", timeout=0.5) is False
+    assert driver.execute_async_script.call_args.args[3:] == ("removed", el, 500)
+
+
+def test_falls_back_to_polling_when_document_is_replaced(driver):
+    el = MagicMock()
+    driver.execute_async_script.side_effect = JavascriptException("document unloaded")
+    driver.find_element.return_value = el
+
+    assert EventWait(driver, timeout=1).presence(LOCATOR) is el
+    driver.find_element.assert_called_with(*LOCATOR)
+
+
+def test_fallback_respects_deadline(driver):
+    driver.execute_async_script.side_effect = JavascriptException("unloaded")
+    driver.find_element.side_effect = NoSuchElementException("missing")
+
+    with pytest.raises(TimeoutException):
+        EventWait(driver, timeout=0.1).presence(LOCATOR)
+
+
+def test_unsupported_driver_switches_to_polling(driver):
+    driver.execute_async_script.side_effect = NotImplementedError
+    driver.find_element.return_value = MagicMock()
+    engine = EventWait(driver, timeout=1)
+
+    engine.presence(LOCATOR)
+    engine.presence(LOCATOR)
+    assert engine.supported is False
+    driver.execute_async_script.assert_called_once()
+
+
+def test_base_page_uses_event_engine(driver):
+    el = MagicMock()
+    driver.execute_async_script.return_value = {"ok": True, "element": el}
+    page = BasePage(driver, "https://example.com", wait_engine="event")
+    page.wait.until = MagicMock()
+
+    page.click(By.ID, "login-button")
+    el.click.assert_called_once()
+    page.wait.until.assert_not_called()
+
+
+def test_base_page_rejects_unknown_engine(driver):
+    with pytest.raises(ValueError):
+        BasePage(driver, "https://example.com", wait_engine="magic")
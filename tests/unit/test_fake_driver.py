@@ -0,0 +1,154 @@
+import pytest
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.fake_driver import FakeDriver, FakeElement, demo_site
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+
+URL = "https://shop.test"
+USERS = {"standard_user": "secret_sauce"}
+
+
+@pytest.fixture
+def drv():
+    return FakeDriver(demo_site(USERS))
+
+
+@pytest.fixture
+def login_page(drv):
+    return LoginPage(drv, URL, default_timeout=1, absence_timeout=0)
+
+
+@pytest.fixture
+def inventory(drv):
+    return InventoryPage(drv, URL, default_timeout=1, absence_timeout=0)
+
+
+def page_with(*children):
+    drv = FakeDriver(
+        {"": lambda d: FakeElement("html", FakeElement("body", *children))}
+    )
+    drv.get(URL)
+    return drv
+
+
+def test_css_selectors():
+    drv = page_with(
+        FakeElement(
+            "div",
+            FakeElement("button", id="a", class_="btn primary", data_test="go"),
+            FakeElement("span", FakeElement("button", class_="btn")),
+            class_="row",
+        )
+    )
+
+    assert len(drv.find_elements(By.CSS_SELECTOR, "button.btn")) == 2
+    assert len(drv.find_elements(By.CSS_SELECTOR, ".row > button")) == 1
+    assert len(drv.find_elements(By.CSS_SELECTOR, ".row button")) == 2
+    assert (
+        drv.find_element(By.CSS_SELECTOR, "[data-test='go']").get_attribute("id") == "a"
+    )
+    assert drv.find_element(By.CSS_SELECTOR, "#a.primary").tag_name == "button"
+    assert len(drv.find_elements(By.CSS_SELECTOR, "#a, span")) == 2
+    assert len(drv.find_elements(By.CSS_SELECTOR, "[class^='btn']")) == 2
+
+
+def test_unsupported_locator_raises():
+    drv = page_with()
+    with pytest.raises(InvalidSelectorException):
+        drv.find_elements(By.XPATH, "//div")
+
+
+def test_missing_element_raises():
+    with pytest.raises(NoSuchElementException):
+        page_with().find_element(By.ID, "nope")
+
+
+def test_navigation_makes_elements_stale(drv):
+    drv.get(URL)
+    field = drv.find_element(By.ID, "user-name")
+
+    drv.refresh()
+
+    with pytest.raises(StaleElementReferenceException):
+        field.send_keys("x")
+    assert EC.staleness_of(field)(drv) is True
+
+
+def test_hidden_elements_are_not_interactable():
+    drv = page_with(FakeElement("div", FakeElement("button", id="b"), displayed=False))
+    btn = drv.find_element(By.ID, "b")
+
+    assert btn.is_displayed() is False
+    assert btn.text == ""
+    with pytest.raises(ElementNotInteractableException):
+        btn.click()
+
+
+def test_webdriverwait_works_unchanged(drv):
+    drv.get(URL)
+    el = WebDriverWait(drv, 1).until(
+        EC.element_to_be_clickable((By.ID, "login-button"))
+    )
+    assert el.get_attribute("value") == "Login"
+
+
+def test_cookies(drv):
+    drv.add_cookie({"name": "a", "value": "1"})
+    assert drv.get_cookie("a")["value"] == "1"
+    drv.delete_all_cookies()
+    assert drv.get_cookies() == []
+
+
+def test_unregistered_script_is_not_implemented(drv):
+    with pytest.raises(NotImplementedError):
+        drv.execute_script("return document.title;")
+
+
+def test_login_as_reaches_inventory(drv, login_page, inventory):
+    login_page.open_login()
+    login_page.login_as("standard_user", "secret_sauce")
+
+    assert drv.current_url == f"{URL}/inventory.html"
+    assert inventory.is_loaded() is True
+
+
+def test_wrong_password_shows_error(login_page):
+    login_page.open_login()
+    login_page.login_as("standard_user", "nope")
+
+    assert "do not match" in login_page.error_message()
+
+
+def test_inventory_requires_session(inventory, login_page):
+    inventory.open_inventory(wait_ready=False)
+    assert "logged in" in login_page.error_message()
+
+
+def test_cart_flow_survives_reload(login_page, inventory):
+    login_page.open_login()
+    login_page.login_as("standard_user", "secret_sauce")
+    assert inventory.cart_count() == 0
+
+    inventory.add_first_item_to_cart()
+    assert inventory.cart_count() == 1
+
+    inventory.open_inventory()
+    assert inventory.cart_count() == 1
+    assert inventory.snapshot(["cart_badge"])["cart_badge"].text == "1"
+
+
+def test_page_objects_run_fast(drv, login_page, inventory):
+    for _ in range(200):
+        drv.delete_all_cookies()
+        login_page.open_login()
+        login_page.login_as("standard_user", "secret_sauce")
+        assert inventory.cart_count() == 0
@@ -0,0 +1,164 @@
+import pathlib
+import shutil
+import subprocess
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import impact
+from src.config import settings
+from src.impact import (
+    ImpactPlugin,
+    changed_files,
+    page_files,
+    select,
+    shared_changes,
+    static_deps,
+)
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+from src.pages.registry import PageRegistry
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+LOGIN = "tests/e2e/test_login.py::test_successful_login"
+CART = "tests/e2e/test_add_to_cart.py::test_add_item_to_cart_updates_badge"
+DEPS = {LOGIN: {"tests/e2e/test_login.py"}, CART: {"tests/e2e/test_add_to_cart.py"}}
+HISTORY = {
+    LOGIN: ["src/pages/base_page.py", "src/pages/login_page.py"],
+    CART: ["src/pages/base_page.py", "src/pages/inventory_page.py"],
+}
+
+
+@pytest.fixture
+def used(monkeypatch):
+    used = set()
+    monkeypatch.setattr(impact, "used", used)
+    return used
+
+
+def test_page_change_selects_tests_that_used_the_page():
+    selected, reason = select(DEPS, HISTORY, ["src/pages/login_page.py"])
+
+    assert selected == {LOGIN}
+    assert reason == "1 changed modules"
+
+
+def test_test_file_change_selects_its_tests():
+    selected, _ = select(DEPS, HISTORY, ["tests/e2e/test_add_to_cart.py"])
+    assert selected == {CART}
+
+
+def test_shared_code_runs_everything():
+    selected, reason = select(DEPS, HISTORY, ["README.md", "src/pages/base_page.py"])
+
+    assert selected is None
+    assert reason == "shared code changed: src/pages/base_page.py"
+
+
+def test_tests_without_history_always_run_and_docs_impact_nothing():
+    assert select(DEPS, {LOGIN: HISTORY[LOGIN]}, ["README.md"])[0] == {CART}
+    assert select(DEPS, HISTORY, ["README.md", ".github/workflows/ci.yml"])[0] == set()
+
+
+def test_full_run_patterns_match_from_the_right():
+    changed = ["tests/e2e/conftest.py", "src/config.py", "src/pages/login_page.py"]
+    assert shared_changes(changed, settings.impact_full_run) == changed[:2]
+
+
+def test_page_files_include_base_classes():
+    assert page_files({InventoryPage}, ROOT) == [
+        "src/pages/base_page.py",
+        "src/pages/inventory_page.py",
+    ]
+
+
+def test_registry_notes_every_page_read(used):
+    registry = PageRegistry(MagicMock(), "https://shop.test")
+    first = registry.login
+    used.clear()
+
+    assert registry.login is first
+    assert used == {LoginPage}
+
+
+def test_static_deps_cover_module_imports_and_fixtures():
+    def fixture_func():
+        pass
+
+    item = MagicMock(path=ROOT / "tests/unit/test_impact.py")
+    item._fixtureinfo.name2fixturedefs = {
+        "driver": [MagicMock(func=PageRegistry.__init__)],
+        "local": [MagicMock(func=fixture_func)],
+    }
+
+    deps = static_deps(item, ROOT)
+
+    assert {
+        "tests/unit/test_impact.py",
+        "src/impact.py",
+        "src/pages/login_page.py",
+        "src/pages/registry.py",
+    } <= deps
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_changed_files_include_untracked(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    (tmp_path / "a.py").write_text("a = 2\n")
+    (tmp_path / "c.py").write_text("c = 1\n")
+
+    assert changed_files("HEAD", tmp_path) == ["a.py", "c.py"]
+    assert changed_files("no-such-ref", tmp_path) is None
+
+
+def test_plugin_deselects_unimpacted_items(monkeypatch):
+    monkeypatch.setattr(impact, "changed_files", lambda base, cwd: ["src/pages/x.py"])
+    config = MagicMock(rootpath=ROOT)
+    config.cache.get.return_value = {LOGIN: ["src/pages/x.py"], CART: []}
+    plugin = ImpactPlugin("origin/main")
+    plugin.pytest_configure(config)
+    try:
+        items = [
+            MagicMock(nodeid=LOGIN, path=ROOT / "tests/e2e/test_login.py"),
+            MagicMock(nodeid=CART, path=ROOT / "tests/e2e/test_add_to_cart.py"),
+        ]
+        for item in items:
+            item._fixtureinfo.name2fixturedefs = {}
+        plugin.pytest_collection_modifyitems(config, items)
+        assert [item.nodeid for item in items] == [LOGIN]
+        config.hook.pytest_deselected.assert_called_once()
+        assert "selective" in plugin.pytest_report_header(config)
+    finally:
+        plugin.pytest_unconfigure(config)
+    assert impact.used is None
+
+
+def test_plugin_records_used_pages_and_saves(used):
+    config = MagicMock(rootpath=ROOT)
+    config.cache.get.return_value = {CART: ["old"]}
+    plugin = ImpactPlugin()
+    plugin.pytest_configure(config)
+    try:
+        impact.note_page(LoginPage)
+        item = MagicMock(nodeid=LOGIN, user_properties=[])
+        plugin.pytest_runtest_makereport(item, MagicMock(when="teardown"))
+        plugin.pytest_runtest_logreport(
+            MagicMock(
+                when="teardown", nodeid=LOGIN, user_properties=item.user_properties
+            )
+        )
+        del config.workerinput
+        plugin.pytest_sessionfinish(MagicMock(config=config))
+    finally:
+        plugin.pytest_unconfigure(config)
+
+    config.cache.set.assert_called_once_with(
+        "e2e/impact-map", {CART: ["old"], LOGIN: HISTORY[LOGIN]}
+    )
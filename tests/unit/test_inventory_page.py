@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock
 
+from src.fake_driver import FakeDriver, demo_site
+from src.local_app import PRODUCTS, SESSION_COOKIE
 from src.pages.inventory_page import InventoryPage
 
 
@@ -24,27 +26,111 @@ def test_is_loaded_uses_exists(inv_page, monkeypatch):
     assert called["ok"]
 
 
-def test_add_first_item_to_cart_clicks_first(inv_page):
+def test_add_first_item_to_cart_clicks_first(inv_page, monkeypatch):
     first_btn = MagicMock()
     others = [first_btn, MagicMock()]
     inv_page.driver.find_elements.return_value = others
+    monkeypatch.setattr(inv_page, "cart_count", lambda: 0)
 
     inv_page.add_first_item_to_cart()
     first_btn.click.assert_called_once()
 
 
+def test_add_first_item_to_cart_waits_for_the_new_badge(inv_page, monkeypatch):
+    inv_page.driver.find_elements.return_value = [MagicMock()]
+    monkeypatch.setattr(inv_page, "cart_count", lambda: 2)
+    waited = []
+    monkeypatch.setattr(inv_page, "_wait_for_badge", waited.append)
+
+    inv_page.add_first_item_to_cart()
+    assert waited == [3]
+
+
 def test_add_first_item_to_cart_asserts_when_no_items(inv_page):
     inv_page.driver.find_elements.return_value = []
     with pytest.raises(AssertionError):
         inv_page.add_first_item_to_cart()
 
 
-def test_cart_count_zero_when_badge_missing(inv_page, monkeypatch):
-    monkeypatch.setattr(inv_page, "exists", lambda *a, **k: False)
+def test_cart_count_zero_when_badge_missing(inv_page):
+    inv_page.driver.find_elements.return_value = []
     assert inv_page.cart_count() == 0
 
 
 def test_cart_count_returns_int(inv_page, monkeypatch):
-    monkeypatch.setattr(inv_page, "exists", lambda *a, **k: True)
+    monkeypatch.setattr(inv_page, "is_present", lambda *a, **k: True)
     monkeypatch.setattr(inv_page, "text_of", lambda *a, **k: "2")
     assert inv_page.cart_count() == 2
+
+
+def test_open_inventory_opens_inventory_path(inv_page):
+    inv_page.open_inventory()
+    inv_page.driver.get.assert_called_once_with("https://example.com/inventory.html")
+
+
+def test_empty_cart_count_does_not_wait(inv_page, monkeypatch):
+    inv_page.driver.find_elements.return_value = []
+    monkeypatch.setattr(inv_page, "exists", MagicMock())
+
+    assert inv_page.cart_count() == 0
+    inv_page.driver.find_elements.assert_called_once_with(*inv_page.CART_BADGE)
+    inv_page.exists.assert_not_called()
+
+
+def cart_result(clicked=(), cart=(), missing=(), badge=None):
+    return {
+        "clicked": list(clicked),
+        "cart": list(cart),
+        "missing": list(missing),
+        "badge": badge,
+    }
+
+
+def test_add_items_runs_one_script_and_skips_wait_when_badge_matches(inv_page):
+    inv_page.driver.execute_script.return_value = cart_result(
+        clicked=["a", "b"], cart=["c"], badge="3"
+    )
+
+    assert inv_page.add_items_to_cart(count=2) == ["a", "b"]
+    inv_page.driver.execute_script.assert_called_once()
+    _, selectors, action, names, count = inv_page.driver.execute_script.call_args.args
+    assert (action, names, count) == ("add", None, 2)
+    assert selectors["badge"] == ".shopping_cart_badge"
+    inv_page.wait.until.assert_not_called()
+
+
+def test_add_items_waits_once_when_badge_lags(inv_page):
+    inv_page.driver.execute_script.return_value = cart_result(clicked=["a"], badge=None)
+
+    inv_page.add_items_to_cart(names=["a"])
+    inv_page.wait.until.assert_called_once()
+
+
+def test_add_items_rejects_unknown_names(inv_page):
+    inv_page.driver.execute_script.return_value = cart_result(missing=["nope"])
+    with pytest.raises(AssertionError, match="nope"):
+        inv_page.add_items_to_cart(names=["nope"])
+
+
+def test_add_items_rejects_short_count(inv_page):
+    inv_page.driver.execute_script.return_value = cart_result(clicked=["a"], badge="1")
+    with pytest.raises(AssertionError, match="1 of 2"):
+        inv_page.add_items_to_cart(count=2)
+
+
+def test_bulk_cart_operations_on_fake_driver():
+    drv = FakeDriver(demo_site({"u": "p"}))
+    drv.add_cookie({"name": SESSION_COOKIE, "value": "u"})
+    page = InventoryPage(drv, "https://example.com", default_timeout=1)
+    page.open_inventory()
+
+    added = page.add_items_to_cart(count=3)
+    assert page.cart_contents() == added == PRODUCTS[:3]
+    assert page.add_items_to_cart(names=[PRODUCTS[5], PRODUCTS[0]]) == [PRODUCTS[5]]
+    assert page.cart_count() == 4
+
+    assert page.remove_items_from_cart([PRODUCTS[1]]) == [PRODUCTS[1]]
+    assert page.cart_count() == 3
+    page.remove_items_from_cart()
+    assert page.cart_contents() == []
+    assert page.is_present(*InventoryPage.CART_BADGE) is False
@@ -0,0 +1,60 @@
+import pytest
+import requests
+
+from src.local_app import PRODUCTS, LocalApp
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = LocalApp({"standard_user": "secret_sauce"}).start()
+    yield app
+    app.stop()
+
+
+def test_url_uses_ephemeral_port(app):
+    assert app.url.startswith("http://127.0.0.1:")
+    assert not app.url.endswith(":0")
+
+
+def test_login_page_matches_login_page_locators(app):
+    body = requests.get(app.url + "/", timeout=5).text
+    assert 'id="user-name"' in body
+    assert 'id="password"' in body
+    assert 'id="login-button"' in body
+
+
+def test_successful_login_sets_session_and_redirects(app):
+    s = requests.Session()
+    resp = s.post(
+        app.url + "/",
+        data={"user-name": "standard_user", "password": "secret_sauce"},
+        timeout=5,
+    )
+    assert resp.url.endswith("/inventory.html")
+    assert 'class="title"' in resp.text
+    assert resp.text.count("btn_inventory") >= len(PRODUCTS)
+
+
+def test_wrong_password_shows_error(app):
+    resp = requests.post(
+        app.url + "/",
+        data={"user-name": "standard_user", "password": "nope"},
+        timeout=5,
+    )
+    assert 'data-test="error"' in resp.text
+    assert "Epic sadface" in resp.text
+
+
+def test_inventory_requires_session(app):
+    body = requests.get(app.url + "/inventory.html", timeout=5).text
+    assert "Epic sadface" in body
+    assert 'class="title"' not in body
+
+
+def test_unknown_path_is_404(app):
+    assert requests.get(app.url + "/nope", timeout=5).status_code == 404
+
+
+def test_url_raises_when_stopped():
+    with pytest.raises(RuntimeError):
+        LocalApp({}).url
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.matrix import BrowserMatrixPlugin, parse_browsers
+from src.scheduling import browser_of, make_scheduler
+
+BROWSERS = ["chrome", "firefox"]
+
+
+def test_parse_browsers_normalises_and_dedupes():
+    assert parse_browsers(" Chrome,firefox,,chrome ") == ["chrome", "firefox"]
+    assert parse_browsers(["firefox"]) == ["firefox"]
+    assert parse_browsers(None) == []
+
+
+def test_browser_of_reads_parameter_id():
+    assert browser_of("t.py::test_a[firefox]", BROWSERS) == "firefox"
+    assert browser_of("t.py::test_a[x1-chrome]", BROWSERS) == "chrome"
+    assert browser_of("t.py::test_a", BROWSERS) is None
+    assert browser_of("t.py::test_a[chrome]", []) is None
+
+
+def test_browser_of_matches_hyphenated_browser_names():
+    fakes = ["fake-chrome", "fake-firefox"]
+    assert browser_of("t.py::test_x[fake-chrome]", fakes) == "fake-chrome"
+    assert browser_of("t.py::test_x[x1-fake-firefox-y]", fakes) == "fake-firefox"
+    assert browser_of("t.py::test_x[fake-chrome]", ["chrome", *fakes]) == "fake-chrome"
+    assert browser_of("t.py::test_x[fake-chromium]", fakes) is None
+
+
+def _scheduler(nodeids, browsers):
+    config = MagicMock()
+    config.getvalue.side_effect = lambda name: ["2*popen"] if name == "tx" else None
+    sched = make_scheduler(config, None, None, browsers)
+    sched.collection = nodeids
+    for nodeid in nodeids:
+        sched.workqueue.setdefault(sched._split_scope(nodeid), OrderedDict())[
+            nodeid
+        ] = False
+    return sched
+
+
+def _worker(sched, name):
+    node = MagicMock(gateway=SimpleNamespace(id=name), sent=[])
+    node.send_runtest_some.side_effect = node.sent.extend
+    sched.registered_collections[node] = sched.collection
+    return node
+
+
+def test_scheduler_gives_each_worker_its_own_browser_first():
+    nodeids = [f"t.py::test_{i}[{b}]" for b in BROWSERS for i in range(2)]
+    sched = _scheduler(nodeids, BROWSERS)
+    gw0, gw1 = _worker(sched, "gw0"), _worker(sched, "gw1")
+
+    sched._assign_work_unit(gw1)
+    sched._assign_work_unit(gw0)
+
+    assert nodeids[gw1.sent[0]].endswith("[firefox]")
+    assert nodeids[gw0.sent[0]].endswith("[chrome]")
+
+
+def test_scheduler_falls_back_to_other_browsers_when_queue_is_empty():
+    nodeids = ["t.py::test_a[firefox]"]
+    sched = _scheduler(nodeids, BROWSERS)
+    gw0 = _worker(sched, "gw0")
+
+    sched._assign_work_unit(gw0)
+
+    assert gw0.sent == [0]
+
+
+def test_html_hooks_add_browser_column():
+    plugin = BrowserMatrixPlugin(BROWSERS)
+    header = ["<th>Result</th>", "<th>Test</th>", "<th>Duration</th>"]
+    row = ["<td>Passed</td>", "<td>t</td>", "<td>1</td>"]
+
+    plugin.pytest_html_results_table_header(header)
+    plugin.pytest_html_results_table_row(
+        SimpleNamespace(user_properties=[("browser", "firefox")]), row
+    )
+
+    assert header[2] == "<th>Browser</th>"
+    assert row[2] == "<td>firefox</td>"
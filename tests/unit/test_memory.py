@@ -0,0 +1,85 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import memory
+from src.fake_driver import FakeDriver
+from src.memory import MIB, MemoryReportPlugin, driver_pid, sample, tree_rss
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc without psutil"
+)
+
+
+@pytest.fixture
+def child():
+    # A parent with one grandchild, like chromedriver -> chrome
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import subprocess,sys,time;"
+            "subprocess.Popen([sys.executable,'-c','import time;time.sleep(30)']);"
+            "time.sleep(30)",
+        ]
+    )
+    for _ in range(100):
+        if memory._proc_children().get(proc.pid):
+            break
+        time.sleep(0.05)
+    yield proc
+    for pid in memory._proc_children().get(proc.pid, []):
+        os.kill(pid, signal.SIGKILL)
+    proc.kill()
+    proc.wait()
+
+
+def test_tree_rss_includes_descendants(child, monkeypatch):
+    monkeypatch.setattr(memory, "_psutil", lambda: None)
+    own = memory.process_rss(child.pid)
+    assert 0 < own < tree_rss(child.pid)
+
+
+def test_sample_measures_the_driver_service_tree(child, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    drv = SimpleNamespace(service=SimpleNamespace(process=child))
+
+    result = sample(drv)
+
+    assert driver_pid(drv) == child.pid
+    assert result["worker"] == "gw1"
+    assert result["browser"] > 0 and result["process"] > 0
+
+
+def test_drivers_without_a_local_process_are_not_sampled():
+    assert sample(FakeDriver()) is None
+
+
+def test_plugin_summarises_per_browser_and_worker(monkeypatch):
+    monkeypatch.setattr(memory, "total_memory", lambda: 4096 * MIB)
+    plugin = MemoryReportPlugin()
+    for worker, browser in [("gw0", 300), ("gw0", 400), ("gw1", 200)]:
+        props = [
+            (
+                "browser_rss",
+                {"worker": worker, "browser": browser * MIB, "process": 112 * MIB},
+            )
+        ]
+        plugin.pytest_runtest_logreport(
+            SimpleNamespace(when="teardown", user_properties=props)
+        )
+    plugin.pytest_runtest_logreport(
+        SimpleNamespace(when="teardown", user_properties=[("browser_rss", None)])
+    )
+
+    lines = plugin.summary()
+
+    assert lines[0] == "  per browser: mean 300.0 MiB, max 400.0 MiB (3 samples)"
+    assert lines[1].startswith("  gw0: 512.0 MiB peak (browser 400.0 MiB")
+    assert lines[3] == "  ~2.0 workers per GiB"
+    assert lines[4].endswith("-> memory fits ~8 workers")
@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.pages.base_page import BasePage
+from src.pages.inventory_page import InventoryPage
+from src.pages.login_page import LoginPage
+from src.pages.registry import PageRegistry, discover_pages, page_name
+
+TEST_URL = "https://example.com"
+
+
+def test_discover_pages_finds_concrete_pages():
+    classes = discover_pages()
+    assert classes["login"] is LoginPage
+    assert classes["inventory"] is InventoryPage
+    assert BasePage not in classes.values()
+
+
+def test_discover_pages_is_cached():
+    assert discover_pages() is discover_pages()
+
+
+def test_page_name_from_class_name_or_override():
+    class ShoppingCartPage(BasePage):
+        pass
+
+    class Checkout(BasePage):
+        NAME = "checkout_step_one"
+
+    assert page_name(ShoppingCartPage) == "shopping_cart"
+    assert page_name(Checkout) == "checkout_step_one"
+
+
+def test_pages_are_built_lazily_and_cached():
+    login_cls = MagicMock()
+    login_cls.TIMEOUT = None
+    inventory_cls = MagicMock()
+    registry = PageRegistry(
+        MagicMock(), TEST_URL, classes={"login": login_cls, "inventory": inventory_cls}
+    )
+
+    first = registry.login
+    assert registry.login is first
+    login_cls.assert_called_once()
+    inventory_cls.assert_not_called()
+
+
+def test_per_page_timeouts():
+    class SlowPage(BasePage):
+        TIMEOUT = 30
+
+    registry = PageRegistry(
+        MagicMock(),
+        TEST_URL,
+        classes={"slow": SlowPage, "login": LoginPage, "inventory": InventoryPage},
+        default_timeout=7,
+        timeouts={"inventory": 3},
+    )
+
+    assert registry.slow.wait._timeout == 30
+    assert registry.login.wait._timeout == 7
+    assert registry.inventory.wait._timeout == 3
+
+
+def test_timeout_scale_applies_to_every_page():
+    class SlowPage(BasePage):
+        TIMEOUT = 30
+
+    registry = PageRegistry(
+        MagicMock(),
+        TEST_URL,
+        classes={"slow": SlowPage, "login": LoginPage},
+        default_timeout=7,
+        timeout_scale=2.0,
+    )
+
+    assert registry.slow.wait._timeout == 60
+    assert registry.login.wait._timeout == 14
+
+
+def test_unknown_page_raises_attribute_error():
+    registry = PageRegistry(MagicMock(), TEST_URL, classes={"login": LoginPage})
+    with pytest.raises(AttributeError, match="Available: login"):
+        registry.checkout
+    assert "login" in registry
+    assert "login" in dir(registry)
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from src import preflight
+from src.local_app import LocalApp
+from src.preflight import (
+    PreflightCache,
+    PreflightReport,
+    Probe,
+    cache_key,
+    probe_routes,
+)
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = LocalApp({"standard_user": "secret_sauce"}).start()
+    yield app
+    app.stop()
+
+
+def report(*latencies, status=200, checked_at=None):
+    probes = tuple(Probe("/", status, latency) for latency in latencies)
+    return PreflightReport("http://x", probes, checked_at or time.time())
+
+
+def test_probe_routes_hits_every_route_concurrently(app):
+    result = probe_routes(app.url, ["/", "inventory.html", "/static/style.css"])
+
+    assert len(result.probes) == 3 * preflight.SAMPLES
+    assert {p.route for p in result.probes} == {
+        "/",
+        "/inventory.html",
+        "/static/style.css",
+    }
+    assert result.failures == []
+    assert result.skip_reason(max_latency=10) is None
+
+
+def test_unreachable_environment_is_skipped():
+    result = probe_routes("http://127.0.0.1:9", ["/"], samples=1, timeout=1)
+
+    assert result.failures
+    assert result.skip_reason(max_latency=10).startswith("http://127.0.0.1:9/ ")
+
+
+def test_server_errors_are_failures_but_client_errors_are_not():
+    assert report(0.1, status=503).skip_reason(10) == "http://x/ responded with 503"
+    assert report(0.1, status=404).skip_reason(10) is None
+
+
+def test_slow_environment_scales_timeouts_then_skips():
+    fast, slow = report(0.2, 0.3), report(0.5, 2.0)
+
+    assert fast.timeout_scale(slow_latency=1.0) == 1.0
+    assert slow.timeout_scale(slow_latency=1.0) == 2.0
+    assert slow.timeout_scale(slow_latency=0.1) == 3.0
+    assert "p95 latency 2.00s" in slow.skip_reason(max_latency=1.5)
+
+
+def test_cache_probes_once_within_ttl(tmp_path):
+    cache = PreflightCache(tmp_path / "preflight.json", ttl=60)
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return report(0.1)
+
+    first = cache.get_or_probe("k", probe)
+    second = PreflightCache(tmp_path / "preflight.json").get_or_probe("k", probe)
+
+    assert len(calls) == 1
+    assert second == first
+
+
+def test_expired_and_failed_results_are_probed_again(tmp_path, monkeypatch):
+    cache = PreflightCache(tmp_path / "preflight.json", ttl=60)
+    cache.get_or_probe("ok", lambda: report(0.1, checked_at=time.time() - 61))
+    cache.get_or_probe("down", lambda: report(0.1, status=500))
+
+    assert cache.lookup("ok") is None
+    assert cache.lookup("down") is not None
+    monkeypatch.setattr(preflight, "FAILURE_TTL", 0)
+    assert cache.lookup("down") is None
+
+
+def test_concurrent_callers_share_one_probe(tmp_path):
+    calls = []
+
+    def probe():
+        calls.append(1)
+        time.sleep(0.2)
+        return report(0.1)
+
+    def worker():
+        PreflightCache(tmp_path / "preflight.json").get_or_probe("k", probe)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert not (tmp_path / "preflight.json.lock").exists()
+
+
+def test_cache_key_includes_routes():
+    assert cache_key("http://x/", ["/", "/a"]) != cache_key("http://x", ["/"])
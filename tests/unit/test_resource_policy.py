@@ -0,0 +1,145 @@
+import json
+from dataclasses import replace
+from unittest.mock import MagicMock
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from src.resource_policy import FONT_PATTERNS, PROFILES, ResourceReportPlugin
+
+
+def perf_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def test_none_profile_is_inactive():
+    assert PROFILES["none"].active is False
+
+
+def test_no_images_sets_chrome_prefs_and_perf_logging():
+    options = ChromeOptions()
+    PROFILES["no-images"].apply_to_chrome_options(options)
+
+    prefs = options.experimental_options["prefs"]
+    assert prefs["profile.managed_default_content_settings.images"] == 2
+    assert options.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+
+
+def test_firefox_prefs():
+    options = FirefoxOptions()
+    PROFILES["lean"].apply_to_firefox_options(options)
+
+    assert options.preferences["permissions.default.image"] == 2
+    assert options.preferences["browser.display.use_document_fonts"] == 0
+
+
+def test_activate_blocks_urls_over_cdp():
+    drv = MagicMock()
+    PROFILES["first-party-only"].activate(drv)
+
+    drv.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    method, params = drv.execute_cdp_cmd.call_args.args
+    assert method == "Network.setBlockedURLs"
+    assert "*google-analytics.com*" in params["urls"]
+
+
+def test_activate_skips_drivers_without_cdp():
+    drv = MagicMock(spec=["execute_script"])
+    PROFILES["lean"].activate(drv)  # must not raise
+
+
+def test_chrome_fonts_are_blocked_by_url_wherever_fonts_are_blocked():
+    for policy in PROFILES.values():
+        if policy.block_fonts:
+            assert set(FONT_PATTERNS) <= set(policy.blocked_urls)
+
+
+def test_report_enables_perf_logging_without_blocking():
+    options = ChromeOptions()
+    replace(PROFILES["none"], report=True).apply_to_chrome_options(options)
+
+    assert options.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+    assert PROFILES["none"].measured is False
+
+
+def test_collect_accumulates_every_page_from_the_performance_log():
+    drv = MagicMock()
+    drv.get_log.return_value = [
+        # Two page loads and their subresources since the previous read
+        perf_entry("Network.loadingFinished", encodedDataLength=1500),
+        perf_entry("Network.loadingFinished", encodedDataLength=500),
+        perf_entry("Network.loadingFinished", encodedDataLength=48),
+        perf_entry("Network.loadingFailed", blockedReason="inspector"),
+        perf_entry("Network.loadingFailed", errorText="net::ERR_ABORTED"),
+        perf_entry("Network.requestWillBeSent"),
+        {"message": "not json"},
+    ]
+
+    stats = PROFILES["lean"].collect(drv)
+
+    drv.get_log.assert_called_once_with("performance")
+    drv.execute_script.assert_not_called()
+    assert stats == {"requests": 3, "bytes": 2048, "blocked": 1}
+
+
+def test_collect_without_performance_log_reports_nothing():
+    drv = MagicMock()
+    drv.get_log.side_effect = Exception("log type 'performance' not found")
+    assert PROFILES["lean"].collect(drv) is None
+
+
+def report(nodeid, requests, bytes_, blocked=0, when="teardown"):
+    stats = {"requests": requests, "bytes": bytes_, "blocked": blocked}
+    return MagicMock(
+        when=when, nodeid=nodeid, user_properties=[("resource_stats", stats)]
+    )
+
+
+def test_report_plugin_sums_teardown_stats():
+    plugin = ResourceReportPlugin("lean")
+    for when in ("call", "teardown", "teardown"):
+        plugin.pytest_runtest_logreport(report(when, 2, 10, 1, when=when))
+    plugin.pytest_runtest_logreport(
+        MagicMock(when="teardown", user_properties=[("resource_stats", None)])
+    )
+
+    assert plugin.tests == 2
+    assert plugin.totals == {"requests": 4, "bytes": 20, "blocked": 2}
+
+
+def test_report_plugin_measures_savings_against_the_none_baseline():
+    config = MagicMock()
+    config.cache.get.return_value = {
+        "a": {"requests": 10, "bytes": 4096},
+        "gone": {"requests": 99, "bytes": 99},
+    }
+    plugin = ResourceReportPlugin("lean")
+    plugin.pytest_configure(config)
+    plugin.pytest_runtest_logreport(report("a", 4, 1024, blocked=6))
+    plugin.pytest_runtest_logreport(report("new", 2, 512, blocked=1))
+
+    assert plugin.saved() == {"requests": 6, "bytes": 3072, "tests": 1}
+    assert plugin.summary() == [
+        "  2 tests, 6 requests loaded, 1.5 KiB transferred",
+        "  saved: 7 requests blocked; 6 requests, 3.0 KiB fewer than "
+        "--resource-policy=none (1 tests)",
+    ]
+
+    del config.workerinput
+    plugin.pytest_sessionfinish(MagicMock(config=config))
+    config.cache.set.assert_called_once()
+    assert config.cache.set.call_args.args[0] == "e2e/resource-stats/lean"
+
+
+def test_none_policy_run_records_the_baseline():
+    config = MagicMock()
+    config.cache.get.return_value = {}
+    plugin = ResourceReportPlugin("none")
+    plugin.pytest_configure(config)
+    plugin.pytest_runtest_logreport(report("a", 10, 4096))
+    del config.workerinput
+    plugin.pytest_sessionfinish(MagicMock(config=config))
+
+    config.cache.set.assert_called_once_with(
+        "e2e/resource-stats/none", {"a": {"requests": 10, "bytes": 4096, "blocked": 0}}
+    )
+    assert plugin.summary()[1] == "  recorded as the baseline for other policies"
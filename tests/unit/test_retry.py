@@ -0,0 +1,160 @@
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from src import retry
+from src.pages.base_page import BasePage
+from src.retry import RetryPolicy, SmartRetryPlugin, summarize
+
+
+@pytest.fixture
+def log(monkeypatch):
+    rec = retry.RetryLog()
+    rec.current_test = "tests/x.py::test_a"
+    monkeypatch.setattr(retry, "log", rec)
+    monkeypatch.setattr(retry, "policy", RetryPolicy(backoff=0, max_backoff=0))
+    return rec
+
+
+@pytest.fixture
+def page():
+    p = BasePage(MagicMock(), "https://example.com")
+    p.wait.until = MagicMock()
+    return p
+
+
+def test_no_retry_without_policy(monkeypatch, page):
+    monkeypatch.setattr(retry, "policy", None)
+    page.wait.until.side_effect = StaleElementReferenceException()
+
+    with pytest.raises(StaleElementReferenceException):
+        page.click("id", "go")
+    assert page.wait.until.call_count == 1
+
+
+def test_click_intercepted_is_retried_in_place(log, page):
+    el = MagicMock()
+    el.click.side_effect = [ElementClickInterceptedException(), None]
+    page.wait.until.return_value = el
+
+    page.click("id", "go")
+
+    assert el.click.call_count == 2
+    assert log.records == [
+        {
+            "test": "tests/x.py::test_a",
+            "step": "BasePage.click",
+            "locator": "id=go",
+            "error": "ElementClickInterceptedException",
+            "retries": 1,
+            "recovered": True,
+        }
+    ]
+
+
+def test_nested_steps_retry_only_at_the_outermost_call(log, page):
+    stale = MagicMock()
+    stale.send_keys.side_effect = StaleElementReferenceException()
+    page.wait.until.side_effect = [stale, stale, stale]
+
+    with pytest.raises(StaleElementReferenceException):
+        page.type("id", "user-name", "bob")
+
+    # 3 attempts of `type`, each with exactly one `find_visible` wait
+    assert page.wait.until.call_count == 3
+    assert [(r["step"], r["retries"], r["recovered"]) for r in log.records] == [
+        ("BasePage.type", 2, False)
+    ]
+
+
+def test_timeouts_are_retried_once(log, page):
+    page.wait.until.side_effect = TimeoutException()
+
+    with pytest.raises(TimeoutException):
+        page.text_of("css selector", ".err")
+
+    assert page.wait.until.call_count == 2
+
+
+def test_other_errors_are_not_retried(log, page):
+    page.wait.until.side_effect = NoSuchElementException()
+
+    with pytest.raises(NoSuchElementException):
+        page.find("id", "x")
+
+    assert page.wait.until.call_count == 1
+    assert log.records == []
+
+
+def test_exists_does_not_retry_its_timeout(log, page):
+    page.wait.until.side_effect = TimeoutException()
+
+    assert page.exists("id", "x") is False
+    assert page.wait.until.call_count == 1
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.3)
+
+    assert [policy.delay(n) for n in (1, 2, 3)] == [0.1, 0.2, 0.3]
+
+
+def _record(locator, error, retries, recovered):
+    return {
+        "step": "BasePage.click",
+        "locator": locator,
+        "error": error,
+        "retries": retries,
+        "recovered": recovered,
+    }
+
+
+def test_summarize_groups_by_locator():
+    rows = summarize(
+        [
+            _record("id=a", "E1", 1, True),
+            _record("id=a", "E2", 2, False),
+            _record("id=b", "E1", 1, True),
+        ]
+    )
+
+    assert rows[0] == {
+        "locator": "id=a",
+        "retries": 3,
+        "recovered": 1,
+        "exhausted": 1,
+        "errors": ["E1", "E2"],
+    }
+
+
+def test_plugin_enables_transient_only_reruns():
+    config = MagicMock()
+    config.option.reruns = None
+    config.option.only_rerun = None
+    config.getini.return_value = ""
+    plugin = SmartRetryPlugin(RetryPolicy(), reruns=2)
+
+    plugin.pytest_configure(config)
+    try:
+        assert retry.policy is plugin.policy
+        assert config.option.reruns == 2
+        assert "StaleElementReferenceException" in config.option.only_rerun
+    finally:
+        plugin.pytest_unconfigure(config)
+    assert retry.policy is None
+
+
+def test_plugin_keeps_explicit_reruns():
+    config = MagicMock()
+    config.option.reruns = 5
+    plugin = SmartRetryPlugin(RetryPolicy(), reruns=1)
+
+    plugin.pytest_configure(config)
+    plugin.pytest_unconfigure(config)
+
+    assert config.option.reruns == 5
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from src.scheduling import DEFAULT_DURATION, DurationStore, plan_units
+
+
+def test_store_smooths_repeated_measurements():
+    store = DurationStore()
+    store.record("t::a", 2.0, "u1")
+    store.record("t::a", 4.0, None)
+
+    assert store.entries["t::a"] == {"duration": 3.0, "user": "u1"}
+
+
+def test_estimate_uses_median_for_unknown_tests():
+    store = DurationStore(
+        {"a": {"duration": 1.0, "user": None}, "b": {"duration": 3.0, "user": None}}
+    )
+    assert store.estimate(["a", "new"]) == {"a": 1.0, "new": 2.0}
+    assert DurationStore().estimate(["x"]) == {"x": DEFAULT_DURATION}
+
+
+def test_store_round_trips_through_cache():
+    config = MagicMock()
+    config.cache.get.return_value = {"a": {"duration": 1.0, "user": "u"}}
+    store = DurationStore.load(config)
+    store.save(config)
+
+    config.cache.set.assert_called_once_with("e2e/durations", store.entries)
+
+
+def test_plan_orders_units_longest_first():
+    durations = {"short": 1.0, "long": 9.0, "mid": 4.0}
+    units = plan_units(list(durations), durations, {}, workers=2)
+
+    assert list(units) == ["long", "mid", "short"]
+
+
+def test_plan_groups_tests_by_login_user_within_cap():
+    nodeids = [f"t::{i}" for i in range(8)]
+    durations = {n: 1.0 for n in nodeids}
+    users = {n: "standard_user" for n in nodeids}
+
+    units = plan_units(nodeids, durations, users, workers=2)
+
+    # cap = 8 / (2 * 2) = 2 seconds -> four units of two tests
+    assert len(units) == 4
+    assert all(key.startswith("user:standard_user#") for key in units)
+    assert sorted(n for tests in units.values() for n in tests) == sorted(nodeids)
+    assert all(len(tests) == 2 for tests in units.values())
+
+
+def test_plan_keeps_oversized_test_in_own_unit():
+    durations = {"big": 10.0, "a": 1.0, "b": 1.0}
+    users = {n: "u" for n in durations}
+    units = plan_units(list(durations), durations, users, workers=4)
+
+    assert list(units.values())[0] == ["big"]
@@ -0,0 +1,8 @@
+from src.stats import percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [0.1, 0.2, 0.3, 0.4]
+    assert percentile(values, 50) == 0.2
+    assert percentile(values, 95) == 0.4
+    assert percentile([], 95) == 0.0
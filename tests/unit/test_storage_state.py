@@ -0,0 +1,110 @@
+import time
+from unittest.mock import MagicMock
+
+from src.storage_state import StorageStateCache
+
+BASE_URL = "https://example.com"
+
+
+def make_state(age=0.0, cookies=None):
+    return {
+        "cookies": (
+            [{"name": "session-username", "value": "u"}] if cookies is None else cookies
+        ),
+        "local_storage": {"cart-contents": "[]"},
+        "captured_at": time.time() - age,
+    }
+
+
+def test_capture_reads_cookies_and_local_storage():
+    drv = MagicMock()
+    drv.get_cookies.return_value = [{"name": "a", "value": "1"}]
+    drv.execute_script.return_value = {"k": "v"}
+
+    state = StorageStateCache.capture(drv)
+
+    assert state["cookies"] == [{"name": "a", "value": "1"}]
+    assert state["local_storage"] == {"k": "v"}
+    assert "captured_at" in state
+
+
+def test_get_is_keyed_by_base_url_and_user():
+    cache = StorageStateCache()
+    state = make_state()
+    cache.save(BASE_URL + "/", "u1", state)
+
+    assert cache.get(BASE_URL, "u1") is state
+    assert cache.get(BASE_URL, "u2") is None
+    assert cache.get("https://other.local", "u1") is None
+
+
+def test_stale_by_ttl_is_dropped():
+    cache = StorageStateCache(ttl=10)
+    cache.save(BASE_URL, "u", make_state(age=60))
+
+    assert cache.get(BASE_URL, "u") is None
+
+
+def test_expired_cookie_makes_state_invalid():
+    cache = StorageStateCache()
+    state = make_state(cookies=[{"name": "s", "value": "x", "expiry": time.time() - 1}])
+
+    assert cache.is_valid(state) is False
+
+
+def test_state_without_cookies_is_invalid():
+    assert StorageStateCache().is_valid(make_state(cookies=[])) is False
+
+
+def test_restore_applies_cookies_and_storage():
+    cache = StorageStateCache()
+    state = make_state()
+    cache.save(BASE_URL, "u", state)
+    drv = MagicMock()
+
+    assert cache.restore(drv, BASE_URL, "u") is True
+    drv.get.assert_called_once_with(BASE_URL)
+    drv.add_cookie.assert_called_once_with(state["cookies"][0])
+    assert drv.execute_script.call_args.args[1] == {"cart-contents": "[]"}
+
+
+def test_restore_without_state_returns_false():
+    drv = MagicMock()
+    assert StorageStateCache().restore(drv, BASE_URL, "u") is False
+    drv.get.assert_not_called()
+
+
+def test_restore_failure_invalidates_state():
+    cache = StorageStateCache()
+    cache.save(BASE_URL, "u", make_state())
+    drv = MagicMock()
+    drv.add_cookie.side_effect = Exception("invalid cookie domain")
+
+    assert cache.restore(drv, BASE_URL, "u") is False
+    assert cache.get(BASE_URL, "u") is None
+
+
+def test_restore_waits_for_the_document_before_writing_cookies():
+    # page-load strategy "none": driver.get returns while the origin loads
+    cache = StorageStateCache()
+    cache.save(BASE_URL, "u", make_state())
+    drv = MagicMock()
+    calls = []
+    states = iter(["loading", "loading", "interactive"])
+    drv.execute_script.side_effect = lambda script, *args: (
+        calls.append("script") or next(states) if not args else None
+    )
+    drv.add_cookie.side_effect = lambda cookie: calls.append("cookie")
+
+    assert cache.restore(drv, BASE_URL, "u") is True
+    assert calls == ["script", "script", "script", "cookie"]
+
+
+def test_restore_gives_up_when_the_document_never_loads():
+    cache = StorageStateCache(ready_timeout=0.1)
+    cache.save(BASE_URL, "u", make_state())
+    drv = MagicMock()
+    drv.execute_script.return_value = "loading"
+
+    assert cache.restore(drv, BASE_URL, "u") is False
+    drv.add_cookie.assert_not_called()
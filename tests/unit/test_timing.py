@@ -0,0 +1,82 @@
+import csv
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from src import timing
+from src.pages.base_page import BasePage
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    rec = timing.StepRecorder()
+    rec.current_test = "tests/x.py::test_a"
+    monkeypatch.setattr(timing, "recorder", rec)
+    return rec
+
+
+def test_span_is_noop_without_recorder(monkeypatch):
+    monkeypatch.setattr(timing, "recorder", None)
+    with timing.span("driver.setup"):
+        pass
+
+
+def test_timed_records_page_calls_with_locator(recorder):
+    page = BasePage(MagicMock(), "https://example.com")
+    page.wait.until = MagicMock()
+
+    page.type("id", "user-name", "bob")
+
+    steps = [(r["step"], r["detail"], r["depth"]) for r in recorder.records]
+    assert ("BasePage.find_visible", "id=user-name", 1) in steps
+    assert ("BasePage.type", "id=user-name", 0) in steps
+    assert all(r["test"] == "tests/x.py::test_a" for r in recorder.records)
+
+
+def test_timed_records_failures(recorder):
+    page = BasePage(MagicMock(), "https://example.com")
+    page.wait.until = MagicMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError):
+        page.click("css selector", ".btn")
+    assert recorder.records[0]["step"] == "BasePage.click"
+
+
+def test_pop_test_returns_only_that_test(recorder):
+    with recorder.span("login"):
+        pass
+    recorder.current_test = "other"
+    with recorder.span("login"):
+        pass
+
+    mine = recorder.pop_test("tests/x.py::test_a")
+    assert len(mine) == 1
+    assert [r["test"] for r in recorder.records] == ["other"]
+
+
+def test_summarize_orders_by_total():
+    records = [
+        {"step": "a", "detail": "", "duration": 1.0},
+        {"step": "b", "detail": "", "duration": 0.5},
+        {"step": "b", "detail": "", "duration": 0.7},
+    ]
+    rows = timing.summarize(records, "step")
+    assert [r["step"] for r in rows] == ["b", "a"]
+    assert rows[0]["calls"] == 2
+    assert rows[0]["max"] == 0.7
+
+
+def test_write_records_json_and_csv(tmp_path):
+    records = [
+        {"test": "t", "step": "s", "detail": "id=x", "depth": 0, "duration": 0.1}
+    ]
+    json_path = tmp_path / "out" / "timings.json"
+    timing.write_records(records, json_path)
+    data = json.loads(json_path.read_text())
+    assert data["records"] == records
+    assert data["by_locator"][0]["detail"] == "id=x"
+
+    csv_path = tmp_path / "timings.csv"
+    timing.write_records(records, csv_path)
+    rows = list(csv.DictReader(csv_path.open()))
+    assert rows[0]["step"] == "s"
@@ -0,0 +1,90 @@
+import json
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from src.user_pool import PoolUser, UserPool, users_from_settings
+
+USERS = [
+    PoolUser("alice", "a", tags=frozenset({"cart"})),
+    PoolUser("bob", "b"),
+    PoolUser("carol", "c", weight=2, tags=frozenset({"cart", "admin"})),
+]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return UserPool(USERS, tmp_path, timeout=0.2)
+
+
+def test_users_from_settings_applies_metadata():
+    users = users_from_settings(
+        {"alice": "a", "bob": "b"}, {"alice": {"weight": 3, "tags": ["cart"]}}
+    )
+    assert users[0] == PoolUser("alice", "a", 3, frozenset({"cart"}))
+    assert users[1] == PoolUser("bob", "b")
+
+
+def test_distinct_users_before_sharing(pool):
+    leases = [pool.acquire() for _ in range(3)]
+    assert sorted(lease.user.name for lease in leases) == ["alice", "bob", "carol"]
+
+    # carol has a second slot; everyone else is busy
+    assert pool.acquire().user.name == "carol"
+
+
+def test_prefer_rotates_start(pool):
+    assert pool.acquire(prefer=1).user.name == "bob"
+
+
+def test_pools_in_other_processes_see_the_locks(pool, tmp_path):
+    held = pool.acquire(tags=["admin"])
+    other = UserPool(USERS, tmp_path, timeout=0.2)
+
+    assert other.acquire(tags=["admin"]).user.name == "carol"  # second slot
+    with pytest.raises(TimeoutError):
+        other.acquire(tags=["admin"])
+    held.release()
+    assert other.acquire(tags=["admin"]).user.name == "carol"
+
+
+def test_tags_filter_and_unknown_tags(pool):
+    assert {pool.acquire(tags=["cart"]).user.name for _ in range(2)} == {
+        "alice",
+        "carol",
+    }
+    with pytest.raises(LookupError):
+        pool.acquire(tags=["nope"])
+
+
+def test_release_frees_slot(pool):
+    with pool.acquire(tags=["cart"]) as lease:
+        assert lease.path.exists()
+    assert not lease.path.exists()
+    lease.release()  # idempotent
+
+
+def test_stale_lock_from_dead_process_is_reclaimed(tmp_path):
+    proc = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    dead_pid = int(proc.stdout)
+    (tmp_path / "bob.0.lock").write_text(
+        json.dumps({"pid": dead_pid, "host": socket.gethostname()})
+    )
+    pool = UserPool([PoolUser("bob", "b")], tmp_path, timeout=0.2)
+
+    assert pool.acquire().user.name == "bob"
+
+
+def test_live_foreign_lock_is_respected(tmp_path):
+    (tmp_path / "bob.0.lock").write_text(json.dumps({"pid": 1, "host": "other-host"}))
+    pool = UserPool([PoolUser("bob", "b")], tmp_path, timeout=0.2)
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()